@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up; serves the streaming sighting ingest channels
+from core.streaming import StreamingIngestRouter  # noqa: E402
+
+application = StreamingIngestRouter(django_application)
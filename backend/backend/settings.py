@@ -11,8 +11,11 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -50,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,6 +94,28 @@ DATABASES = {
     }
 }
 
+# Database profile (DB_PROFILE env): 'development' keeps SQLite defaults;
+# 'production' enables WAL and the pragmas below on every new connection
+# (core.services.sqlite_tuning) and keeps connections open between requests,
+# so the simulator, API and management commands can share db.sqlite3
+# without "database is locked" errors.
+DB_PROFILE = os.environ.get('DB_PROFILE', 'development')
+
+SQLITE_PRAGMAS = {}
+if DB_PROFILE == 'production':
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',          # readers no longer block the writer
+        'synchronous': 'NORMAL',        # fsync at checkpoints only; safe with WAL
+        'cache_size': -64000,           # 64 MB page cache per connection
+        'mmap_size': 268435456,         # 256 MB memory-mapped reads
+        'busy_timeout': 30000,          # wait up to 30s for the write lock
+        'temp_store': 'MEMORY',
+    }
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    # sqlite3.connect(timeout=...) is the driver-side busy wait
+    DATABASES['default']['OPTIONS'] = {'timeout': 30}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,14 +155,118 @@ STATIC_URL = 'static/'
 
 # DRF basic settings
 REST_FRAMEWORK = {
+    # `Accept: application/msgpack` gets MessagePack when the package is installed
     'DEFAULT_RENDERER_CLASSES': (
         'rest_framework.renderers.JSONRenderer',
-    ),
+    ) + (('core.renderers.MessagePackRenderer',) if importlib.util.find_spec('msgpack') else ()),
     'DEFAULT_PARSER_CLASSES': (
         'rest_framework.parsers.JSONParser',
     ),
+    # List endpoints page by keyset on each view's `ordering`
+    # ({next, previous, results}; ?cursor=, ?page_size= up to 1000)
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
 }
 
+# Bulk sighting ingest (POST /api/sightings/bulk/)
+SIGHTING_BULK_MAX_ITEMS = 5000
+SIGHTING_BULK_BATCH_SIZE = 500
+
+# Streaming ingest over ASGI (see core/streaming.py): NDJSON over HTTP and WebSocket.
+# Batches are flushed at this size or once the oldest buffered line is this old.
+STREAM_INGEST_HTTP_PATH = '/api/sightings/stream/'
+STREAM_INGEST_WS_PATH = '/ws/sightings/'
+STREAM_INGEST_BATCH_SIZE = 200
+STREAM_INGEST_MAX_DELAY_MS = 250
+# Longest accepted NDJSON line; longer lines are dropped as they arrive and rejected in the ack
+STREAM_INGEST_MAX_LINE_BYTES = 64 * 1024
+
+# Per-process plate -> (vehicle id, status) cache used on the sighting hot path
+PLATE_CACHE_MAX_SIZE = 10000
+PLATE_CACHE_TTL_SECONDS = 30
+
+# Alert pipeline: 'queue' hands hotlist sightings to `manage.py run_alert_worker`,
+# 'inline' raises alerts inside the request. When more than ALERT_QUEUE_MAX_PENDING
+# jobs are waiting, producers fall back to inline processing (backpressure).
+ALERT_PIPELINE = os.environ.get('ALERT_PIPELINE', 'queue')
+ALERT_QUEUE_MAX_PENDING = 10000
+ALERT_QUEUE_MAX_ATTEMPTS = 5
+ALERT_QUEUE_LEASE_SECONDS = 60
+
+# Repeat sightings of the same plate/status within this many seconds update the
+# open alert (position, hit_count) instead of creating new Alert/PredictedRoute rows.
+# 0 disables suppression.
+ALERT_SUPPRESSION_SECONDS = 300
+ALERT_SUPPRESSION_MAX_ENTRIES = 10000
+
+# Write-behind buffer for Vehicle.last_seen: keeps the newest timestamp per vehicle
+# and writes them in one UPDATE every interval, when full, and at shutdown
+LAST_SEEN_WRITE_BEHIND = True
+LAST_SEEN_FLUSH_INTERVAL_SECONDS = 1.0
+LAST_SEEN_FLUSH_MAX_PENDING = 500
+
+# Retention (`manage.py retain_sightings`): older rows are moved to gzip NDJSON files
+# under ARCHIVE_DIR and deleted in batches; per-day counts are kept in ArchivedDay
+RETENTION_SIGHTING_DAYS = 30
+RETENTION_ALERT_DAYS = 90
+RETENTION_BATCH_SIZE = 2000
+ARCHIVE_DIR = BASE_DIR / 'archive'
+
+# Dataset delta sync (GET /api/dataset/?since=<cursor>): changed rows are
+# re-read this many seconds before the cursor to cover late commits;
+# deletions are remembered for DATASET_TOMBSTONE_DAYS (older cursors get a
+# full snapshot) and pruned by retain_sightings
+DATASET_DELTA_OVERLAP_SECONDS = 2
+DATASET_TOMBSTONE_DAYS = 7
+
+# Server-Sent Events feed (GET /api/stream/): events are kept in a per-process
+# replay buffer for Last-Event-ID resume; rows written by other processes
+# (runsimulator, run_alert_worker) are picked up by a tail poll while clients
+# are connected
+STREAM_REPLAY_EVENTS = 2000
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = 300
+STREAM_TAIL_INTERVAL_SECONDS = 1.0
+
+# Per-minute sighting/alert counters behind /api/stats/ (core.services.stats_buckets);
+# buckets older than this are pruned by retain_sightings
+STATS_BUCKET_DAYS = 7
+
+# Time-bucketed charts (GET /api/aggregates/): hourly roll-ups are kept
+# AGGREGATE_HOURLY_DAYS; sub-hour buckets read raw sightings for distinct
+# plates, so their range is capped at AGGREGATE_RAW_MAX_HOURS
+AGGREGATE_HOURLY_DAYS = 90
+AGGREGATE_RAW_MAX_HOURS = 24
+AGGREGATE_MAX_POINTS = 2000
+
+# Spatial grid for ?bbox= / ?near= on sightings (core.services.spatial): cell
+# size in degrees (0.05 is about 5.5 km); changing it needs
+# `backfill_sighting_cells --force`. Boxes spanning more grid rows than
+# SPATIAL_MAX_CELL_RANGES filter on lat/lon only
+SPATIAL_CELL_DEGREES = 0.05
+SPATIAL_MAX_CELL_RANGES = 200
+SPATIAL_MAX_RADIUS_M = 50000
+
+# Map clustering (GET /api/sightings/clusters/, core.services.clusters): up to
+# CLUSTER_MAX_ZOOM sightings are grouped into cells CLUSTER_CELL_PIXELS of a
+# 256px tile wide, cached per zoom for CLUSTER_CACHE_SECONDS; above it the
+# endpoint returns up to CLUSTER_POINTS_LIMIT individual sightings
+CLUSTER_MAX_ZOOM = 12
+CLUSTER_CELL_PIXELS = 64
+CLUSTER_CACHE_SECONDS = 10
+CLUSTER_POINTS_LIMIT = 500
+
+# Response compression (core.middleware.CompressionMiddleware): brotli when the
+# package is installed and accepted, else gzip, for bodies of at least
+# COMPRESSION_MIN_BYTES. Streams are excluded; compression would buffer them
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_EXCLUDED_TYPES = ('text/event-stream', 'application/x-ndjson')
+
+# Conditional GET on /api/dataset/ and /api/stats/: ETags combine the global
+# change sequence with a time bucket, since both report windows relative to now
+CONDITIONAL_GET_BUCKET_SECONDS = 15
+
 # CORS for Next.js frontend
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',
@@ -145,6 +275,10 @@ CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:3001',
 ]
 
+# Let browser clients revalidate the dataset/stats polls and resume /api/stream/
+CORS_ALLOW_HEADERS = list(default_headers) + ['if-none-match', 'last-event-id']
+CORS_EXPOSE_HEADERS = ['ETag']
+
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:3000',
     'http://127.0.0.1:3000',
@@ -17,7 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from core.views import VehicleViewSet, SightingViewSet, AlertViewSet, PredictedRouteViewSet, StatsView, VerificationView, DatasetView
+from core.event_stream import EventStreamView
+from core.views import VehicleViewSet, SightingViewSet, AlertViewSet, PredictedRouteViewSet, StatsView, AggregatesView, VerificationView, DatasetView, ArchiveView
 
 router = DefaultRouter()
 router.register(r'vehicles', VehicleViewSet, basename='vehicle')
@@ -29,6 +30,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
     path('api/stats/', StatsView.as_view(), name='stats'),
+    path('api/aggregates/', AggregatesView.as_view(), name='aggregates'),
     path('api/dataset/', DatasetView.as_view(), name='dataset'),
     path('api/verify/', VerificationView.as_view(), name='verify'),
+    path('api/archive/', ArchiveView.as_view(), name='archive'),
+    path('api/stream/', EventStreamView.as_view(), name='stream'),
 ]
@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Vehicle, Sighting, Alert, PredictedRoute,
     PoliceVehicleRegistration, StolenVehicleReport, OwnerWatchlist, VerificationAttempt,
-    DatasetVersion,
+    DatasetVersion, AlertJob, ArchivedDay,
 )
 
 
@@ -32,6 +32,19 @@ class PredictedRouteAdmin(admin.ModelAdmin):
     list_display = ("plate_number", "generated_at")
     search_fields = ("plate_number",)
 
+
+@admin.register(AlertJob)
+class AlertJobAdmin(admin.ModelAdmin):
+    list_display = ("plate_number", "vehicle_status", "state", "attempts", "enqueued_at", "started_at")
+    search_fields = ("plate_number",)
+    list_filter = ("state", "vehicle_status")
+
+
+@admin.register(ArchivedDay)
+class ArchivedDayAdmin(admin.ModelAdmin):
+    list_display = ("table", "day", "rows", "path", "archived_at")
+    list_filter = ("table",)
+
 # Register your models here.
 
 
@@ -8,3 +8,6 @@ class CoreConfig(AppConfig):
     def ready(self):
         # Import signals
         from . import signals  # noqa: F401
+        from django.db.backends.signals import connection_created
+        from .services.sqlite_tuning import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='core.sqlite_pragmas')
@@ -0,0 +1,102 @@
+"""Server-Sent Events feed of new sightings and alerts: ``GET /api/stream/``.
+
+Query params (all optional, comma-separated):
+- types: sighting,alert
+- province: plate province numbers, Arabic or Devanagari digits (3 or ३)
+- status: vehicle status for sightings / alert status (suspicious,stolen)
+
+Events are ``sighting`` and ``alert``, with the same JSON as the REST
+serializers. A ``reset`` event means the Last-Event-ID (header, or
+``lastEventId`` param for clients that cannot set headers) is no longer
+replayable and the client should reload its snapshot. Comment lines are
+sent as heartbeats. Connections are closed after STREAM_MAX_SECONDS;
+EventSource reconnects and resumes from its last id.
+
+Events come from services.live_feed, so clients never query the tables.
+Under ASGI each client is a coroutine; under WSGI (runserver) a thread.
+"""
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views import View
+
+from .services.live_feed import Event, EventFilter, foreign_tail, live_feed
+
+RESET = 'event: reset\ndata: {}\n\n'
+HEARTBEAT = ': ping\n\n'
+
+
+def _stream_settings() -> Tuple[float, float]:
+    return (
+        float(getattr(settings, 'STREAM_HEARTBEAT_SECONDS', 15)),
+        float(getattr(settings, 'STREAM_MAX_SECONDS', 300)),
+    )
+
+
+def _start(last_event_id: Optional[str]) -> Tuple[List[str], int]:
+    """Opening chunks and the sequence to stream after."""
+    head = ['retry: 3000\n\n']
+    seq = live_feed.resume_seq(last_event_id)
+    if seq is None:
+        head.append(RESET)
+        seq = live_feed.last_seq
+    return head, seq
+
+
+def _frame(events: List[Event], seq: int, flt: EventFilter) -> Tuple[str, int]:
+    """Encode the events a client should see; a reset if it fell out of the buffer."""
+    if not events:
+        return HEARTBEAT, seq
+    if events[0].seq > seq + 1:
+        return RESET, events[-1].seq
+    body = ''.join(e.encode() for e in events if flt.matches(e))
+    return body or HEARTBEAT, events[-1].seq
+
+
+def _sync_stream(flt: EventFilter, last_event_id: Optional[str]) -> Iterator[str]:
+    heartbeat, max_seconds = _stream_settings()
+    deadline = time.monotonic() + max_seconds
+    live_feed.subscribe()
+    foreign_tail.ensure_running()
+    try:
+        head, seq = _start(last_event_id)
+        yield ''.join(head)
+        while time.monotonic() < deadline:
+            chunk, seq = _frame(live_feed.wait(seq, heartbeat), seq, flt)
+            yield chunk
+    finally:
+        live_feed.unsubscribe()
+
+
+async def _async_stream(flt: EventFilter, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    heartbeat, max_seconds = _stream_settings()
+    deadline = time.monotonic() + max_seconds
+    live_feed.subscribe()
+    foreign_tail.ensure_running()
+    try:
+        head, seq = _start(last_event_id)
+        yield ''.join(head)
+        while time.monotonic() < deadline:
+            chunk, seq = _frame(await live_feed.wait_async(seq, heartbeat), seq, flt)
+            yield chunk
+    finally:
+        live_feed.unsubscribe()
+
+
+class EventStreamView(View):
+    http_method_names = ['get', 'options']
+
+    def get(self, request):
+        flt = EventFilter.from_params(request.GET)
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('lastEventId')
+        if isinstance(request, ASGIRequest):
+            stream = _async_stream(flt, last_event_id)
+        else:
+            stream = _sync_stream(flt, last_event_id)
+        resp = StreamingHttpResponse(stream, content_type='text/event-stream; charset=utf-8')
+        resp['Cache-Control'] = 'no-cache'
+        resp['X-Accel-Buffering'] = 'no'
+        return resp
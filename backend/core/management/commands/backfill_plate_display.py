@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Alert, PredictedRoute, Sighting, Vehicle
+from core.services.nepali_plates import display_plate
+
+MODELS = {
+    'vehicles': Vehicle,
+    'sightings': Sighting,
+    'alerts': Alert,
+    'routes': PredictedRoute,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the stored Devanagari plate_display column in id-ordered chunks. "
+        "By default only rows where it is empty; --force recomputes every row."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read and updated per chunk')
+        parser.add_argument('--only', type=str, choices=list(MODELS), help='Process a single table')
+        parser.add_argument('--force', action='store_true', help='Recompute rows that already have a value')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        tables = [options['only']] if options['only'] else list(MODELS)
+
+        for table in tables:
+            model = MODELS[table]
+            qs = model.objects.all() if options['force'] else model.objects.filter(plate_display='')
+            last_id, scanned, updated = 0, 0, 0
+            while True:
+                rows = list(qs.filter(id__gt=last_id).order_by('id').values_list('id', 'plate_number', 'plate_display')[:batch_size])
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                scanned += len(rows)
+                changed = [
+                    model(id=row_id, plate_display=display_plate(plate))
+                    for row_id, plate, current in rows
+                    if display_plate(plate) != current
+                ]
+                # Output is unchanged (serializers convert empty values on read), so
+                # neither updated_at nor the change sequence is touched
+                if changed:
+                    model.objects.bulk_update(changed, ['plate_display'])
+                    updated += len(changed)
+                self.stdout.write(f"{table}: up to id {last_id}, updated {updated}")
+            self.stdout.write(self.style.SUCCESS(f"{table}: scanned={scanned}, updated={updated}"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Sighting
+from core.services.spatial import grid_cell
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the spatial grid cell of sightings in id-ordered chunks. By default only rows "
+        "without one; --force recomputes every row (after changing SPATIAL_CELL_DEGREES)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read and updated per chunk')
+        parser.add_argument('--force', action='store_true', help='Recompute rows that already have a cell')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        qs = Sighting.objects.all() if options['force'] else Sighting.objects.filter(cell__isnull=True)
+        last_id, scanned, updated = 0, 0, 0
+        while True:
+            rows = list(qs.filter(id__gt=last_id).order_by('id').values_list('id', 'latitude', 'longitude', 'cell')[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+            changed = [
+                Sighting(id=row_id, cell=grid_cell(lat, lon))
+                for row_id, lat, lon, cell in rows
+                if grid_cell(lat, lon) != cell
+            ]
+            # No visible field changes, so the change sequence is left alone
+            if changed:
+                Sighting.objects.bulk_update(changed, ['cell'])
+                updated += len(changed)
+            self.stdout.write(f"sightings: up to id {last_id}, updated {updated}")
+        self.stdout.write(self.style.SUCCESS(f"sightings: scanned={scanned}, updated={updated}"))
@@ -27,7 +27,7 @@ class Command(BaseCommand):
             })
 
         sightings_payload: List[Dict[str, Any]] = []
-        for s in Sighting.objects.all().order_by('timestamp')[:50000]:  # cap to avoid overly large backups
+        for s in Sighting.objects.all().order_by('timestamp')[:50000]:  # cap to avoid overly large backups; retain_sightings archives older rows
             sightings_payload.append({
                 'plate_number': s.plate_number,
                 'vehicle_type': s.vehicle_type,
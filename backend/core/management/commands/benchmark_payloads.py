@@ -0,0 +1,91 @@
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from core.middleware import brotli
+from core.renderers import MessagePackRenderer, msgpack
+from core.views import DatasetView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare /api/dataset/ payload size and encode time for JSON and MessagePack, "
+        "uncompressed and with gzip/brotli, as CompressionMiddleware would send them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes-sightings', type=int, default=60, help='minutesSightings of the dataset request')
+        parser.add_argument('--limit-sightings', type=int, default=500, help='limitSightings of the dataset request')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per encoding; the best is reported')
+        parser.add_argument('--output', type=str, help='Optional path to write results JSON')
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        request = APIRequestFactory().get('/api/dataset/', {
+            'minutesSightings': options['minutes_sightings'],
+            'limitSightings': options['limit_sightings'],
+        })
+        response = DatasetView.as_view()(request)
+        if response.status_code != 200:
+            raise CommandError(f"Dataset request failed with status {response.status_code}")
+        data = response.data
+
+        formats = {'json': JSONRenderer()}
+        if msgpack is not None:
+            formats['msgpack'] = MessagePackRenderer()
+        else:
+            self.stdout.write(self.style.WARNING("msgpack is not installed; skipping MessagePack"))
+        codecs: Dict[str, Callable[[bytes], bytes]] = {
+            'identity': lambda body: body,
+            'gzip': lambda body: gzip.compress(body, compresslevel=6),  # GZipMiddleware's level
+        }
+        if brotli is not None:
+            from django.conf import settings
+            quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+            codecs['br'] = lambda body: brotli.compress(body, quality=quality)
+        else:
+            self.stdout.write(self.style.WARNING("brotli is not installed; skipping brotli"))
+
+        baseline = None
+        results: Dict[str, Any] = {}
+        for fmt, renderer in formats.items():
+            body = renderer.render(data)
+            render_s = self._best(lambda: renderer.render(data), repeat)
+            for codec, compress in codecs.items():
+                size = len(compress(body))
+                compress_s = self._best(lambda: compress(body), repeat)
+                baseline = baseline or size
+                name = f"{fmt}+{codec}"
+                results[name] = {
+                    'bytes': size,
+                    'ratio': round(size / baseline, 3),
+                    'encode_ms': round((render_s + compress_s) * 1000, 2),
+                }
+                self.stdout.write(
+                    f"{name:18s} bytes={size:9d} ratio={results[name]['ratio']:.3f} "
+                    f"encode={results[name]['encode_ms']}ms"
+                )
+
+        output = options.get('output')
+        if output:
+            try:
+                with open(output, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                raise CommandError(f"Failed to write benchmark results to {output}: {e}")
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
+
+    @staticmethod
+    def _best(fn: Callable[[], Any], repeat: int) -> float:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,85 @@
+import json
+import time
+from typing import Any, Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Alert, Sighting, Vehicle
+from core.serializers import AlertSerializer, SightingSerializer, VehicleSerializer
+from core.services.fast_rows import alert_rows, sighting_rows, vehicle_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list serialization throughput of the model serializers and the "
+        "values()-based encoders in services.fast_rows, and check both render the same JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Rows per model (newest first)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path; the best is reported')
+        parser.add_argument('--output', type=str, help='Optional path to write results JSON')
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        repeat = max(1, options['repeat'])
+        renderer = JSONRenderer()
+
+        cases = [
+            # The serializer path gets select_related so both paths issue one query
+            ('vehicles', Vehicle.objects.order_by('plate_number', 'id')[:rows], VehicleSerializer, vehicle_rows),
+            ('sightings', Sighting.objects.select_related('vehicle').order_by('-timestamp', '-id')[:rows],
+             SightingSerializer, sighting_rows),
+            ('alerts', Alert.objects.order_by('-timestamp', '-id')[:rows], AlertSerializer, alert_rows),
+        ]
+
+        results: Dict[str, Any] = {}
+        mismatched = []
+        for name, qs, serializer_class, encoder in cases:
+            def slow():
+                return renderer.render(serializer_class(list(qs.all()), many=True).data)
+
+            def fast():
+                return renderer.render(encoder.serialize(qs.all()))
+
+            expected, got = slow(), fast()
+            count = len(json.loads(got))
+            if expected != got:
+                mismatched.append(name)
+            slow_s = self._best(slow, repeat)
+            fast_s = self._best(fast, repeat)
+            results[name] = {
+                'rows': count,
+                'identical': expected == got,
+                'serializer_rows_per_sec': round(count / slow_s) if slow_s else None,
+                'fast_rows_per_sec': round(count / fast_s) if fast_s else None,
+                'speedup': round(slow_s / fast_s, 2) if fast_s else None,
+            }
+            self.stdout.write(
+                f"{name:10s} rows={count:6d} serializer={results[name]['serializer_rows_per_sec']}/s "
+                f"fast={results[name]['fast_rows_per_sec']}/s speedup={results[name]['speedup']}x "
+                f"identical={expected == got}"
+            )
+
+        output = options.get('output')
+        if output:
+            try:
+                with open(output, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                raise CommandError(f"Failed to write benchmark results to {output}: {e}")
+
+        if mismatched:
+            raise CommandError(f"Fast path output differs from the serializers for: {', '.join(mismatched)}")
+        self.stdout.write(self.style.SUCCESS("Benchmark complete; fast path output is identical."))
+
+    @staticmethod
+    def _best(fn: Callable[[], Any], repeat: int) -> float:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,152 @@
+import json
+import random
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.utils import timezone
+
+from core.models import Sighting, Vehicle
+from core.management.commands.runsimulator import random_coord
+from core.services.sqlite_tuning import current_pragmas
+
+
+READ_PATHS = [
+    '/api/sightings/recent/?minutes=10',
+    '/api/alerts/recent/?minutes=60',
+    '/api/stats/',
+    '/api/vehicles/',
+]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _summary(samples: List[float], errors: int, locked: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        'ops': len(samples),
+        'ops_per_sec': round(len(samples) / elapsed, 1) if elapsed else 0,
+        'errors': errors,
+        'locked_errors': locked,
+        'p50_ms': round(_percentile(samples, 0.50), 2),
+        'p95_ms': round(_percentile(samples, 0.95), 2),
+        'max_ms': round(max(samples), 2) if samples else 0,
+        'mean_ms': round(statistics.fmean(samples), 2) if samples else 0,
+    }
+
+
+class Command(BaseCommand):
+    help = ("Benchmark SQLite under a mixed load: simulator-style writer threads creating sightings "
+            "while reader threads hit the API. Run once per DB_PROFILE to compare.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Simulator-style writer threads')
+        parser.add_argument('--readers', type=int, default=8, help='API reader threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+        parser.add_argument('--output', type=str, help='Optional path to write benchmark metrics JSON')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"benchmark_sqlite_concurrency targets SQLite (got {connection.vendor})")
+        plates = list(Vehicle.objects.values_list('plate_number', flat=True)[:500])
+        if not plates:
+            raise CommandError('No vehicles in the DB; run seednepali first')
+
+        duration = max(1.0, options['duration'])
+        stop = threading.Event()
+        lock = threading.Lock()
+        results = {
+            'write': {'samples': [], 'errors': 0, 'locked': 0},
+            'read': {'samples': [], 'errors': 0, 'locked': 0},
+        }
+
+        def record(kind: str, samples: List[float], errors: int, locked: int):
+            with lock:
+                results[kind]['samples'].extend(samples)
+                results[kind]['errors'] += errors
+                results[kind]['locked'] += locked
+
+        def writer():
+            samples, errors, locked = [], 0, 0
+            try:
+                while not stop.is_set():
+                    lat, lon = random_coord()
+                    start = time.perf_counter()
+                    try:
+                        # Same write path as runsimulator: one sighting, signals included
+                        Sighting.objects.create(
+                            plate_number=random.choice(plates),
+                            vehicle_type=random.choice(['sedan', 'suv', 'truck', 'van']),
+                            color=random.choice(['white', 'black', 'red', 'blue', 'silver']),
+                            latitude=lat,
+                            longitude=lon,
+                            speed_kmh=random.uniform(10, 80),
+                            heading_deg=random.uniform(0, 360),
+                            timestamp=timezone.now(),
+                        )
+                        samples.append((time.perf_counter() - start) * 1000)
+                    except OperationalError as e:
+                        errors += 1
+                        locked += 'locked' in str(e)
+            finally:
+                record('write', samples, errors, locked)
+                connections.close_all()
+
+        def reader():
+            client = Client(HTTP_HOST='localhost')
+            samples, errors, locked = [], 0, 0
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        resp = client.get(random.choice(READ_PATHS))
+                        if resp.status_code != 200:
+                            errors += 1
+                            continue
+                        samples.append((time.perf_counter() - start) * 1000)
+                    except OperationalError as e:
+                        errors += 1
+                        locked += 'locked' in str(e)
+            finally:
+                record('read', samples, errors, locked)
+                connections.close_all()
+
+        threads = [threading.Thread(target=writer, daemon=True) for _ in range(max(0, options['writers']))]
+        threads += [threading.Thread(target=reader, daemon=True) for _ in range(max(0, options['readers']))]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(duration)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        metrics: Dict[str, Any] = {
+            'db_profile': getattr(settings, 'DB_PROFILE', 'development'),
+            'pragmas': current_pragmas(connection),
+            'conn_max_age': settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+            'writers': options['writers'],
+            'readers': options['readers'],
+            'duration_s': round(elapsed, 2),
+            'write': _summary(results['write']['samples'], results['write']['errors'], results['write']['locked'], elapsed),
+            'read': _summary(results['read']['samples'], results['read']['errors'], results['read']['locked'], elapsed),
+        }
+
+        self.stdout.write(json.dumps(metrics, indent=2))
+        if options.get('output'):
+            try:
+                with open(options['output'], 'w', encoding='utf-8') as f:
+                    json.dump(metrics, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                raise CommandError(f"Failed to write benchmark metrics to {options['output']}: {e}")
+            self.stdout.write(self.style.SUCCESS(f"Benchmark complete. Results saved to {options['output']}"))
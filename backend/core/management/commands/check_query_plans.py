@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.services.query_plans import check_hot_queries
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN QUERY PLAN every hot endpoint/lookup query and fail if any falls back to a full table scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print SQL and plan for every statement')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"check_query_plans understands SQLite plans only (got {connection.vendor})")
+
+        reports = check_hot_queries()
+        failures = [r for r in reports if r['full_scans']]
+        for r in reports:
+            if options['verbose_plans'] or r['full_scans']:
+                style = self.style.ERROR if r['full_scans'] else self.style.NOTICE
+                self.stdout.write(style(f"[{r['name']}] {r['sql']}"))
+                for detail in r['plan']:
+                    self.stdout.write(f"    {detail}")
+
+        if failures:
+            names = sorted({r['name'] for r in failures})
+            raise CommandError(f"{len(failures)} hot queries use full table scans: {', '.join(names)}")
+        self.stdout.write(self.style.SUCCESS(f"Query plans OK: {len(reports)} statements across hot paths use indexes"))
@@ -1,8 +1,10 @@
 from typing import Set
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from core.models import Vehicle, Sighting, Alert
+from core.services import change_seq
 from core.services.nepali_plates import convert_plate_to_nepali, is_valid_nepali_plate
 
 
@@ -62,7 +64,9 @@ class Command(BaseCommand):
             return
 
         # Delete in order: sightings, alerts, vehicles
-        s_deleted, _ = sightings_qs.delete()
+        with transaction.atomic():
+            s_deleted, _ = sightings_qs.delete()
+            change_seq.bump()  # sighting deletes send no signals
         a_deleted, _ = alerts_qs.delete()
         v_deleted, _ = vehicles_qs.delete()
 
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services import stats_buckets
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-minute and hourly stats buckets from the sighting and alert tables (e.g. after first deploying them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Rebuild this many hours back from now (default 24)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows fetched per chunk')
+
+    def handle(self, *args, **options):
+        if options['hours'] < 1:
+            raise CommandError("--hours must be at least 1")
+        now = timezone.now()
+        start = now - timezone.timedelta(hours=options['hours'])
+        # Through the current minute; the range is widened to whole hours
+        end = stats_buckets.minute_of(now) + timezone.timedelta(minutes=1)
+        buckets = stats_buckets.rebuild(start, end, batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {buckets} minute buckets and their hourly roll-ups for the last {options['hours']} hours"
+        ))
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ArchivedDay
+from core.services import stats_buckets
+from core.services.delta_sync import prune_tombstones
+from core.services.retention import archive_table, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Archive Sighting/Alert rows older than the retention window to gzip NDJSON files, then delete them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sighting-days', type=int, default=None, help='Keep this many days of sightings (default RETENTION_SIGHTING_DAYS)')
+        parser.add_argument('--alert-days', type=int, default=None, help='Keep this many days of alerts (default RETENTION_ALERT_DAYS)')
+        parser.add_argument('--archive-dir', type=str, default=None, help='Directory for archive files (default ARCHIVE_DIR)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per export chunk and delete batch (default RETENTION_BATCH_SIZE)')
+        parser.add_argument('--only', type=str, choices=[ArchivedDay.TABLE_SIGHTINGS, ArchivedDay.TABLE_ALERTS], help='Process a single table')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived without writing or deleting')
+
+    def handle(self, *args, **options):
+        days = {
+            ArchivedDay.TABLE_SIGHTINGS: options['sighting_days'] if options['sighting_days'] is not None else getattr(settings, 'RETENTION_SIGHTING_DAYS', 30),
+            ArchivedDay.TABLE_ALERTS: options['alert_days'] if options['alert_days'] is not None else getattr(settings, 'RETENTION_ALERT_DAYS', 90),
+        }
+        archive_dir = str(options['archive_dir'] or getattr(settings, 'ARCHIVE_DIR', 'archive'))
+        batch_size = max(1, int(options['batch_size'] or getattr(settings, 'RETENTION_BATCH_SIZE', 2000)))
+        dry_run = options['dry_run']
+        tables = [options['only']] if options['only'] else list(days.keys())
+
+        for table in tables:
+            if days[table] < 1:
+                raise CommandError(f"Retention for {table} must be at least 1 day")
+            cutoff = retention_cutoff(days[table])
+            self.stdout.write(self.style.NOTICE(f"{table}: archiving rows before {cutoff.isoformat()} (dry_run={dry_run})"))
+            totals = archive_table(
+                table, cutoff, archive_dir, batch_size=batch_size, dry_run=dry_run,
+                log=lambda msg: self.stdout.write(msg),
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{table}: days={totals['days']}, archived={totals['archived']}, deleted={totals['deleted']}"
+            ))
+
+        if not dry_run:
+            pruned = prune_tombstones()
+            self.stdout.write(self.style.SUCCESS(f"tombstones: pruned {pruned} older than DATASET_TOMBSTONE_DAYS"))
+            pruned = stats_buckets.prune()
+            self.stdout.write(self.style.SUCCESS(f"stats buckets: pruned {pruned} older than STATS_BUCKET_DAYS"))
@@ -0,0 +1,70 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core.services.alert_queue import claim_batch, process_job, queue_stats, requeue_stale
+
+
+def _run_job(job) -> bool:
+    try:
+        return process_job(job)
+    finally:
+        # Worker threads each hold their own connection; release it between jobs
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Drain the alert job queue: predict routes and create alerts for hotlist sightings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Worker threads processing jobs concurrently')
+        parser.add_argument('--batch-size', type=int, default=50, help='Jobs claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stats-interval', type=float, default=30.0, help='Seconds between queue depth/lag reports')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        threads = max(1, int(options['threads']))
+        batch_size = max(1, int(options['batch_size']))
+        poll_interval = float(options['poll_interval'])
+        stats_interval = float(options['stats_interval'])
+        once = options['once']
+        worker_id = f"worker-{uuid.uuid4().hex[:12]}"
+
+        self.stdout.write(self.style.SUCCESS(f"Starting alert worker {worker_id} (threads={threads}, batch={batch_size})"))
+        processed = failed = 0
+        next_stats = 0.0
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='alert-worker') as pool:
+            try:
+                while True:
+                    close_old_connections()
+                    requeue_stale()
+                    jobs = claim_batch(batch_size, worker_id=worker_id)
+                    if jobs:
+                        for ok in pool.map(_run_job, jobs):
+                            if ok:
+                                processed += 1
+                            else:
+                                failed += 1
+
+                    now = time.monotonic()
+                    if now >= next_stats:
+                        stats = queue_stats()
+                        self.stdout.write(self.style.NOTICE(
+                            f"queue pending={stats['pending']} running={stats['running']} failed={stats['failed']} "
+                            f"lag={stats['lag_seconds']}s processed={processed} errors={failed}"
+                        ))
+                        next_stats = now + stats_interval
+
+                    if not jobs:
+                        if once:
+                            break
+                        time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('Stopping alert worker...'))
+
+        self.stdout.write(self.style.SUCCESS(f"Alert worker stopped. processed={processed}, errors={failed}"))
@@ -6,6 +6,7 @@ from django.utils import timezone
 from core.models import Vehicle, Sighting
 from core.services.nepali_plates import generate_unique, extract_province_from_plate
 from core.services.nepali_text import pick_devanagari_name
+from core.services.plate_cache import plate_cache
 
 
 NEPALI_POOL = []
@@ -89,7 +90,7 @@ class Command(BaseCommand):
 
             Sighting.objects.create(
                 plate_number=plate,
-                vehicle=Vehicle.objects.filter(plate_number__iexact=plate).first(),
+                vehicle_id=(plate_cache.lookup(plate) or (None,))[0],
                 vehicle_type=vtype,
                 color=color,
                 latitude=lat,
@@ -8,6 +8,7 @@ from django.utils import timezone
 from core.models import Vehicle, Sighting, Alert
 from core.services.nepali_plates import generate_unique, extract_province_from_plate
 from core.services.nepali_text import pick_devanagari_name
+from core.services.write_behind import flush_all
 
 
 PROVINCE_CENTERS = {
@@ -98,10 +99,7 @@ class Command(BaseCommand):
                         timestamp=ts,
                     )
                     created_s += 1
-                    # Track last_seen
-                    if (not v.last_seen) or (ts > v.last_seen):
-                        v.last_seen = ts
-                        v.save(update_fields=['last_seen'])
+                    # last_seen is tracked by the sighting signal's write-behind buffer
 
             # Alerts for flagged vehicles
             if include_a and v.status in (Vehicle.STATUS_SUSPICIOUS, Vehicle.STATUS_STOLEN):
@@ -119,6 +117,9 @@ class Command(BaseCommand):
                 )
                 created_a += 1
 
+        # Apply coalesced last_seen updates in one pass
+        flush_all()
+
         self.stdout.write(self.style.SUCCESS(
             f"Seeding complete. vehicles={created_v}, sightings={created_s}, alerts={created_a}"
         ))
\ No newline at end of file
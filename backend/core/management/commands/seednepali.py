@@ -9,6 +9,7 @@ from core.models import Vehicle, Sighting, Alert, PredictedRoute, DatasetVersion
 from core.services.nepali_plates import generate_unique, extract_province_from_plate
 from core.services.nepali_text import pick_devanagari_name
 from core.services.prediction import predict_route
+from core.services.write_behind import flush_all
 
 
 def _random_coord_in_nepal() -> Tuple[float, float]:
@@ -92,7 +93,7 @@ class Command(BaseCommand):
                         dlat = random.uniform(-0.01, 0.01)
                         dlon = random.uniform(-0.01, 0.01)
                         ts = now - timezone.timedelta(minutes=random.randint(0, 90))
-                        s = Sighting.objects.create(
+                        Sighting.objects.create(
                             plate_number=v.plate_number,
                             vehicle=v,
                             vehicle_type='',
@@ -104,10 +105,7 @@ class Command(BaseCommand):
                             timestamp=ts,
                         )
                         created_sightings += 1
-                        # Track last seen
-                        if v.last_seen is None or v.last_seen < s.timestamp:
-                            v.last_seen = s.timestamp
-                            v.save(update_fields=['last_seen', 'updated_at'])
+                        # last_seen is tracked by the sighting signal's write-behind buffer
 
                     # Alerts for suspicious/stolen
                     if v.status in (Vehicle.STATUS_SUSPICIOUS, Vehicle.STATUS_STOLEN):
@@ -145,6 +143,9 @@ class Command(BaseCommand):
                 },
             )
 
+        # Apply coalesced last_seen updates in one pass
+        flush_all()
+
         self.stdout.write(self.style.SUCCESS(
             f"Seed complete: vehicles={created_vehicles}, sightings={created_sightings}, alerts={created_alerts}, routes={created_routes}"
         ))
\ No newline at end of file
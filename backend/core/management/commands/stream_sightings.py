@@ -0,0 +1,86 @@
+import http.client
+import json
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import Vehicle
+from core.management.commands.runsimulator import random_coord
+
+
+class Command(BaseCommand):
+    help = "Local test client for the streaming ingest channel: POSTs chunked NDJSON sightings and prints batch acks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', type=str, default='http://127.0.0.1:8000/api/sightings/stream/', help='Streaming ingest URL (ASGI server)')
+        parser.add_argument('--file', type=str, help="NDJSON file of sightings to send ('-' for stdin); default simulates sightings")
+        parser.add_argument('--count', type=int, default=1000, help='Number of simulated sightings')
+        parser.add_argument('--rate', type=float, default=0, help='Simulated sightings per second (0 = as fast as possible)')
+
+    def _simulated(self, count: int, rate: float):
+        plates = list(Vehicle.objects.values_list('plate_number', flat=True)[:500])
+        if not plates:
+            raise CommandError('No vehicles in the local DB to simulate; run seednepali first or pass --file')
+        delay = 1.0 / rate if rate > 0 else 0
+        for _ in range(count):
+            lat, lon = random_coord()
+            yield {
+                'plate_number': random.choice(plates),
+                'vehicle_type': random.choice(['sedan', 'suv', 'truck', 'van']),
+                'color': random.choice(['white', 'black', 'red', 'blue', 'silver']),
+                'latitude': lat,
+                'longitude': lon,
+                'speed_kmh': random.uniform(10, 80),
+                'heading_deg': random.uniform(0, 360),
+                'timestamp': timezone.now().isoformat(),
+            }
+            if delay:
+                time.sleep(delay)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https'):
+            raise CommandError('Only http(s) URLs are supported by this client')
+
+        if options.get('file'):
+            src = sys.stdin if options['file'] == '-' else open(options['file'], 'r', encoding='utf-8')
+            lines = (line if line.endswith('\n') else line + '\n' for line in src if line.strip())
+        else:
+            lines = (json.dumps(s, ensure_ascii=False) + '\n' for s in self._simulated(options['count'], options['rate']))
+
+        conn_cls = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        conn = conn_cls(url.hostname, url.port or (443 if url.scheme == 'https' else 80))
+        start = time.perf_counter()
+        conn.request(
+            'POST', url.path or '/',
+            body=(line.encode('utf-8') for line in lines),
+            headers={'Content-Type': 'application/x-ndjson'},
+            encode_chunked=True,
+        )
+        resp = conn.getresponse()
+        if resp.status != 200:
+            raise CommandError(f"Stream rejected: {resp.status} {resp.reason}")
+
+        summary = None
+        for raw in resp:
+            msg = json.loads(raw)
+            if msg.get('done'):
+                summary = msg
+                continue
+            self.stdout.write(self.style.NOTICE(
+                f"ack {msg['ack']}: through line {msg['through_line']}, accepted={msg['accepted']}, "
+                f"alerts={msg['alerts']}, errors={len(msg['errors'])}"
+            ))
+        elapsed = time.perf_counter() - start
+        conn.close()
+
+        if summary:
+            rate = summary['accepted'] / elapsed if elapsed else 0
+            self.stdout.write(self.style.SUCCESS(
+                f"Stream complete: lines={summary['lines']}, accepted={summary['accepted']}, "
+                f"rejected={summary['rejected']} in {elapsed:.2f}s ({rate:.0f} sightings/s)"
+            ))
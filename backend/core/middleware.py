@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:  # optional: `pip install brotli`
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+_coding_re = _lazy_re_compile(r'^\s*([^;\s]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def accepted_encodings(header: str) -> dict:
+    """{coding: q} from an Accept-Encoding header."""
+    codings = {}
+    for part in header.split(','):
+        m = _coding_re.match(part)
+        if not m:
+            continue
+        try:
+            codings[m.group(1).lower()] = float(m.group(2)) if m.group(2) else 1.0
+        except ValueError:
+            continue
+    return codings
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Negotiated brotli/gzip compression of large responses.
+
+    Brotli is used when the `brotli` package is installed and the client
+    prefers it (browsers send `gzip, deflate, br`), gzip otherwise. Bodies
+    under COMPRESSION_MIN_BYTES are sent as they are; the saving would not pay
+    for the work. Content types in COMPRESSION_EXCLUDED_TYPES are never
+    compressed. Streams such as Server-Sent Events must reach the client
+    event by event, and a compressor would buffer them. As with Django's
+    GZipMiddleware, ETags become weak, which conditional GET still matches.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type in getattr(settings, 'COMPRESSION_EXCLUDED_TYPES', ()):
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, 'COMPRESSION_MIN_BYTES', 1024):
+            return response
+        if brotli is not None and not response.streaming and not response.has_header('Content-Encoding'):
+            codings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            if codings.get('br', 0) > 0 and codings['br'] >= codings.get('gzip', 0):
+                return self._brotli(response)
+        return super().process_response(request, response)
+
+    @staticmethod
+    def _brotli(response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        compressed = brotli.compress(response.content, quality=quality)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
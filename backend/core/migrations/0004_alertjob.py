@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_datasetversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('plate_number', models.CharField(max_length=32)),
+                ('vehicle_status', models.CharField(choices=[('normal', 'Normal'), ('suspicious', 'Suspicious'), ('stolen', 'Stolen')], max_length=16)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('speed_kmh', models.FloatField(default=0)),
+                ('heading_deg', models.FloatField(default=0)),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('claimed_by', models.CharField(blank=True, default='', max_length=64)),
+                ('last_error', models.CharField(blank=True, default='', max_length=256)),
+                ('enqueued_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('sighting', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alert_jobs', to='core.sighting')),
+                ('vehicle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alert_jobs', to='core.vehicle')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state', 'id'], name='core_alertj_state_4a31a3_idx'), models.Index(fields=['claimed_by'], name='core_alertj_claimed_ccd9e4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:22
+
+import re
+
+from django.db import migrations, models
+
+
+PLATE_KEY_MODELS = [
+    'Vehicle', 'Sighting', 'Alert', 'PredictedRoute',
+    'PoliceVehicleRegistration', 'StolenVehicleReport',
+]
+
+
+_DEV_DIGITS = str.maketrans('0123456789', '०१२३४५६७८९')
+
+
+def _plate_key(plate):
+    """Frozen copy of services.nepali_plates.plate_key as of this migration."""
+    p = (plate or '').strip().replace('—', '-').replace('–', '-').translate(_DEV_DIGITS)
+    p = re.sub(r"\s*-\s*", "-", p)
+    return ' '.join(p.split()).upper()
+
+
+def backfill_plate_keys(apps, schema_editor):
+    """Populate plate_key for existing rows in chunks."""
+    chunk = 2000
+    for name in PLATE_KEY_MODELS:
+        model = apps.get_model('core', name)
+        batch = []
+        for obj in model.objects.only('id', 'plate_number').iterator(chunk_size=chunk):
+            obj.plate_key = _plate_key(obj.plate_number)
+            batch.append(obj)
+            if len(batch) >= chunk:
+                model.objects.bulk_update(batch, ['plate_key'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['plate_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alertjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='policevehicleregistration',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='predictedroute',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='sighting',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='stolenvehiclereport',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+        ),
+        migrations.RunPython(backfill_plate_keys, migrations.RunPython.noop),
+    ]
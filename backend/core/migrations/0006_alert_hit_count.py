@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_plate_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='hit_count',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='last_hit_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alert_hit_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(choices=[('sightings', 'Sightings'), ('alerts', 'Alerts')], max_length=16)),
+                ('day', models.DateField()),
+                ('rows', models.IntegerField(default=0)),
+                ('max_id', models.BigIntegerField(default=0)),
+                ('path', models.CharField(max_length=512)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['table', 'day'], name='core_archiv_table_e0f2d1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_archivedday'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='predictedroute',
+            name='plate_key',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='sighting',
+            name='plate_key',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['timestamp'], name='core_alert_timesta_c680be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictedroute',
+            index=models.Index(fields=['plate_key', 'generated_at'], name='core_predic_plate_k_7ec6fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sighting',
+            index=models.Index(fields=['timestamp'], name='core_sighti_timesta_d31bf7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sighting',
+            index=models.Index(fields=['plate_key', 'timestamp'], name='core_sighti_plate_k_6e2578_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_change_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='plate_display',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='predictedroute',
+            name='plate_display',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='sighting',
+            name='plate_display',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_display',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_plate_display'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minute', models.DateTimeField()),
+                ('province', models.CharField(blank=True, default='', max_length=8)),
+                ('status', models.CharField(blank=True, default='', max_length=16)),
+                ('sightings', models.IntegerField(default=0)),
+                ('alerts', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='statsbucket',
+            constraint=models.UniqueConstraint(fields=('minute', 'province', 'status'), name='stats_bucket_key'),
+        ),
+    ]
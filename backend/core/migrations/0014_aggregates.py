@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_stats_buckets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlateHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour_no', models.IntegerField()),
+                ('province', models.CharField(blank=True, default='', max_length=8)),
+                ('status', models.CharField(blank=True, default='', max_length=16)),
+                ('plate_key', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StatsHourBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour_no', models.IntegerField()),
+                ('province', models.CharField(blank=True, default='', max_length=8)),
+                ('status', models.CharField(blank=True, default='', max_length=16)),
+                ('sightings', models.IntegerField(default=0)),
+                ('alerts', models.IntegerField(default=0)),
+                ('speed_sum', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='statsbucket',
+            name='speed_sum',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='statshourbucket',
+            constraint=models.UniqueConstraint(fields=('hour_no', 'province', 'status'), name='stats_hour_bucket_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='platehour',
+            constraint=models.UniqueConstraint(fields=('hour_no', 'province', 'status', 'plate_key'), name='plate_hour_key'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sighting',
+            name='cell',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='sighting',
+            index=models.Index(fields=['cell'], name='core_sighti_cell_68bdfe_idx'),
+        ),
+    ]
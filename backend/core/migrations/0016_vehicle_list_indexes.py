@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:58
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_sighting_cell'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['owner'], name='core_vehicl_owner_d9ea76_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['last_seen'], name='core_vehicl_last_se_ba0064_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(django.db.models.functions.text.Lower('owner'), name='core_vehicle_owner_lower'),
+        ),
+    ]
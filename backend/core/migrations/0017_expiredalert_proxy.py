@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_vehicle_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiredAlert',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('core.alert',),
+        ),
+    ]
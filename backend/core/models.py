@@ -1,9 +1,71 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
-from django.db import models
 
+from .services.nepali_plates import display_plate, plate_key
+from .services.spatial import grid_cell
 
-class Vehicle(models.Model):
+
+class PlateKeyMixin:
+    """Keeps the indexed `plate_key` column in sync with `plate_number` on save().
+
+    bulk_create/update() bypass save(); callers using them must set plate_key.
+    """
+
+    def save(self, *args, **kwargs):
+        self.plate_key = plate_key(self.plate_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'plate_number' in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['plate_key']
+        super().save(*args, **kwargs)
+
+
+class PlateDisplayMixin:
+    """Stores the Devanagari display form of `plate_number` in `plate_display` on save().
+
+    Serializers emit the stored value instead of converting on every read.
+    bulk_create/update() bypass save(); callers using them must set
+    plate_display (rows left empty are converted on read and filled by
+    backfill_plate_display).
+    """
+
+    def save(self, *args, **kwargs):
+        self.plate_display = display_plate(self.plate_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'plate_number' in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['plate_display']
+        super().save(*args, **kwargs)
+
+
+class UpdatedAtMixin:
+    """Makes save(update_fields=[...]) also write the auto_now `updated_at`.
+
+    Dataset delta sync (services.delta_sync) finds changed rows by
+    updated_at; update() bypasses this, so callers using it must set it.
+    """
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'updated_at' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['updated_at']
+        super().save(*args, **kwargs)
+
+
+class AtomicSaveMixin:
+    """Runs save() and its post_save receivers (signals.py) in one transaction.
+
+    The receivers link the vehicle, count stats and bump the change
+    sequence; committing them with the row keeps readers from seeing one
+    without the other, and costs one commit instead of one per statement.
+    Deletes get the same from Django's collector.
+    """
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class Vehicle(AtomicSaveMixin, UpdatedAtMixin, PlateDisplayMixin, PlateKeyMixin, models.Model):
     STATUS_NORMAL = 'normal'
     STATUS_SUSPICIOUS = 'suspicious'
     STATUS_STOLEN = 'stolen'
@@ -14,6 +76,8 @@ class Vehicle(models.Model):
     ]
 
     plate_number = models.CharField(max_length=32, unique=True)
+    plate_key = models.CharField(max_length=32, db_index=True, editable=False, default='')
+    plate_display = models.CharField(max_length=32, editable=False, default='')
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_NORMAL)
     owner = models.CharField(max_length=128, blank=True, default='')
     last_seen = models.DateTimeField(null=True, blank=True)
@@ -21,12 +85,26 @@ class Vehicle(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # filter_by_status pages in (plate_number, id) order
+            models.Index(fields=["status", "plate_number"]),
+            # dataset delta sync
+            models.Index(fields=["updated_at"]),
+            # list sort keys and owner search (services.list_query)
+            models.Index(fields=["owner"]),
+            models.Index(fields=["last_seen"]),
+            models.Index(Lower("owner"), name="core_vehicle_owner_lower"),
+        ]
+
     def __str__(self):
         return f"{self.plate_number} ({self.status})"
 
 
-class Sighting(models.Model):
+class Sighting(AtomicSaveMixin, PlateDisplayMixin, PlateKeyMixin, models.Model):
     plate_number = models.CharField(max_length=32)
+    plate_key = models.CharField(max_length=32, editable=False, default='')
+    plate_display = models.CharField(max_length=32, editable=False, default='')
     vehicle = models.ForeignKey(Vehicle, null=True, blank=True, on_delete=models.SET_NULL, related_name='sightings')
     vehicle_type = models.CharField(max_length=64, blank=True, default='')
     color = models.CharField(max_length=64, blank=True, default='')
@@ -35,6 +113,24 @@ class Sighting(models.Model):
     speed_kmh = models.FloatField(default=0)
     heading_deg = models.FloatField(default=0)  # 0-360 degrees, 0 is North
     timestamp = models.DateTimeField(default=timezone.now)
+    # Spatial grid cell of (latitude, longitude) for bbox/near filters (services.spatial)
+    cell = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # recent/stats/dataset windows, and per-plate history
+            models.Index(fields=["timestamp"]),
+            models.Index(fields=["plate_key", "timestamp"]),
+            models.Index(fields=["cell"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        # bulk_create/update() bypass this; callers using them must set cell
+        self.cell = grid_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = list(update_fields) + ['cell']
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.plate_number} @ {self.latitude:.5f},{self.longitude:.5f}"
@@ -60,8 +156,10 @@ class DatasetVersion(models.Model):
         return f"Dataset {self.version_label} @ {self.applied_at.isoformat()}"
 
 
-class Alert(models.Model):
+class Alert(AtomicSaveMixin, UpdatedAtMixin, PlateDisplayMixin, PlateKeyMixin, models.Model):
     plate_number = models.CharField(max_length=32)
+    plate_key = models.CharField(max_length=32, db_index=True, editable=False, default='')
+    plate_display = models.CharField(max_length=32, editable=False, default='')
     vehicle = models.ForeignKey(Vehicle, null=True, blank=True, on_delete=models.SET_NULL, related_name='alerts')
     status = models.CharField(max_length=16, choices=Vehicle.STATUS_CHOICES)
     timestamp = models.DateTimeField(default=timezone.now)
@@ -70,24 +168,208 @@ class Alert(models.Model):
     message = models.CharField(max_length=256, blank=True, default='')
     acknowledged = models.BooleanField(default=False)
     dispatched = models.BooleanField(default=False)
+    hit_count = models.IntegerField(default=1)  # sightings folded into this alert by suppression
+    last_hit_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["timestamp"]),
+            models.Index(fields=["updated_at"]),
+        ]
 
     def __str__(self):
         return f"ALERT {self.plate_number} [{self.status}]"
 
 
-class PredictedRoute(models.Model):
+class ExpiredAlert(Alert):
+    """Alerts as retention deletes them (services.retention).
+
+    No receivers are registered for this sender, so a queryset delete()
+    through it is one DELETE per batch instead of per-row post_delete
+    bookkeeping; retention does what bookkeeping it needs in bulk.
+    """
+
+    class Meta:
+        proxy = True
+
+
+class PredictedRoute(PlateDisplayMixin, PlateKeyMixin, models.Model):
     plate_number = models.CharField(max_length=32)
+    plate_key = models.CharField(max_length=32, editable=False, default='')
+    plate_display = models.CharField(max_length=32, editable=False, default='')
     path = models.JSONField(default=list)  # list of {lat, lon, t}
     generated_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # latest route per plate (VehicleViewSet.predicted)
+            models.Index(fields=["plate_key", "generated_at"]),
+        ]
+
     def __str__(self):
         return f"Route {self.plate_number} ({len(self.path)} pts)"
 
-class PoliceVehicleRegistration(models.Model):
+class AlertJob(models.Model):
+    """Queued alert/route-prediction work for a hotlist sighting, drained by run_alert_worker."""
+    STATE_PENDING = 'pending'
+    STATE_RUNNING = 'running'
+    STATE_FAILED = 'failed'
+    STATE_CHOICES = [
+        (STATE_PENDING, 'Pending'),
+        (STATE_RUNNING, 'Running'),
+        (STATE_FAILED, 'Failed'),
+    ]
+
+    sighting = models.ForeignKey(Sighting, null=True, blank=True, on_delete=models.SET_NULL, related_name='alert_jobs')
+    vehicle = models.ForeignKey(Vehicle, null=True, blank=True, on_delete=models.SET_NULL, related_name='alert_jobs')
+    plate_number = models.CharField(max_length=32)
+    vehicle_status = models.CharField(max_length=16, choices=Vehicle.STATUS_CHOICES)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    speed_kmh = models.FloatField(default=0)
+    heading_deg = models.FloatField(default=0)
+    state = models.CharField(max_length=16, choices=STATE_CHOICES, default=STATE_PENDING)
+    attempts = models.IntegerField(default=0)
+    claimed_by = models.CharField(max_length=64, blank=True, default='')
+    last_error = models.CharField(max_length=256, blank=True, default='')
+    enqueued_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "id"]),
+            models.Index(fields=["claimed_by"]),
+        ]
+
+    def __str__(self):
+        return f"AlertJob {self.plate_number} [{self.state}]"
+
+
+class ArchivedDay(models.Model):
+    """Per-day record of Sighting/Alert rows moved to compressed archive files by retain_sightings."""
+    TABLE_SIGHTINGS = 'sightings'
+    TABLE_ALERTS = 'alerts'
+    TABLE_CHOICES = [
+        (TABLE_SIGHTINGS, 'Sightings'),
+        (TABLE_ALERTS, 'Alerts'),
+    ]
+
+    table = models.CharField(max_length=16, choices=TABLE_CHOICES)
+    day = models.DateField()
+    rows = models.IntegerField(default=0)
+    max_id = models.BigIntegerField(default=0)  # highest primary key included in this archive file
+    path = models.CharField(max_length=512)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=["table", "day"]),
+        ]
+
+    def __str__(self):
+        return f"Archive {self.table} {self.day} ({self.rows} rows)"
+
+
+class Tombstone(models.Model):
+    """Deleted Vehicle/Alert ids, so dataset delta sync can tell clients to drop them."""
+    TABLE_VEHICLES = 'vehicles'
+    TABLE_ALERTS = 'alerts'
+    TABLE_CHOICES = [
+        (TABLE_VEHICLES, 'Vehicles'),
+        (TABLE_ALERTS, 'Alerts'),
+    ]
+
+    table = models.CharField(max_length=16, choices=TABLE_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.table} #{self.object_id}"
+
+
+class ChangeSequence(models.Model):
+    """Single-row counter bumped by every Vehicle/Sighting/Alert write (services.change_seq)."""
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Change sequence {self.value}"
+
+
+class StatsBucket(models.Model):
+    """Per-minute sighting/alert counts by plate province and status (services.stats_buckets).
+
+    `status` is the vehicle's status at sighting time for sightings and the
+    alert status for alerts; '' for unknown vehicles. `province` is '' for
+    plates without one (legacy zone plates).
+    """
+    minute = models.DateTimeField()
+    province = models.CharField(max_length=8, blank=True, default='')
+    status = models.CharField(max_length=16, blank=True, default='')
+    sightings = models.IntegerField(default=0)
+    alerts = models.IntegerField(default=0)
+    speed_sum = models.FloatField(default=0)  # of sighting speeds, for averages
+
+    class Meta:
+        constraints = [
+            # Also the index for minute-range reads
+            models.UniqueConstraint(fields=["minute", "province", "status"], name="stats_bucket_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.minute:%Y-%m-%d %H:%M} {self.province or '-'}/{self.status or '-'}: {self.sightings}s {self.alerts}a"
+
+
+class StatsHourBucket(models.Model):
+    """Hourly roll-up of StatsBucket, kept longer for multi-day aggregates (services.aggregates).
+
+    `hour_no` is hours since the Unix epoch, so N-hour buckets group in SQL
+    as hour_no / N.
+    """
+    hour_no = models.IntegerField()
+    province = models.CharField(max_length=8, blank=True, default='')
+    status = models.CharField(max_length=16, blank=True, default='')
+    sightings = models.IntegerField(default=0)
+    alerts = models.IntegerField(default=0)
+    speed_sum = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hour_no", "province", "status"], name="stats_hour_bucket_key"),
+        ]
+
+    def __str__(self):
+        return f"hour {self.hour_no} {self.province or '-'}/{self.status or '-'}: {self.sightings}s {self.alerts}a"
+
+
+class PlateHour(models.Model):
+    """Plates seen per hour, province and status: distinct-plate counts for hour-sized and larger buckets."""
+    hour_no = models.IntegerField()
+    province = models.CharField(max_length=8, blank=True, default='')
+    status = models.CharField(max_length=16, blank=True, default='')
+    plate_key = models.CharField(max_length=32)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hour_no", "province", "status", "plate_key"], name="plate_hour_key"),
+        ]
+
+    def __str__(self):
+        return f"hour {self.hour_no} {self.plate_key}"
+
+
+class PoliceVehicleRegistration(PlateKeyMixin, models.Model):
     """Authoritative police registration record for vehicles."""
     registration_id = models.CharField(max_length=64, unique=True)
     plate_number = models.CharField(max_length=32)
+    plate_key = models.CharField(max_length=32, db_index=True, editable=False, default='')
     make = models.CharField(max_length=64, blank=True, default='')
     model = models.CharField(max_length=64, blank=True, default='')
     owner_name = models.CharField(max_length=128, blank=True, default='')
@@ -105,7 +387,7 @@ class PoliceVehicleRegistration(models.Model):
         return f"{self.plate_number} ({self.registration_id})"
 
 
-class StolenVehicleReport(models.Model):
+class StolenVehicleReport(PlateKeyMixin, models.Model):
     """Police reports for stolen vehicles."""
     STATUS_OPEN = 'open'
     STATUS_RESOLVED = 'resolved'
@@ -116,6 +398,7 @@ class StolenVehicleReport(models.Model):
 
     case_number = models.CharField(max_length=64, unique=True)
     plate_number = models.CharField(max_length=32)
+    plate_key = models.CharField(max_length=32, db_index=True, editable=False, default='')
     registration = models.ForeignKey(PoliceVehicleRegistration, null=True, blank=True, on_delete=models.SET_NULL, related_name='stolen_reports')
     report_timestamp = models.DateTimeField(default=timezone.now)
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_OPEN)
@@ -0,0 +1,176 @@
+import base64
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on the full ordering tuple, e.g. (timestamp, id).
+
+    The cursor is the ordering values of the last (or first, for `previous`)
+    row on the page, and the next page is fetched with a keyset condition
+    instead of an OFFSET, so every page costs one index range read however
+    deep it is. The view's `ordering` must end in a unique column (id), and
+    only its leading column may be nullable.
+
+    A nullable leading column sorts NULL as the smallest value (first
+    ascending, last descending). Its NULL and non-NULL rows are paged as two
+    phases, each a plain index range: `col IS NULL` by the remaining columns,
+    and `col < X` / `col > X` for the rest. A page that exhausts the first
+    phase is topped up from the second, and its cursor points into it.
+
+    Response: {"next": url|null, "previous": url|null, "results": [...]}.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering: Sequence[str] = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view) -> List[str]:
+        ordering = list(getattr(view, 'ordering', None) or self.ordering)
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
+
+    def get_page_size(self, request) -> int:
+        size = api_settings.PAGE_SIZE or 100
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                size = int(raw)
+            except ValueError:
+                pass
+        return max(1, min(size, self.max_page_size))
+
+    # Cursor encoding: urlsafe base64 of {"p": [ordering values], "r": reverse}
+    def encode_cursor(self, position: List[Any], reverse: bool) -> str:
+        payload = {'p': [v.isoformat() if hasattr(v, 'isoformat') else v for v in position]}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request, model, ordering) -> Optional[Tuple[List[Any], bool]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            payload = json.loads(raw.decode('utf-8'))
+            values = payload['p']
+            if len(values) != len(ordering):
+                raise ValueError('cursor does not match ordering')
+            position = [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    @staticmethod
+    def _after(ordering: List[str], position: List[Any]) -> Q:
+        """Rows strictly after `position` in `ordering`.
+
+        Written as a range on the leading column AND the tuple comparison so
+        SQLite can drive it from the leading column's index.
+        """
+        def op(name: str, strict: bool) -> str:
+            desc = name.startswith('-')
+            return f"{name.lstrip('-')}__{'lt' if desc else 'gt'}{'' if strict else 'e'}"
+
+        tuple_cmp = Q()
+        for i in range(len(ordering)):
+            term = Q(**{op(ordering[i], True): position[i]})
+            for j in range(i):
+                term &= Q(**{ordering[j].lstrip('-'): position[j]})
+            tuple_cmp |= term
+        return Q(**{op(ordering[0], False): position[0]}) & tuple_cmp
+
+    def _rows_after(self, qs, ordering: List[str], position: Optional[List[Any]], limit: int, nullable: bool) -> list:
+        """Up to `limit` rows of `qs` (ordered by `ordering`) after `position`."""
+        if not nullable:
+            if position is not None:
+                qs = qs.filter(self._after(ordering, position))
+            return list(qs[:limit])
+        lead = ordering[0].lstrip('-')
+        # NULL is the smallest value: its phase comes first ascending, last descending
+        phases = [True, False] if not ordering[0].startswith('-') else [False, True]
+        if position is not None:
+            phases = phases[phases.index(position[0] is None):]
+        rows: list = []
+        for null_phase in phases:
+            phase = qs.filter(**{f'{lead}__isnull': null_phase})
+            if position is not None and null_phase == (position[0] is None):
+                phase = phase.filter(self._after(ordering[1:], position[1:]) if null_phase else self._after(ordering, position))
+            rows += list(phase[:limit - len(rows)])
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(view)
+        self.ordering_fields = [name.lstrip('-') for name in ordering]
+        cursor = self.decode_cursor(request, queryset.model, ordering)
+        position, reverse = cursor if cursor else (None, False)
+
+        effective = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering] if reverse else ordering
+        nullable = queryset.model._meta.get_field(self.ordering_fields[0]).null
+        rows = self._rows_after(queryset.order_by(*effective), effective, position, self.page_size + 1, nullable)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def _position(self, obj) -> List[Any]:
+        # Pages are model instances, or values() dicts / named values_list() rows on the fast list path
+        if isinstance(obj, dict):
+            return [obj[name] for name in self.ordering_fields]
+        return [getattr(obj, name) for name in self.ordering_fields]
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self._position(self.page[-1]), False))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self._position(self.page[0]), True))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
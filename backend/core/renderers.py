@@ -0,0 +1,27 @@
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:  # optional: `pip install msgpack`
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack for clients sending `Accept: application/msgpack` (or `?format=msgpack`).
+
+    Same structure as the JSON responses. Values msgpack has no type for
+    (datetimes, decimals, UUIDs) are converted as DRF's JSON encoder does, so
+    the two formats decode to equal data. Only enabled in settings when the
+    msgpack package is installed.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, use_bin_type=True, default=JSONEncoder().default)
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Vehicle, Sighting, Alert, PredictedRoute
-from .services.nepali_plates import convert_plate_to_nepali
+from .services.nepali_plates import display_plate
 from .models import (
     PoliceVehicleRegistration,
     StolenVehicleReport,
@@ -9,7 +9,20 @@ from .models import (
 )
 
 
-class VehicleSerializer(serializers.ModelSerializer):
+class DisplayPlateMixin:
+    """Emit the stored Devanagari `plate_display` as `plate_number`.
+
+    Rows written before the column existed (or by bulk paths that skipped
+    it) are converted on read until backfill_plate_display fills them.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['plate_number'] = getattr(instance, 'plate_display', '') or display_plate(data.get('plate_number'))
+        return data
+
+
+class VehicleSerializer(DisplayPlateMixin, serializers.ModelSerializer):
     class Meta:
         model = Vehicle
         fields = [
@@ -17,17 +30,8 @@ class VehicleSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        try:
-            data['plate_number'] = convert_plate_to_nepali(data.get('plate_number'))
-        except Exception:
-            # Preserve original on failure
-            pass
-        return data
-
 
-class SightingSerializer(serializers.ModelSerializer):
+class SightingSerializer(DisplayPlateMixin, serializers.ModelSerializer):
     # Include nested vehicle details to support frontend map status and display
     vehicle = VehicleSerializer(read_only=True)
 
@@ -38,45 +42,33 @@ class SightingSerializer(serializers.ModelSerializer):
             'latitude', 'longitude', 'speed_kmh', 'heading_deg', 'timestamp'
         ]
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        try:
-            data['plate_number'] = convert_plate_to_nepali(data.get('plate_number'))
-        except Exception:
-            pass
-        return data
-
 
-class AlertSerializer(serializers.ModelSerializer):
+class AlertSerializer(DisplayPlateMixin, serializers.ModelSerializer):
     class Meta:
         model = Alert
         fields = [
             'id', 'plate_number', 'vehicle', 'status', 'timestamp',
             'predicted_latitude', 'predicted_longitude', 'message',
-            'acknowledged', 'dispatched', 'created_at'
+            'acknowledged', 'dispatched', 'hit_count', 'last_hit_at', 'created_at'
         ]
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        try:
-            data['plate_number'] = convert_plate_to_nepali(data.get('plate_number'))
-        except Exception:
-            pass
-        return data
-
 
-class PredictedRouteSerializer(serializers.ModelSerializer):
+class PredictedRouteSerializer(DisplayPlateMixin, serializers.ModelSerializer):
     class Meta:
         model = PredictedRoute
         fields = ['id', 'plate_number', 'path', 'generated_at']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        try:
-            data['plate_number'] = convert_plate_to_nepali(data.get('plate_number'))
-        except Exception:
-            pass
-        return data
+
+class SightingIngestSerializer(serializers.Serializer):
+    """Validates a single item of a bulk sighting upload."""
+    plate_number = serializers.CharField(max_length=32)
+    vehicle_type = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    color = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    speed_kmh = serializers.FloatField(required=False, default=0)
+    heading_deg = serializers.FloatField(required=False, default=0)
+    timestamp = serializers.DateTimeField(required=False)
 
 
 class VerificationRequestSerializer(serializers.Serializer):
@@ -0,0 +1,158 @@
+"""Time-bucketed counts for dashboard charts: GET /api/aggregates/.
+
+Per bucket and group (plate province and/or status) the response carries
+sighting and alert counts, average sighting speed and distinct plates. It
+reads the pre-rolled counters from services.stats_buckets, never the raw
+tables, except for one case: sub-hour distinct plates.
+
+- Buckets of an hour or more read StatsHourBucket and PlateHour and group
+  in SQL on hour_no / N. Multi-day ranges touch one row per hour and group.
+- Sub-hour buckets sum StatsBucket minutes. Distinct plates come from an
+  index range over sightings, so these ranges are capped at
+  AGGREGATE_RAW_MAX_HOURS. There, status is the vehicle's current status.
+
+Buckets are aligned to the Unix epoch (UTC), and the range is widened to
+whole buckets. Empty buckets are omitted.
+"""
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import PlateHour, Sighting, StatsBucket, StatsHourBucket
+from core.services.stats_buckets import EPOCH, hour_no, province_of
+
+BUCKETS: 'OrderedDict[str, int]' = OrderedDict([
+    ('1m', 60), ('5m', 300), ('15m', 900), ('30m', 1800),
+    ('1h', 3600), ('3h', 3 * 3600), ('6h', 6 * 3600), ('12h', 12 * 3600), ('1d', 86400),
+])
+DIMENSIONS = ('province', 'status')
+
+
+def parse_group(raw: Optional[str]) -> List[str]:
+    group = [g.strip() for g in (raw or '').split(',') if g.strip()]
+    unknown = [g for g in group if g not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown group {', '.join(unknown)}; use {', '.join(DIMENSIONS)}")
+    return [d for d in DIMENSIONS if d in group]
+
+
+def parse_time(raw: Optional[str], default: datetime) -> datetime:
+    if not raw:
+        return default
+    value = parse_datetime(raw)
+    if value is None:
+        raise ValueError(f"Invalid datetime: {raw}")
+    return timezone.make_aware(value, dt_timezone.utc) if timezone.is_naive(value) else value
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace('+00:00', 'Z')
+
+
+def aggregate(bucket: str, group: Sequence[str], start: datetime, end: datetime) -> Dict[str, object]:
+    """Bucketed rows for [start, end); raises ValueError for unsupported requests."""
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket}; use one of {', '.join(BUCKETS)}")
+    if end <= start:
+        raise ValueError("`to` must be after `from`")
+    seconds = BUCKETS[bucket]
+    requested = end - start
+    first = int((start - EPOCH).total_seconds() // seconds)
+    last = -int(-(end - EPOCH).total_seconds() // seconds)  # ceil
+    max_points = getattr(settings, 'AGGREGATE_MAX_POINTS', 2000)
+    if last - first > max_points:
+        raise ValueError(f"Range spans {last - first} buckets; the limit is {max_points}, use a larger bucket")
+    start, end = EPOCH + timedelta(seconds=first * seconds), EPOCH + timedelta(seconds=last * seconds)
+
+    if seconds >= 3600:
+        counts, distinct = _hourly(seconds // 3600, group, start, end)
+    else:
+        max_hours = getattr(settings, 'AGGREGATE_RAW_MAX_HOURS', 24)
+        if requested > timedelta(hours=max_hours):
+            raise ValueError(f"Buckets under 1h are limited to {max_hours} hours; use bucket=1h or larger")
+        counts, distinct = _minutely(seconds // 60, group, start, end)
+
+    results = []
+    for key in sorted(counts):
+        sightings, alerts, speed_sum = counts[key]
+        row = {'t': _iso(EPOCH + timedelta(seconds=key[0] * seconds))}
+        row.update(zip(group, key[1:]))
+        row.update({
+            'sightings': sightings,
+            'alerts': alerts,
+            'avg_speed_kmh': round(speed_sum / sightings, 2) if sightings else None,
+            'distinct_plates': distinct.get(key, 0),
+        })
+        results.append(row)
+    return {
+        'bucket': bucket,
+        'bucket_seconds': seconds,
+        'from': _iso(start),
+        'to': _iso(end),
+        'group': list(group),
+        'results': results,
+    }
+
+
+Counts = Dict[Tuple, List]
+
+
+def _hourly(hours: int, group: Sequence[str], start: datetime, end: datetime) -> Tuple[Counts, Dict[Tuple, int]]:
+    span = {'hour_no__gte': hour_no(start), 'hour_no__lt': hour_no(end)}
+    rows = (
+        StatsHourBucket.objects.filter(**span)
+        .values(b=F('hour_no') / hours, *group)
+        .annotate(s=Sum('sightings'), a=Sum('alerts'), sp=Sum('speed_sum'))
+        .order_by()
+    )
+    counts: Counts = {}
+    for r in rows:
+        if r['s'] or r['a']:
+            counts[(r['b'], *(r[g] for g in group))] = [r['s'] or 0, r['a'] or 0, r['sp'] or 0.0]
+    plates = (
+        PlateHour.objects.filter(**span)
+        .values(b=F('hour_no') / hours, *group)
+        .annotate(d=Count('plate_key', distinct=True))
+        .order_by()
+    )
+    distinct = {(r['b'], *(r[g] for g in group)): r['d'] for r in plates}
+    return counts, distinct
+
+
+def _minutely(minutes: int, group: Sequence[str], start: datetime, end: datetime) -> Tuple[Counts, Dict[Tuple, int]]:
+    rows = (
+        StatsBucket.objects.filter(minute__gte=start, minute__lt=end)
+        .values('minute', *group)
+        .annotate(s=Sum('sightings'), a=Sum('alerts'), sp=Sum('speed_sum'))
+        .order_by()
+    )
+    counts: Counts = defaultdict(lambda: [0, 0, 0.0])
+    for r in rows:
+        c = counts[(int((r['minute'] - EPOCH).total_seconds() // 60) // minutes, *(r[g] for g in group))]
+        c[0] += r['s'] or 0
+        c[1] += r['a'] or 0
+        c[2] += r['sp'] or 0.0
+    counts = {k: v for k, v in counts.items() if v[0] or v[1]}
+
+    # Distinct plates do not add up across minutes; read the sightings in range once
+    columns = ['timestamp', 'plate_key']
+    if 'province' in group:
+        columns.append('plate_number')
+    if 'status' in group:
+        columns.append('vehicle__status')
+    seen = defaultdict(set)
+    for r in Sighting.objects.filter(timestamp__gte=start, timestamp__lt=end).values(*columns).iterator(chunk_size=5000):
+        dims = {}
+        if 'province' in group:
+            dims['province'] = province_of(r['plate_number'])
+        if 'status' in group:
+            dims['status'] = r['vehicle__status'] or ''
+        b = int((r['timestamp'] - EPOCH).total_seconds() // 60) // minutes
+        seen[(b, *(dims[g] for g in group))].add(r['plate_key'])
+    return counts, {k: len(v) for k, v in seen.items()}
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from core.models import AlertJob, Sighting
+from core.services.alerting import raise_alert
+from core.services.nepali_plates import plate_key
+from core.services.suppression import suppressor
+
+logger = logging.getLogger(__name__)
+
+
+def queue_enabled() -> bool:
+    return getattr(settings, 'ALERT_PIPELINE', 'queue') == 'queue'
+
+
+class _PendingGauge:
+    """Per-process estimate of queue depth, refreshed at most once a second.
+
+    Keeps the backpressure check off the DB for most enqueues.
+    """
+
+    def __init__(self, refresh_seconds: float = 1.0):
+        self.refresh_seconds = refresh_seconds
+        self._value = 0
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int, limit: int) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._expires:
+                self._value = AlertJob.objects.filter(state=AlertJob.STATE_PENDING).count()
+                self._expires = now + self.refresh_seconds
+            if self._value + n > limit:
+                return False
+            self._value += n
+            return True
+
+
+_pending = _PendingGauge()
+
+
+def _has_capacity(n: int) -> bool:
+    limit = getattr(settings, 'ALERT_QUEUE_MAX_PENDING', 10000)
+    if _pending.reserve(n, limit):
+        return True
+    logger.warning("Alert queue full (limit=%s); processing %s job(s) inline", limit, n)
+    return False
+
+
+def _job_for(sighting: Sighting, plate: str, vehicle_id: Optional[int], status: str) -> AlertJob:
+    return AlertJob(
+        sighting_id=sighting.pk,
+        vehicle_id=vehicle_id,
+        plate_number=plate,
+        vehicle_status=status,
+        latitude=sighting.latitude,
+        longitude=sighting.longitude,
+        speed_kmh=sighting.speed_kmh,
+        heading_deg=sighting.heading_deg,
+    )
+
+
+def enqueue(sighting: Sighting, plate: str, vehicle_id: Optional[int], status: str) -> bool:
+    """Queue alert evaluation for a sighting.
+
+    Returns False when the queue is disabled or over its pending limit; the
+    caller must then raise the alert inline. Doing the work in the producer
+    when the queue is full is the backpressure mechanism.
+    """
+    if not queue_enabled() or not _has_capacity(1):
+        return False
+    _job_for(sighting, plate, vehicle_id, status).save()
+    return True
+
+
+def enqueue_many(entries: List[tuple]) -> bool:
+    """Queue (sighting, plate, vehicle_id, status) entries with one bulk insert; see enqueue()."""
+    if not entries:
+        return True
+    if not queue_enabled() or not _has_capacity(len(entries)):
+        return False
+    AlertJob.objects.bulk_create([_job_for(*entry) for entry in entries])
+    return True
+
+
+def claim_batch(limit: int, worker_id: Optional[str] = None) -> List[AlertJob]:
+    """Atomically move up to `limit` pending jobs to running for this worker."""
+    token = worker_id or uuid.uuid4().hex
+    with transaction.atomic():
+        ids = list(
+            AlertJob.objects.filter(state=AlertJob.STATE_PENDING).order_by('id').values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        # state=pending in the filter keeps two workers from claiming the same row
+        AlertJob.objects.filter(id__in=ids, state=AlertJob.STATE_PENDING).update(
+            state=AlertJob.STATE_RUNNING,
+            claimed_by=token,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+    return list(AlertJob.objects.filter(id__in=ids, state=AlertJob.STATE_RUNNING, claimed_by=token).order_by('id'))
+
+
+def process_job(job: AlertJob) -> bool:
+    """Raise (or coalesce) the alert for a claimed job, then remove it from the queue."""
+    try:
+        # Held until commit, so a concurrent job for the same plate sees this alert as open
+        with suppressor.lock_for(plate_key(job.plate_number), job.vehicle_status), transaction.atomic():
+            raise_alert(
+                job.plate_number,
+                job.vehicle_id,
+                job.vehicle_status,
+                job.latitude,
+                job.longitude,
+                job.heading_deg,
+                job.speed_kmh,
+                # Stamp with enqueue time so alert timestamps do not drift with queue lag
+                now=job.enqueued_at,
+            )
+            AlertJob.objects.filter(pk=job.pk).delete()
+        return True
+    except Exception as e:
+        max_attempts = getattr(settings, 'ALERT_QUEUE_MAX_ATTEMPTS', 5)
+        state = AlertJob.STATE_FAILED if job.attempts >= max_attempts else AlertJob.STATE_PENDING
+        AlertJob.objects.filter(pk=job.pk).update(state=state, claimed_by='', last_error=str(e)[:256])
+        logger.exception("Alert job %s failed (attempt %s)", job.pk, job.attempts)
+        return False
+
+
+def requeue_stale(lease_seconds: Optional[float] = None) -> int:
+    """Return jobs whose worker died mid-run to the pending state."""
+    lease = lease_seconds if lease_seconds is not None else getattr(settings, 'ALERT_QUEUE_LEASE_SECONDS', 60)
+    cutoff = timezone.now() - timezone.timedelta(seconds=lease)
+    return AlertJob.objects.filter(state=AlertJob.STATE_RUNNING, started_at__lt=cutoff).update(
+        state=AlertJob.STATE_PENDING, claimed_by='',
+    )
+
+
+def queue_stats() -> Dict[str, Any]:
+    """Queue depth per state and lag (age of the oldest pending job)."""
+    pending = AlertJob.objects.filter(state=AlertJob.STATE_PENDING)
+    oldest = pending.aggregate(oldest=Min('enqueued_at'))['oldest']
+    return {
+        'pipeline': getattr(settings, 'ALERT_PIPELINE', 'queue'),
+        'pending': pending.count(),
+        'running': AlertJob.objects.filter(state=AlertJob.STATE_RUNNING).count(),
+        'failed': AlertJob.objects.filter(state=AlertJob.STATE_FAILED).count(),
+        'max_pending': getattr(settings, 'ALERT_QUEUE_MAX_PENDING', 10000),
+        'lag_seconds': round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Vehicle, Alert, PredictedRoute
+from core.services import change_seq, stats_buckets
+from core.services.live_feed import publish_alerts
+from core.services.nepali_plates import display_plate, plate_key
+from core.services.prediction import predict_route
+from core.services.suppression import suppressor
+
+
+# Vehicle statuses that raise an alert when sighted
+ALERT_STATUSES = (Vehicle.STATUS_SUSPICIOUS, Vehicle.STATUS_STOLEN)
+
+
+def build_alert(plate: str, vehicle_id: Optional[int], status: str, lat: float, lon: float,
+                heading_deg: float, speed_kmh: float, now=None) -> Tuple[PredictedRoute, Alert]:
+    """Build (unsaved) PredictedRoute and Alert rows for a hotlist sighting.
+
+    Most callers want raise_alert()/raise_alerts(), which also apply the
+    per-plate suppression window.
+    """
+    now = now or timezone.now()
+    route_path = predict_route(lat, lon, heading_deg, speed_kmh, steps=10, step_seconds=30)
+    predicted = route_path[0] if route_path else {"lat": lat, "lon": lon}
+
+    key, display = plate_key(plate), display_plate(plate)
+    route = PredictedRoute(
+        plate_number=plate,
+        plate_key=key,
+        plate_display=display,
+        path=route_path,
+        generated_at=now,
+    )
+    alert = Alert(
+        plate_number=plate,
+        plate_key=key,
+        plate_display=display,
+        vehicle_id=vehicle_id,
+        status=status,
+        timestamp=now,
+        predicted_latitude=predicted.get("lat"),
+        predicted_longitude=predicted.get("lon"),
+        message=f"Match on {status.upper()} vehicle {plate}",
+        last_hit_at=now,
+    )
+    return route, alert
+
+
+def _coalesce(open_ids: Tuple[int, Optional[int]], hits: int, lat: float, lon: float,
+              heading_deg: float, speed_kmh: float, now) -> bool:
+    """Fold repeat sightings into an open alert; False if it is gone or acknowledged."""
+    alert_id, route_id = open_ids
+    route_path = predict_route(lat, lon, heading_deg, speed_kmh, steps=10, step_seconds=30)
+    predicted = route_path[0] if route_path else {"lat": lat, "lon": lon}
+    updated = Alert.objects.filter(pk=alert_id, acknowledged=False).update(
+        predicted_latitude=predicted.get("lat"),
+        predicted_longitude=predicted.get("lon"),
+        hit_count=F('hit_count') + hits,
+        last_hit_at=now,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        change_seq.bump()
+    if updated and route_id:
+        PredictedRoute.objects.filter(pk=route_id).update(path=route_path, generated_at=now)
+    return bool(updated)
+
+
+def raise_alert(plate: str, vehicle_id: Optional[int], status: str, lat: float, lon: float,
+                heading_deg: float, speed_kmh: float, now=None) -> int:
+    """Create an alert for a hotlist sighting, or fold it into the open one.
+
+    Returns the id of the alert the sighting was attributed to.
+    """
+    now = now or timezone.now()
+    key = plate_key(plate)
+    with suppressor.lock_for(key, status):
+        open_ids = suppressor.get(key, status)
+        if open_ids and _coalesce(open_ids, 1, lat, lon, heading_deg, speed_kmh, now):
+            return open_ids[0]
+        route, alert = build_alert(plate, vehicle_id, status, lat, lon, heading_deg, speed_kmh, now=now)
+        route.save()
+        alert.save()
+        suppressor.remember(key, status, alert.pk, route.pk)
+        return alert.pk
+
+
+def raise_alerts(entries: List[tuple], now=None) -> Dict[int, int]:
+    """Batch form of raise_alert for the bulk ingest path.
+
+    `entries` are (index, plate, vehicle_id, status, lat, lon, heading_deg,
+    speed_kmh) tuples. Sightings of the same plate/status in one batch share
+    a single alert positioned at the last of them. Returns index -> alert id.
+    """
+    now = now or timezone.now()
+    groups: 'OrderedDict[Tuple[str, str], List[tuple]]' = OrderedDict()
+    for entry in entries:
+        groups.setdefault((plate_key(entry[1]), entry[3]), []).append(entry)
+
+    out: Dict[int, int] = {}
+    # Held from the suppression check through remember(), like raise_alert
+    with suppressor.locks_for(groups):
+        new_groups = []
+        for (key, status), group in groups.items():
+            last = group[-1]
+            open_ids = suppressor.get(key, status)
+            if open_ids and _coalesce(open_ids, len(group), *last[4:8], now):
+                for entry in group:
+                    out[entry[0]] = open_ids[0]
+            else:
+                new_groups.append((key, status, group))
+
+        if new_groups:
+            routes, alerts = [], []
+            for key, status, group in new_groups:
+                _, plate, vehicle_id, _, lat, lon, heading_deg, speed_kmh = group[-1]
+                route, alert = build_alert(plate, vehicle_id, status, lat, lon, heading_deg, speed_kmh, now=now)
+                alert.hit_count = len(group)
+                routes.append(route)
+                alerts.append(alert)
+            PredictedRoute.objects.bulk_create(routes)
+            Alert.objects.bulk_create(alerts)
+            stats_buckets.record_alerts(alerts)
+            change_seq.bump()
+            publish_alerts(alerts)
+            for (key, status, group), route, alert in zip(new_groups, routes, alerts):
+                suppressor.remember(key, status, alert.pk, route.pk)
+                for entry in group:
+                    out[entry[0]] = alert.pk
+    return out
@@ -0,0 +1,54 @@
+"""Global change sequence for conditional GETs on the dataset and stats endpoints.
+
+Every write to Vehicle, Sighting or Alert bumps a single-row counter
+(ChangeSequence) inside the writer's transaction, so the new sequence and
+the new rows commit together. Model saves and deletes bump it from
+signals; saves run in one transaction through models.AtomicSaveMixin and
+deletes through Django's collector. Bulk paths (ingest, alert batches,
+last_seen flush, retention) bump it explicitly inside their atomic block.
+Reading it is one primary-key lookup on a one-row table, so `etag_for`
+can answer If-None-Match with 304 before the view touches the main tables.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import F
+
+from core.models import ChangeSequence
+
+SEQ_PK = 1
+
+# Query params that select a view of the data, not the data itself
+_IGNORED_PARAMS = {'since'}
+
+
+def bump() -> None:
+    """Advance the sequence; call inside the transaction of the write it covers."""
+    if not ChangeSequence.objects.filter(pk=SEQ_PK).update(value=F('value') + 1):
+        obj, created = ChangeSequence.objects.get_or_create(pk=SEQ_PK, defaults={'value': 1})
+        if not created:
+            ChangeSequence.objects.filter(pk=SEQ_PK).update(value=F('value') + 1)
+
+
+def current() -> int:
+    return ChangeSequence.objects.filter(pk=SEQ_PK).values_list('value', flat=True).first() or 0
+
+
+def etag_for(request, *args, **kwargs) -> str:
+    """Strong ETag for a windowed read: change sequence, time bucket, query and format.
+
+    The endpoints report windows relative to now (last 5 minutes, 24 hours),
+    so the tag also rolls over every CONDITIONAL_GET_BUCKET_SECONDS. `since`
+    is left out: if nothing was written since the client's copy, a delta
+    against it is empty and 304 is the right answer either way. The
+    negotiated media type is hashed in, so JSON and MessagePack bodies never
+    share a tag; views using this also send Vary: Accept.
+    """
+    bucket = int(time.time() // max(1, getattr(settings, 'CONDITIONAL_GET_BUCKET_SECONDS', 15)))
+    params = sorted((k, v) for k, v in request.GET.items() if k not in _IGNORED_PARAMS)
+    # DRF has negotiated the renderer by the time the handler runs; plain Django requests fall back to Accept
+    media_type = getattr(request, 'accepted_media_type', None) or request.META.get('HTTP_ACCEPT', '')
+    query = hashlib.sha1(f"{request.path}?{urlencode(params)}|{media_type}".encode('utf-8')).hexdigest()[:10]
+    return f"{current()}-{bucket}-{query}"
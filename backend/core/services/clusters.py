@@ -0,0 +1,89 @@
+"""Zoom-level clustering of recent sightings: GET /api/sightings/clusters/.
+
+Up to CLUSTER_MAX_ZOOM the sightings of the last `minutes` are grouped
+into grid cells sized for the zoom. Each cell is CLUSTER_CELL_PIXELS of a
+256px web-map tile wide, about 360 / 2^zoom / (256 / CLUSTER_CELL_PIXELS)
+degrees. Each cell reports its centroid, count and worst vehicle status.
+
+The grouping is a single GROUP BY over integer cell coordinates computed
+in SQL, so SQLite aggregates the window in one pass and Python only sees
+one row per cell. The result for the whole map is cached per (zoom,
+minutes, CLUSTER_CACHE_SECONDS time bucket) in the default cache and
+shared by every viewport. Requests only cut their bbox out of it.
+
+Beyond CLUSTER_MAX_ZOOM the endpoint returns the individual sightings in
+the bbox instead (services.spatial index, newest first).
+"""
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Case, Count, ExpressionWrapper, F, FloatField, IntegerField, Max, Value, When
+from django.db.models.functions import Cast
+
+from core.models import Sighting, Vehicle
+from core.services.spatial import BBox
+
+# Worst status wins; unknown vehicles count as normal
+STATUS_RANK = [Vehicle.STATUS_NORMAL, Vehicle.STATUS_SUSPICIOUS, Vehicle.STATUS_STOLEN]
+
+
+def max_zoom() -> int:
+    return int(getattr(settings, 'CLUSTER_MAX_ZOOM', 12))
+
+
+def cell_degrees(zoom: int) -> float:
+    cells_per_tile = 256 / max(1, int(getattr(settings, 'CLUSTER_CELL_PIXELS', 64)))
+    return 360.0 / (2 ** zoom) / cells_per_tile
+
+
+def _cell_index(field: str, offset: float, size: float):
+    # Offset keeps the value positive, so CAST truncation is floor
+    return Cast(ExpressionWrapper((F(field) + offset) / size, output_field=FloatField()), IntegerField())
+
+
+def compute(zoom: int, since) -> List[Dict[str, object]]:
+    """Clusters for every sighting at or after `since`, across the whole map."""
+    size = cell_degrees(zoom)
+    rank = Case(
+        *[When(vehicle__status=status, then=Value(i)) for i, status in enumerate(STATUS_RANK) if i],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    rows = (
+        Sighting.objects.filter(timestamp__gte=since)
+        .values(row=_cell_index('latitude', 90.0, size), col=_cell_index('longitude', 180.0, size))
+        .annotate(n=Count('id'), lat=Avg('latitude'), lon=Avg('longitude'), worst=Max(rank))
+        .order_by()
+    )
+    return [
+        {
+            'lat': round(r['lat'], 6),
+            'lon': round(r['lon'], 6),
+            'count': r['n'],
+            'status': STATUS_RANK[r['worst'] or 0],
+        }
+        for r in rows
+    ]
+
+
+def clusters(zoom: int, minutes: int, box: Optional[BBox] = None) -> List[Dict[str, object]]:
+    """Cached whole-map clusters for (zoom, minutes, time bucket), cut to `box`."""
+    ttl = max(1, int(getattr(settings, 'CLUSTER_CACHE_SECONDS', 10)))
+    bucket = int(time.time() // ttl)
+    key = f'sighting-clusters:{zoom}:{minutes}:{bucket}'
+    result = cache.get(key)
+    if result is None:
+        # The window starts from the bucket, so every process computes the same clusters
+        since = datetime.fromtimestamp(bucket * ttl, tz=dt_timezone.utc) - timedelta(minutes=minutes)
+        result = compute(zoom, since)
+        cache.set(key, result, ttl * 2)
+    if box is None:
+        return result
+    south, west, north, east = box
+    if west <= east:
+        return [c for c in result if south <= c['lat'] <= north and west <= c['lon'] <= east]
+    return [c for c in result if south <= c['lat'] <= north and (c['lon'] >= west or c['lon'] <= east)]
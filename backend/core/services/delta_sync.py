@@ -0,0 +1,78 @@
+"""Cursors and tombstones for `GET /api/dataset/?since=<cursor>`.
+
+A cursor records when the previous response was built and the highest
+sighting id that existed then. A delta response carries vehicles and alerts
+whose `updated_at` is at or after the cursor time (less a small overlap for
+writes that committed late), sightings with a higher id, the ids of
+vehicles/alerts deleted since (Tombstone), and a new cursor. Rows may be
+sent twice around the overlap; clients upsert by id.
+
+Sightings are append-only. Old ones leave through retention, far outside
+any dashboard window, so they get no tombstones; clients age them out by
+the `minutesSightings` window as before.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import Sighting, Tombstone
+
+
+def overlap() -> timedelta:
+    return timedelta(seconds=getattr(settings, 'DATASET_DELTA_OVERLAP_SECONDS', 2))
+
+
+def tombstone_horizon(now: Optional[datetime] = None) -> datetime:
+    """Oldest cursor time a delta can still be served for; older cursors get a full snapshot."""
+    now = now or timezone.now()
+    return now - timedelta(days=getattr(settings, 'DATASET_TOMBSTONE_DAYS', 7))
+
+
+def make_cursor(now: datetime, max_sighting_id: int) -> str:
+    raw = json.dumps({'t': now.isoformat(), 's': int(max_sighting_id)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def parse_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from make_cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw.decode('ascii'))
+        at = parse_datetime(payload['t'])
+        sighting_id = int(payload['s'])
+    except Exception as e:
+        raise ValueError(f'Invalid since cursor: {e}')
+    if at is None or timezone.is_naive(at):
+        raise ValueError('Invalid since cursor: bad timestamp')
+    return at, sighting_id
+
+
+def current_position() -> Tuple[datetime, int]:
+    """(now, highest sighting id) to put in the cursor of the response being built."""
+    now = timezone.now()
+    max_id = Sighting.objects.aggregate(m=Max('id'))['m'] or 0
+    return now, max_id
+
+
+def tombstones_since(at: datetime) -> Dict[str, List[int]]:
+    out: Dict[str, List[int]] = {table: [] for table, _ in Tombstone.TABLE_CHOICES}
+    rows = Tombstone.objects.filter(deleted_at__gte=at - overlap()).values_list('table', 'object_id')
+    for table, object_id in rows:
+        out.setdefault(table, []).append(object_id)
+    return out
+
+
+def record_deletion(table: str, object_id: Optional[int]) -> None:
+    if object_id is not None:
+        Tombstone.objects.create(table=table, object_id=object_id)
+
+
+def prune_tombstones(now: Optional[datetime] = None) -> int:
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_horizon(now)).delete()
+    return deleted
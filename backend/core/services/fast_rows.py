@@ -0,0 +1,272 @@
+"""values()-based read path for the list, recent and dataset endpoints.
+
+Rows are fetched with values() (one LEFT JOIN for a sighting's vehicle
+instead of a query per row) and turned into dicts by a row encoder compiled
+once per shape. The output matches VehicleSerializer, SightingSerializer and
+AlertSerializer key for key and renders to the same JSON bytes:
+- DateTimeFields as ISO 8601 in the current timezone, with 'Z' for UTC
+- floats through float()
+- FKs as the related id
+- plate_number from the stored plate_display, converted on read only for
+  rows not yet backfilled
+
+`benchmark_serializers` checks the byte equality and compares throughput.
+Keep the field lists here in step with serializers.py.
+
+`?layout=columnar` uses the same field lists. It reads values_list()
+tuples and returns one array per field,
+{"layout": "columnar", "count": n, "columns": {field: [...]}}. Strings
+that repeat across rows (DICTIONARY_FIELDS) are dictionary-encoded as
+{"dictionary": [distinct values], "codes": [index per row]}. A sighting's
+nested vehicle is flattened to `vehicle` (its id) and `vehicle_status`.
+
+`?include=vehicles` side-loads vehicles instead of nesting them: sightings
+and alerts carry only the `vehicle` id, and every referenced vehicle is
+encoded once under `included.vehicles`. In the rows layout that is a map
+keyed by id; in the columnar layout it is a vehicle table.
+
+`fields[vehicles]=plate_number,status` (also `fields[sightings]`,
+`fields[alerts]`) is a sparse fieldset. RowEncoder.project() builds an
+encoder that fetches and outputs only those columns, plus `id`, cached per
+fieldset. Vehicle fieldsets also apply to nested and side-loaded vehicles.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.utils import timezone
+
+from core.models import Vehicle
+from core.services.nepali_plates import display_plate
+
+# (output key, values() column, converter name or None); 'plate' also reads plate_display
+FieldSpec = Tuple[str, str, Optional[str]]
+
+# Columnar output keys sent as {"dictionary": [...], "codes": [...]}
+DICTIONARY_FIELDS = frozenset({'plate_number', 'status', 'vehicle_status', 'color', 'vehicle_type'})
+
+VEHICLE_FIELDS: List[FieldSpec] = [
+    ('id', 'id', None),
+    ('plate_number', 'plate_number', 'plate'),
+    ('status', 'status', None),
+    ('owner', 'owner', None),
+    ('last_seen', 'last_seen', 'datetime'),
+    ('notes', 'notes', None),
+    ('created_at', 'created_at', 'datetime'),
+    ('updated_at', 'updated_at', 'datetime'),
+]
+
+SIGHTING_FIELDS: List[FieldSpec] = [
+    ('id', 'id', None),
+    ('plate_number', 'plate_number', 'plate'),
+    ('vehicle', 'vehicle_id', 'vehicle'),  # nested VehicleSerializer, from vehicle__* columns
+    ('vehicle_type', 'vehicle_type', None),
+    ('color', 'color', None),
+    ('latitude', 'latitude', 'float'),
+    ('longitude', 'longitude', 'float'),
+    ('speed_kmh', 'speed_kmh', 'float'),
+    ('heading_deg', 'heading_deg', 'float'),
+    ('timestamp', 'timestamp', 'datetime'),
+]
+
+# Sightings with the vehicle as its id, for ?include=vehicles
+SIGHTING_REF_FIELDS: List[FieldSpec] = [
+    (key, column, None if conv == 'vehicle' else conv) for key, column, conv in SIGHTING_FIELDS
+]
+
+ALERT_FIELDS: List[FieldSpec] = [
+    ('id', 'id', None),
+    ('plate_number', 'plate_number', 'plate'),
+    ('vehicle', 'vehicle_id', None),
+    ('status', 'status', None),
+    ('timestamp', 'timestamp', 'datetime'),
+    ('predicted_latitude', 'predicted_latitude', 'float'),
+    ('predicted_longitude', 'predicted_longitude', 'float'),
+    ('message', 'message', None),
+    ('acknowledged', 'acknowledged', None),
+    ('dispatched', 'dispatched', None),
+    ('hit_count', 'hit_count', None),
+    ('last_hit_at', 'last_hit_at', 'datetime'),
+    ('created_at', 'created_at', 'datetime'),
+]
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def _datetime(value, tz):
+    # DRF DateTimeField.to_representation with the ISO 8601 format
+    if not value:
+        return None
+    value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    out = value.isoformat()
+    if out.endswith('+00:00'):
+        out = out[:-6] + 'Z'
+    return out
+
+
+_CONVERTERS: Dict[str, Callable[..., Any]] = {
+    'plate': display_plate,
+    'float': _float,
+    'datetime': _datetime,
+}
+
+
+def _dictionary(values: Iterable[Any]) -> Dict[str, List[Any]]:
+    index: Dict[Any, int] = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    return {'dictionary': list(index), 'codes': codes}
+
+
+def _columns(fields: Sequence[FieldSpec]) -> List[str]:
+    columns = [column for _, column, _ in fields]
+    if any(conv == 'plate' for _, _, conv in fields):
+        columns.append('plate_display')
+    return columns
+
+
+def _dict_source(fields: Sequence[FieldSpec], prefix: str, nested: Dict[str, str]) -> str:
+    parts = []
+    for key, column, conv in fields:
+        ref = f"r[{prefix + column!r}]"
+        if conv == 'vehicle':
+            expr = f"(None if {ref} is None else {nested['vehicle']})"
+        elif conv == 'plate':
+            expr = f"(r[{prefix + 'plate_display'!r}] or _plate({ref}))"
+        elif conv == 'datetime':
+            expr = f"_datetime({ref}, tz)"
+        elif conv:
+            expr = f"_{conv}({ref})"
+        else:
+            expr = ref
+        parts.append(f"{key!r}: {expr}")
+    return '{' + ', '.join(parts) + '}'
+
+
+class RowEncoder:
+    """values() columns plus a compiled dict builder for one serializer shape."""
+
+    def __init__(self, fields: Sequence[FieldSpec], nested_vehicle: bool = False,
+                 vehicle_fields: Sequence[FieldSpec] = VEHICLE_FIELDS, extra_columns: Sequence[str] = ()):
+        self.fields: List[FieldSpec] = list(fields)
+        self.nested_vehicle = nested_vehicle
+        self.vehicle_fields: List[FieldSpec] = list(vehicle_fields)
+        self.columns: List[str] = _columns(fields)
+        nested = {}
+        if nested_vehicle:
+            nested['vehicle'] = _dict_source(vehicle_fields, 'vehicle__', {})
+            self.columns += [f'vehicle__{column}' for column in _columns(vehicle_fields)]
+        src = f"def encode(r, tz):\n    return {_dict_source(fields, '', nested)}\n"
+        namespace = {f'_{name}': fn for name, fn in _CONVERTERS.items()}
+        exec(compile(src, f'<fast_rows:{fields[0][0]}>', 'exec'), namespace)
+        self.encode_row: Callable[[Dict[str, Any], Any], Dict[str, Any]] = namespace['encode']
+
+        self.columnar_fields: List[FieldSpec] = [
+            (key, column, None if conv == 'vehicle' else conv) for key, column, conv in fields
+        ]
+        if nested_vehicle:
+            self.columnar_fields.append(('vehicle_status', 'vehicle__status', None))
+        self.columnar_columns: List[str] = _columns(self.columnar_fields)
+        # Fetched but not output, e.g. the ordering keyset pagination reads
+        for column in extra_columns:
+            if column not in self.columns:
+                self.columns.append(column)
+            if column not in self.columnar_columns:
+                self.columnar_columns.append(column)
+
+    def project(self, keys: Optional[Sequence[str]] = None, vehicle_keys: Optional[Sequence[str]] = None,
+                extra_columns: Sequence[str] = ()) -> 'RowEncoder':
+        """Encoder for a sparse fieldset: only `keys` (and `vehicle_keys` of a nested vehicle).
+
+        `id` is always kept. None keeps every field. Raises ValueError for unknown keys.
+        """
+        return _projected(self, _fieldset(self.fields, keys), _fieldset(self.vehicle_fields, vehicle_keys),
+                          tuple(extra_columns))
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def encode(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # The current timezone is a context-local lookup; resolve it once per call
+        encode_row, tz = self.encode_row, timezone.get_current_timezone()
+        return [encode_row(r, tz) for r in rows]
+
+    def serialize(self, queryset) -> List[Dict[str, Any]]:
+        """Fetch and encode a queryset (ordering/slicing already applied)."""
+        return self.encode(self.values(queryset))
+
+    def values_list(self, queryset, named: bool = False):
+        """Tuples for `columnar`; named=True for keyset pagination, which reads the ordering by name."""
+        return queryset.values_list(*self.columnar_columns, named=named)
+
+    def columnar(self, rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+        """One array per field from `values_list` rows."""
+        rows = list(rows)
+        data = dict(zip(self.columnar_columns, zip(*rows))) if rows else dict.fromkeys(self.columnar_columns, ())
+        tz = timezone.get_current_timezone()
+        columns: Dict[str, Any] = {}
+        for key, column, conv in self.columnar_fields:
+            values = data[column]
+            if conv == 'plate':
+                values = [stored or display_plate(plate) for stored, plate in zip(data['plate_display'], values)]
+            elif conv == 'datetime':
+                values = [_datetime(v, tz) for v in values]
+            elif conv == 'float':
+                values = [None if v is None else float(v) for v in values]
+            columns[key] = _dictionary(values) if key in DICTIONARY_FIELDS else list(values)
+        return {'layout': 'columnar', 'count': len(rows), 'columns': columns}
+
+    def serialize_columnar(self, queryset) -> Dict[str, Any]:
+        return self.columnar(self.values_list(queryset))
+
+
+def _fieldset(fields: Sequence[FieldSpec], keys: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    if keys is None:
+        return None
+    known = [key for key, _, _ in fields]
+    unknown = [key for key in keys if key not in known]
+    if unknown:
+        raise ValueError(f"Unknown field {', '.join(unknown)}; use {', '.join(known)}")
+    return tuple(key for key in known if key == 'id' or key in keys)
+
+
+@lru_cache(maxsize=256)
+def _projected(base: 'RowEncoder', keys: Optional[Tuple[str, ...]], vehicle_keys: Optional[Tuple[str, ...]],
+               extra_columns: Tuple[str, ...]) -> 'RowEncoder':
+    if keys is None and vehicle_keys is None and not extra_columns:
+        return base
+    fields = [f for f in base.fields if keys is None or f[0] in keys]
+    vehicle_fields = [f for f in base.vehicle_fields if vehicle_keys is None or f[0] in vehicle_keys]
+    # Without the vehicle key there is nothing to nest, and no join
+    nested = base.nested_vehicle and any(conv == 'vehicle' for _, _, conv in fields)
+    return RowEncoder(fields, nested, vehicle_fields, extra_columns)
+
+
+vehicle_rows = RowEncoder(VEHICLE_FIELDS)
+sighting_rows = RowEncoder(SIGHTING_FIELDS, nested_vehicle=True)
+sighting_ref_rows = RowEncoder(SIGHTING_REF_FIELDS)
+alert_rows = RowEncoder(ALERT_FIELDS)
+
+
+def referenced_vehicle_ids(*encoded: Any) -> Set[int]:
+    """Vehicle ids referenced by encoded sighting/alert rows or columnar tables."""
+    ids: Set[int] = set()
+    for data in encoded:
+        ids.update(data['columns'].get('vehicle', ()) if isinstance(data, dict) else (r.get('vehicle') for r in data))
+    ids.discard(None)
+    return ids
+
+
+def side_load_vehicles(ids: Iterable[int], columnar: bool = False, encoder: Optional['RowEncoder'] = None,
+                       chunk_size: int = 500) -> Any:
+    """The vehicles in `ids`, once each: {id: vehicle} or a columnar table."""
+    encoder = encoder or vehicle_rows
+    ids = sorted(ids)
+    rows: List[Any] = []
+    # Chunked to stay under SQLite's bound-parameter limit
+    for i in range(0, len(ids), chunk_size):
+        qs = Vehicle.objects.filter(id__in=ids[i:i + chunk_size]).order_by('id')
+        rows += encoder.values_list(qs) if columnar else encoder.serialize(qs)
+    if columnar:
+        return encoder.columnar(rows)
+    return {str(v['id']): v for v in rows}
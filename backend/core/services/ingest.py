@@ -0,0 +1,100 @@
+from typing import Any, Dict, List
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Sighting
+from core.services import alert_queue, change_seq, stats_buckets
+from core.services.alerting import ALERT_STATUSES, raise_alerts
+from core.services.live_feed import publish_sightings
+from core.services.nepali_plates import display_plate, normalize_plate, plate_key
+from core.services.plate_cache import plate_cache
+from core.services.spatial import grid_cell
+from core.services.write_behind import last_seen_buffer
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _ingest_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    plates = [normalize_plate(it['plate_number']) for it in items]
+
+    # One cache pass (and at most one query) for every distinct plate in the batch
+    statuses = plate_cache.lookup_many(plates)
+
+    now = timezone.now()
+    sightings = []
+    latest: Dict[int, Any] = {}
+    for it, plate in zip(items, plates):
+        hit = statuses.get(plate)
+        ts = it.get('timestamp') or now
+        sightings.append(Sighting(
+            plate_number=plate,
+            plate_key=plate_key(plate),
+            plate_display=display_plate(plate),
+            vehicle_id=hit[0] if hit else None,
+            vehicle_type=it.get('vehicle_type', ''),
+            color=it.get('color', ''),
+            latitude=it['latitude'],
+            longitude=it['longitude'],
+            speed_kmh=it.get('speed_kmh', 0),
+            heading_deg=it.get('heading_deg', 0),
+            timestamp=ts,
+            cell=grid_cell(it['latitude'], it['longitude']),
+        ))
+        if hit and (hit[0] not in latest or latest[hit[0]] < ts):
+            latest[hit[0]] = ts
+
+    # bulk_create skips post_save, so alert evaluation happens here instead of in signals
+    Sighting.objects.bulk_create(sightings)
+    stats_buckets.record_sightings(
+        (s, statuses[s.plate_number][1] if statuses.get(s.plate_number) else None) for s in sightings
+    )
+    change_seq.bump()
+    publish_sightings(sightings)
+    last_seen_buffer.record_many(latest)
+
+    hot = []
+    for i, s in enumerate(sightings):
+        hit = statuses.get(s.plate_number)
+        if hit and hit[1] in ALERT_STATUSES:
+            hot.append((i, s, hit))
+
+    # Queue alert evaluation for run_alert_worker; raise alerts in-batch when the queue is off or full
+    queued = alert_queue.enqueue_many([(s, s.plate_number, hit[0], hit[1]) for _, s, hit in hot])
+    alert_index: Dict[int, int] = {}
+    if hot and not queued:
+        alert_index = raise_alerts([
+            (i, s.plate_number, hit[0], hit[1], s.latitude, s.longitude, s.heading_deg, s.speed_kmh)
+            for i, s, hit in hot
+        ], now=now)
+    queued_index = {i for i, _, _ in hot} if queued else set()
+
+    results = []
+    for i, s in enumerate(sightings):
+        hit = statuses.get(s.plate_number)
+        results.append({
+            'id': s.pk,
+            'plate_number': s.plate_number,
+            'vehicle_id': s.vehicle_id,
+            'vehicle_status': hit[1] if hit else None,
+            'alert_id': alert_index.get(i),
+            'alert_queued': i in queued_index,
+        })
+    return results
+
+
+def ingest_sightings(items: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Persist many validated sightings using set-based queries.
+
+    Each batch resolves vehicles with one query, inserts sightings, advances
+    last_seen and queues (or raises) alerts with bulk writes inside a single
+    transaction.
+    Returns one result dict per input item, in input order.
+    """
+    results: List[Dict[str, Any]] = []
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(items), batch_size):
+        with transaction.atomic():
+            results.extend(_ingest_batch(items[start:start + batch_size]))
+    return results
@@ -0,0 +1,116 @@
+"""Server-side filters and sort keys for the vehicle, sighting and alert lists.
+
+Query params (all optional):
+- status: comma-separated; vehicle status for vehicles and sightings
+  (the sighted vehicle's), alert status for alerts
+- province: comma-separated province numbers, Arabic or Devanagari digits;
+  matches provincial plates (`प्रदेश ३-...`)
+- search: plate prefix, in any spelling variant plate_key folds together;
+  for vehicles also an owner name prefix (case-insensitive)
+- from, to (ISO datetimes) or minutes: timestamp window of sightings/alerts
+- sort: a key from SORTS, `-key` for descending
+
+Every filter is a range on an indexed column. Province and plate search
+are prefix ranges on plate_key, and owner search is a range on the
+LOWER(owner) index. Substring matches would need a full scan. Sort keys
+map to orderings an index can walk, which is what keeps keyset pages cheap.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from core.models import Vehicle
+from core.services.aggregates import parse_time
+from core.services.live_feed import normalize_province
+from core.services.nepali_plates import plate_key
+
+# Upper bound of a prefix range: above any real continuation of the prefix
+_PREFIX_END = '\U0010ffff'
+
+# sort key -> ordering columns (the paginator appends id)
+SORTS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'vehicles': {
+        'plate_number': ('plate_number',),
+        'status': ('status', 'plate_number'),
+        'owner': ('owner',),
+        'last_seen': ('last_seen',),  # never-seen vehicles sort as the oldest (pagination)
+    },
+    'sightings': {
+        'timestamp': ('timestamp',),
+        'plate_number': ('plate_key', 'timestamp'),
+    },
+    'alerts': {
+        'timestamp': ('timestamp',),
+        'plate_number': ('plate_key', 'timestamp'),
+    },
+}
+
+_STATUSES = {
+    'vehicles': [s for s, _ in Vehicle.STATUS_CHOICES],
+    'sightings': [s for s, _ in Vehicle.STATUS_CHOICES],
+    'alerts': [s for s, _ in Vehicle.STATUS_CHOICES],
+}
+_STATUS_FIELD = {'vehicles': 'status', 'sightings': 'vehicle__status', 'alerts': 'status'}
+
+
+def _split(raw: str) -> List[str]:
+    return [v.strip() for v in (raw or '').split(',') if v.strip()]
+
+
+def _prefix(field: str, prefix: str) -> Q:
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + _PREFIX_END})
+
+
+def ordering(resource: str, raw: str, default: Sequence[str]) -> List[str]:
+    """The view ordering for ?sort=; raises ValueError for unknown keys."""
+    if not raw:
+        return list(default)
+    key = raw[1:] if raw.startswith('-') else raw
+    sorts = SORTS[resource]
+    if key not in sorts:
+        raise ValueError(f"Unknown sort {raw}; use {', '.join(sorts)} (prefix - for descending)")
+    sign = '-' if raw.startswith('-') else ''
+    return [sign + column for column in sorts[key]]
+
+
+def filter_list(resource: str, qs, params):
+    """Apply status/province/search/time filters; raises ValueError on bad input."""
+    statuses = _split(params.get('status'))
+    if statuses:
+        unknown = [s for s in statuses if s not in _STATUSES[resource]]
+        if unknown:
+            raise ValueError(f"Unknown status {', '.join(unknown)}; use {', '.join(_STATUSES[resource])}")
+        qs = qs.filter(**{f'{_STATUS_FIELD[resource]}__in': statuses})
+
+    provinces = _split(params.get('province'))
+    if provinces:
+        q = Q()
+        for p in provinces:
+            province = normalize_province(p)
+            if not province.isdigit():
+                raise ValueError(f"Invalid province {p}")
+            q |= _prefix('plate_key', f'प्रदेश {province}-')
+        qs = qs.filter(q)
+
+    search = (params.get('search') or '').strip()
+    if search:
+        q = _prefix('plate_key', plate_key(search))
+        if resource == 'vehicles':
+            qs = qs.alias(owner_lower=Lower('owner'))
+            q |= _prefix('owner_lower', search.lower())
+        qs = qs.filter(q)
+
+    if resource in ('sightings', 'alerts'):
+        if params.get('minutes'):
+            try:
+                minutes = int(params['minutes'])
+            except ValueError:
+                raise ValueError('minutes must be an integer')
+            qs = qs.filter(timestamp__gte=timezone.now() - timezone.timedelta(minutes=minutes))
+        if params.get('from'):
+            qs = qs.filter(timestamp__gte=parse_time(params['from'], None))
+        if params.get('to'):
+            qs = qs.filter(timestamp__lt=parse_time(params['to'], None))
+    return qs
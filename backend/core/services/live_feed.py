@@ -0,0 +1,338 @@
+"""In-process pub/sub behind the Server-Sent Events feed (GET /api/stream/).
+
+Sighting and alert writes publish one pre-serialized event each to
+`live_feed`, an EventBus holding the last STREAM_REPLAY_EVENTS events in a
+ring buffer. Every connected client reads from that buffer, so one write
+fans out to all of them without a query per client. Event ids are
+``<process epoch>-<seq>``; a client resuming with a Last-Event-ID that is
+still in the buffer gets exactly the events it missed, otherwise it is told
+to reset (reload its snapshot).
+
+Publishers:
+- post_save of Sighting/Alert (signals.py), after the transaction commits
+- bulk ingest and batched alert creation (publish_sightings/publish_alerts)
+- ForeignWriteTail, for rows written by other processes (runsimulator,
+  run_alert_worker) and alert updates done with update(). It runs one
+  query per interval for the whole process, and only while clients are
+  connected and the change sequence has moved.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+
+from core.models import Alert, Sighting, Vehicle
+from core.services import change_seq
+from core.services.nepali_plates import extract_province_from_plate
+
+logger = logging.getLogger(__name__)
+
+EVENT_SIGHTING = 'sighting'
+EVENT_ALERT = 'alert'
+
+_ARABIC_TO_DEV = str.maketrans('0123456789', '०१२३४५६७८९')
+
+
+def normalize_province(value: str) -> str:
+    """Province filter values may use Arabic or Devanagari digits."""
+    return (value or '').strip().translate(_ARABIC_TO_DEV)
+
+
+class Event:
+    __slots__ = ('seq', 'id', 'type', 'province', 'status', 'payload')
+
+    def __init__(self, seq: int, event_id: str, type_: str, province: Optional[str], status: Optional[str], data: Dict[str, Any]):
+        self.seq = seq
+        self.id = event_id
+        self.type = type_
+        self.province = province
+        self.status = status
+        # Encoded once, shared by every client
+        self.payload = json.dumps(data, ensure_ascii=False, default=str)
+
+    def encode(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.payload}\n\n"
+
+
+class EventFilter:
+    """Per-client filter over event type, plate province and vehicle/alert status."""
+
+    def __init__(self, types: Optional[Set[str]] = None, provinces: Optional[Set[str]] = None,
+                 statuses: Optional[Set[str]] = None):
+        self.types = types or None
+        self.provinces = provinces or None
+        self.statuses = statuses or None
+
+    @classmethod
+    def from_params(cls, params) -> 'EventFilter':
+        def split(name):
+            return {v.strip() for v in (params.get(name) or '').split(',') if v.strip()}
+        return cls(
+            types=split('types'),
+            provinces={normalize_province(p) for p in split('province')},
+            statuses=split('status'),
+        )
+
+    def matches(self, event: Event) -> bool:
+        if self.types and event.type not in self.types:
+            return False
+        if self.provinces and event.province not in self.provinces:
+            return False
+        if self.statuses and event.status not in self.statuses:
+            return False
+        return True
+
+
+class EventBus:
+    """Bounded, thread-safe event log with blocking (threads) and async (ASGI) waits."""
+
+    def __init__(self, max_events: int = 2000):
+        self.epoch = format(int(time.time()), 'x')
+        self._events: deque = deque(maxlen=max(1, int(max_events)))
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._cond = threading.Condition()
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self.subscribers = 0
+
+    def subscribe(self) -> None:
+        with self._cond:
+            self.subscribers += 1
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self.subscribers = max(0, self.subscribers - 1)
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def publish(self, type_: str, data: Dict[str, Any], province: Optional[str] = None,
+                status: Optional[str] = None) -> Event:
+        with self._cond:
+            seq = next(self._seq)
+            event = Event(seq, f"{self.epoch}-{seq}", type_, province, status, data)
+            self._events.append(event)
+            self._last_seq = seq
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, flag in waiters:
+            try:
+                loop.call_soon_threadsafe(flag.set)
+            except RuntimeError:
+                # Loop already closed; the waiter is gone
+                self._async_waiters.discard((loop, flag))
+        return event
+
+    def resume_seq(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence to continue after for a Last-Event-ID, or None if the client must reset."""
+        if not last_event_id:
+            return self._last_seq
+        epoch, _, seq = last_event_id.partition('-')
+        try:
+            seq = int(seq)
+        except ValueError:
+            return None
+        if epoch != self.epoch or seq > self._last_seq:
+            return None
+        with self._cond:
+            oldest = self._events[0].seq if self._events else self._last_seq + 1
+        # Events between seq and the oldest retained one were dropped
+        return seq if seq + 1 >= oldest else None
+
+    def since(self, seq: int) -> List[Event]:
+        with self._cond:
+            if not self._events or self._events[-1].seq <= seq:
+                return []
+            return [e for e in self._events if e.seq > seq]
+
+    def wait(self, seq: int, timeout: float) -> List[Event]:
+        with self._cond:
+            if self._last_seq <= seq:
+                self._cond.wait(timeout)
+        return self.since(seq)
+
+    async def wait_async(self, seq: int, timeout: float) -> List[Event]:
+        if self._last_seq <= seq:
+            flag = asyncio.Event()
+            waiter = (asyncio.get_running_loop(), flag)
+            self._async_waiters.add(waiter)
+            try:
+                if self._last_seq <= seq:
+                    await asyncio.wait_for(flag.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._async_waiters.discard(waiter)
+        return self.since(seq)
+
+
+live_feed = EventBus(max_events=getattr(settings, 'STREAM_REPLAY_EVENTS', 2000))
+
+
+# Ids already published from this process, so the tail does not repeat them
+_recent: 'OrderedDict[Tuple[str, int, str], None]' = OrderedDict()
+_recent_lock = threading.Lock()
+_RECENT_MAX = 10000
+
+
+def _mark(key: Tuple[str, int, str]) -> bool:
+    """Record a published key; False if it was already published."""
+    with _recent_lock:
+        if key in _recent:
+            return False
+        _recent[key] = None
+        if len(_recent) > _RECENT_MAX:
+            _recent.popitem(last=False)
+        return True
+
+
+def _alert_version(alert: Alert) -> str:
+    return alert.updated_at.isoformat() if alert.updated_at else ''
+
+
+def _publish_sighting(sighting: Sighting) -> None:
+    from core.serializers import SightingSerializer
+    if not _mark((EVENT_SIGHTING, sighting.pk, '')):
+        return
+    vehicle = sighting.vehicle if sighting.vehicle_id else None
+    live_feed.publish(
+        EVENT_SIGHTING,
+        SightingSerializer(sighting).data,
+        province=extract_province_from_plate(sighting.plate_number),
+        status=vehicle.status if vehicle else None,
+    )
+
+
+def _publish_alert(alert: Alert) -> None:
+    from core.serializers import AlertSerializer
+    if not _mark((EVENT_ALERT, alert.pk, _alert_version(alert))):
+        return
+    live_feed.publish(
+        EVENT_ALERT,
+        AlertSerializer(alert).data,
+        province=extract_province_from_plate(alert.plate_number),
+        status=alert.status,
+    )
+
+
+def _attach_vehicles(sightings: Iterable[Sighting]) -> None:
+    """Fill the vehicle FK cache with one query so serializing does not query per row."""
+    sightings = [s for s in sightings if s.vehicle_id and not Sighting.vehicle.is_cached(s)]
+    if not sightings:
+        return
+    vehicles = Vehicle.objects.in_bulk({s.vehicle_id for s in sightings})
+    for s in sightings:
+        if s.vehicle_id in vehicles:
+            s.vehicle = vehicles[s.vehicle_id]
+
+
+def publish_sightings(sightings: List[Sighting]) -> None:
+    """Publish sightings once the current transaction commits."""
+    if not sightings or not live_feed.subscribers:
+        return
+
+    def _send():
+        try:
+            _attach_vehicles(sightings)
+            for s in sightings:
+                _publish_sighting(s)
+        except Exception:
+            logger.exception("live_feed: failed to publish %s sightings", len(sightings))
+    transaction.on_commit(_send)
+
+
+def publish_alerts(alerts: List[Alert]) -> None:
+    """Publish alerts once the current transaction commits."""
+    if not alerts or not live_feed.subscribers:
+        return
+
+    def _send():
+        try:
+            for a in alerts:
+                _publish_alert(a)
+        except Exception:
+            logger.exception("live_feed: failed to publish %s alerts", len(alerts))
+    transaction.on_commit(_send)
+
+
+class ForeignWriteTail:
+    """Publishes rows this process did not publish itself.
+
+    Covers sightings/alerts written by other processes and alert updates done
+    with update() (suppression coalescing). One background thread per process,
+    running only while clients are subscribed; each round reads the change
+    sequence and only queries the tables when it moved.
+    """
+
+    def __init__(self, interval: float = 1.0, batch_size: int = 500):
+        self.interval = max(0.1, float(interval))
+        self.batch_size = max(1, int(batch_size))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._seq = None
+        self._sighting_id = None
+        self._alert_updated = None
+
+    def ensure_running(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='live-feed-tail', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while live_feed.subscribers > 0:
+                try:
+                    self.poll()
+                except Exception:
+                    logger.exception("live_feed: tail poll failed")
+                finally:
+                    close_old_connections()
+                time.sleep(self.interval)
+        finally:
+            with self._lock:
+                self._thread = None
+                self._seq = None
+
+    def poll(self) -> None:
+        seq = change_seq.current()
+        if self._seq is None:
+            # Start from "now": clients load their snapshot over the REST API
+            self._seq = seq
+            self._sighting_id = Sighting.objects.aggregate(m=Max('id'))['m'] or 0
+            self._alert_updated = Alert.objects.aggregate(m=Max('updated_at'))['m']
+            return
+        if seq == self._seq:
+            return
+        self._seq = seq
+
+        sightings = list(Sighting.objects.filter(id__gt=self._sighting_id).order_by('id')[:self.batch_size])
+        if sightings:
+            self._sighting_id = sightings[-1].id
+            _attach_vehicles(sightings)
+            for s in sightings:
+                _publish_sighting(s)
+
+        alerts_qs = Alert.objects.order_by('updated_at', 'id')
+        if self._alert_updated is not None:
+            alerts_qs = alerts_qs.filter(updated_at__gt=self._alert_updated)
+        alerts = list(alerts_qs[:self.batch_size])
+        if alerts:
+            self._alert_updated = alerts[-1].updated_at
+            for a in alerts:
+                _publish_alert(a)
+
+
+foreign_tail = ForeignWriteTail(
+    interval=getattr(settings, 'STREAM_TAIL_INTERVAL_SECONDS', 1.0),
+)
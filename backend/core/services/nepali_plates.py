@@ -1,5 +1,6 @@
 import re
 import random
+from functools import lru_cache
 from typing import Optional, Set
 
 # Devanagari digits map (0-9)
@@ -41,6 +42,12 @@ def convert_plate_to_nepali(plate: str) -> str:
         return plate or ''
 
 
+@lru_cache(maxsize=65536)
+def display_plate(plate: str) -> str:
+    """Devanagari display form stored in `plate_display` and returned by the API."""
+    return convert_plate_to_nepali(plate)
+
+
 # Provincial plate pattern (modern format), e.g.
 # "प्रदेश ३-०१-१२ च १२३४"
 REGEX_PROVINCIAL = re.compile(r"^प्रदेश\s[०-९]{1,2}[-–][०-९]{2}[-–][०-९]{2}\s[क-ह]\s[०-९]{4}$")
@@ -63,6 +70,18 @@ def normalize_plate(plate: str) -> str:
     return p.replace('—', '-').replace('–', '-')
 
 
+def plate_key(plate: str) -> str:
+    """Canonical form of a plate used for indexed equality lookups.
+
+    Normalizes dashes, converts ASCII digits to Devanagari, collapses
+    whitespace (and drops it around dashes) and upper-cases Latin letters,
+    so spelling variants of the same plate share one key.
+    """
+    p = to_devanagari_digits_in_string(normalize_plate(plate))
+    p = re.sub(r"\s*-\s*", "-", p)
+    return ' '.join(p.split()).upper()
+
+
 def is_valid_nepali_plate(plate: str) -> bool:
     p = normalize_plate(plate)
     return bool(REGEX_PROVINCIAL.match(p) or REGEX_LEGACY.match(p))
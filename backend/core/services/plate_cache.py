@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+from core.models import Vehicle
+from core.services.nepali_plates import plate_key
+
+
+# (vehicle id, status) for a known plate, or None when no vehicle has that plate
+PlateStatus = Optional[Tuple[int, str]]
+
+
+class PlateStatusCache:
+    """Bounded, per-process LRU cache of plate key -> (vehicle id, status).
+
+    Unknown plates are cached too (as None) since most sightings are of
+    vehicles we have no record for or that are normal. Entries are dropped
+    by the Vehicle post_save/post_delete signals, again once the write
+    commits, so a lookup racing the write cannot keep the old status; the
+    TTL bounds staleness for changes made by other processes.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30.0):
+        self.max_size = max(1, int(max_size))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: 'OrderedDict[str, Tuple[PlateStatus, float]]' = OrderedDict()
+        self._keys_by_vehicle: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[0]
+
+    def _put(self, key: str, value: PlateStatus) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        if value is not None:
+            self._keys_by_vehicle[value[0]] = key
+        while len(self._entries) > self.max_size:
+            _, (old, _) = self._entries.popitem(last=False)
+            if old is not None:
+                self._keys_by_vehicle.pop(old[0], None)
+
+    def lookup(self, plate: str) -> PlateStatus:
+        key = plate_key(plate)
+        with self._lock:
+            found, value = self._get(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = Vehicle.objects.filter(plate_key=key).values_list('id', 'status').first()
+        with self._lock:
+            self._put(key, value)
+        return value
+
+    def lookup_many(self, plates: Iterable[str]) -> Dict[str, PlateStatus]:
+        """Resolve many plates, querying the DB once for all cache misses."""
+        out: Dict[str, PlateStatus] = {}
+        missing = {}
+        with self._lock:
+            for plate in set(plates):
+                key = plate_key(plate)
+                found, value = self._get(key)
+                if found:
+                    self.hits += 1
+                    out[plate] = value
+                else:
+                    self.misses += 1
+                    missing[plate] = key
+        if missing:
+            rows = Vehicle.objects.filter(plate_key__in=set(missing.values())).values_list('id', 'plate_key', 'status')
+            by_key = {key: (vid, status) for vid, key, status in rows}
+            with self._lock:
+                for plate, key in missing.items():
+                    value = by_key.get(key)
+                    self._put(key, value)
+                    out[plate] = value
+        return out
+
+    def invalidate(self, plate: str = '', vehicle_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries.pop(plate_key(plate), None)
+            if vehicle_id is not None:
+                # Also drop the entry under the vehicle's previous plate, if renamed
+                old_key = self._keys_by_vehicle.pop(vehicle_id, None)
+                if old_key is not None:
+                    self._entries.pop(old_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_vehicle.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+plate_cache = PlateStatusCache(
+    max_size=getattr(settings, 'PLATE_CACHE_MAX_SIZE', 10000),
+    ttl_seconds=getattr(settings, 'PLATE_CACHE_TTL_SECONDS', 30),
+)
@@ -0,0 +1,258 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from core.models import AlertJob, Sighting, Vehicle
+
+
+# Hot paths whose SQL must be served by indexes. Each entry is
+# (name, callable running the path, tables it may scan in full and why,
+# optional setup whose result is passed to the callable and whose own
+# queries are not checked).
+# Endpoints run through the test client so the SQL checked is exactly what
+# the view executes; a change to a view's query is picked up automatically.
+HotQuery = Tuple[str, Callable[..., None], Dict[str, str], Optional[Callable[[], object]]]
+
+HOT_QUERIES: List[HotQuery] = []
+
+
+def hot_query(name: str, allow_scan: Optional[Dict[str, str]] = None,
+              setup: Optional[Callable[[], object]] = None):
+    """Register a hot path for check_query_plans."""
+    def decorator(fn: Callable[..., None]):
+        HOT_QUERIES.append((name, fn, allow_scan or {}, setup))
+        return fn
+    return decorator
+
+
+@hot_query('sightings.recent')
+def _sightings_recent(client: Client):
+    client.get('/api/sightings/recent/?minutes=10')
+
+
+@hot_query('alerts.recent')
+def _alerts_recent(client: Client):
+    client.get('/api/alerts/recent/?minutes=60')
+
+
+@hot_query('stats')
+def _stats(client: Client):
+    client.get('/api/stats/')
+
+
+@hot_query('aggregates.minutely')
+def _aggregates_minutely(client: Client):
+    client.get('/api/aggregates/?bucket=5m&group=province,status')
+
+
+@hot_query('aggregates.hourly')
+def _aggregates_hourly(client: Client):
+    from django.utils import timezone
+    start = timezone.now() - timezone.timedelta(days=30)
+    client.get('/api/aggregates/', {'bucket': '1d', 'group': 'province,status', 'from': start.isoformat()})
+
+
+@hot_query('dataset', allow_scan={'core_vehicle': 'DatasetView returns the whole vehicle registry by design'})
+def _dataset(client: Client):
+    client.get('/api/dataset/')
+
+
+def _delta_cursor() -> str:
+    from core.services.delta_sync import current_position, make_cursor
+    return make_cursor(*current_position())
+
+
+@hot_query('dataset.referenced', setup=_delta_cursor)
+def _dataset_referenced(client: Client, cursor: str):
+    client.get('/api/dataset/', {'vehicles': 'referenced', 'fields[vehicles]': 'plate_number,status'})
+    client.get('/api/dataset/', {'vehicles': 'referenced', 'since': cursor})
+
+
+@hot_query('dataset.delta', setup=_delta_cursor)
+def _dataset_delta(client: Client, cursor: str):
+    client.get('/api/dataset/', {'since': cursor})
+
+
+def _two_pages(client: Client, path: str) -> None:
+    """First page plus the keyset page its `next` link points to."""
+    resp = client.get(f"{path}{'&' if '?' in path else '?'}page_size=5")
+    nxt = resp.json().get('next') if resp.status_code == 200 else None
+    if nxt:
+        client.get(nxt)
+
+
+@hot_query('vehicles.list')
+def _vehicles_list(client: Client):
+    _two_pages(client, '/api/vehicles/')
+
+
+@hot_query('vehicles.by_status')
+def _vehicles_by_status(client: Client):
+    _two_pages(client, '/api/vehicles/filter_by_status/?status=stolen')
+
+
+@hot_query('vehicles.filtered')
+def _vehicles_filtered(client: Client):
+    _two_pages(client, '/api/vehicles/?search=ram')
+    _two_pages(client, '/api/vehicles/?search=' + quote('बा १'))
+    _two_pages(client, '/api/vehicles/?province=3&sort=-plate_number')
+    _two_pages(client, '/api/vehicles/?status=stolen,suspicious&sort=status')
+    _two_pages(client, '/api/vehicles/?sort=owner')
+    _two_pages(client, '/api/vehicles/?sort=-last_seen')
+
+
+@hot_query('sightings.filtered')
+def _sightings_filtered(client: Client):
+    _two_pages(client, '/api/sightings/?minutes=60&status=stolen')
+    _two_pages(client, '/api/sightings/?search=' + quote('बा १२') + '&sort=plate_number')
+    _two_pages(client, '/api/sightings/?province=3&minutes=60')
+
+
+@hot_query('alerts.filtered')
+def _alerts_filtered(client: Client):
+    _two_pages(client, '/api/alerts/?minutes=120&status=stolen')
+    _two_pages(client, '/api/alerts/?search=' + quote('बा १२') + '&sort=-plate_number')
+
+
+@hot_query('sightings.list')
+def _sightings_list(client: Client):
+    _two_pages(client, '/api/sightings/')
+
+
+@hot_query('sightings.bbox')
+def _sightings_bbox(client: Client):
+    _two_pages(client, '/api/sightings/?bbox=85.25,27.65,85.40,27.75')
+    client.get('/api/sightings/recent/?minutes=60&bbox=80.0,26.3,88.2,30.5')
+
+
+@hot_query('sightings.near')
+def _sightings_near(client: Client):
+    client.get('/api/sightings/recent/?minutes=60&near=27.7172,85.3240,2000')
+
+
+@hot_query('sightings.clusters')
+def _sightings_clusters(client: Client):
+    from django.core.cache import cache
+    cache.clear()  # a cached result would skip the grouping query
+    client.get('/api/sightings/clusters/?zoom=8&minutes=60&bbox=80.0,26.3,88.2,30.5')
+    client.get('/api/sightings/clusters/?zoom=16&minutes=60&bbox=85.30,27.70,85.34,27.72')
+
+
+@hot_query('sightings.include_vehicles')
+def _sightings_include_vehicles(client: Client):
+    _two_pages(client, '/api/sightings/?include=vehicles')
+
+
+@hot_query('alerts.list')
+def _alerts_list(client: Client):
+    _two_pages(client, '/api/alerts/')
+
+
+@hot_query('vehicles.predicted', setup=lambda: Vehicle.objects.values_list('id', flat=True).first())
+def _vehicle_predicted(client: Client, vid: Optional[int]):
+    if vid is not None:
+        client.get(f'/api/vehicles/{vid}/predicted/')
+
+
+@hot_query('plate_cache.lookup')
+def _plate_lookup(client: Client):
+    from core.services.plate_cache import PlateStatusCache
+    cache = PlateStatusCache(max_size=16)
+    cache.lookup('बा १२ प १२३४')
+    cache.lookup_many(['बा १२ प १२३४', 'प्रदेश ३-०१-१२ च १२३४'])
+
+
+@hot_query('plate.history')
+def _plate_history(client: Client):
+    list(Sighting.objects.filter(plate_key='बा १२ प १२३४').order_by('-timestamp')[:50])
+
+
+@hot_query('verification.lookups')
+def _verification(client: Client):
+    from core.models import PoliceVehicleRegistration
+    from core.services.verification import _recent_stolen_reports
+    reg = PoliceVehicleRegistration.objects.filter(plate_key='बा १२ प १२३४').first()
+    _recent_stolen_reports(reg, 'बा १२ प १२३४')
+
+
+@hot_query('alert_queue')
+def _alert_queue(client: Client):
+    from core.services.alert_queue import queue_stats
+    list(AlertJob.objects.filter(state=AlertJob.STATE_PENDING).order_by('id').values_list('id', flat=True)[:50])
+    queue_stats()
+
+
+_SCAN_RE = re.compile(r'^SCAN (\w+)( USING (?:COVERING )?INDEX)?')
+_LIMIT_RE = re.compile(r'\bLIMIT \d+\s*$', re.IGNORECASE)
+
+
+def explain(sql: str) -> List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(plan: List[str], tables: set, limited: bool = False) -> List[str]:
+    """Tables read in full by a plan.
+
+    SCAN <table> counts, with or without an index, except that an index walk
+    under a LIMIT (``limited``) is a bounded ordered read, e.g. the first
+    page of a list. Keyset pages after it must SEARCH: an index walk there
+    reads every row before the cursor.
+    """
+    out = []
+    for detail in plan:
+        m = _SCAN_RE.match(detail)
+        if m and m.group(1) in tables and not (limited and m.group(2)):
+            out.append(m.group(1))
+    return out
+
+
+class _PageClient(Client):
+    """Test client noting where each request's queries start and whether it asked for a keyset page."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.marks: List[Tuple[int, bool]] = []
+
+    def request(self, **request):
+        self.marks.append((len(connection.queries_log), 'cursor=' in request.get('QUERY_STRING', '')))
+        return super().request(**request)
+
+    def cursor_page(self, query_no: int) -> bool:
+        """Whether the query_no-th entry of connection.queries_log came from a cursor request."""
+        paged = False
+        for start, cursor in self.marks:
+            if start > query_no:
+                break
+            paged = cursor
+        return paged
+
+
+def check_hot_queries() -> List[dict]:
+    """Run every hot path and EXPLAIN each SELECT it issued.
+
+    Returns one report per statement with its plan and any disallowed full
+    table scans. Only meaningful on SQLite.
+    """
+    tables = set(connection.introspection.table_names())
+    client = _PageClient(HTTP_HOST='localhost')
+    reports = []
+    for name, fn, allow_scan, setup in HOT_QUERIES:
+        args = (setup(),) if setup else ()
+        client.marks = []
+        with CaptureQueriesContext(connection) as ctx:
+            fn(client, *args)
+        for i, q in enumerate(ctx.captured_queries):
+            sql = q['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            plan = explain(sql)
+            limited = bool(_LIMIT_RE.search(sql)) and not client.cursor_page(ctx.initial_queries + i)
+            scans = [t for t in full_scans(plan, tables, limited) if t not in allow_scan]
+            reports.append({'name': name, 'sql': sql, 'plan': plan, 'full_scans': scans})
+    return reports
@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+from datetime import datetime, time as dtime, timedelta, timezone as dt_timezone
+from typing import Callable, Dict, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Alert, ArchivedDay, ExpiredAlert, Sighting, Tombstone
+from core.services import change_seq
+from core.services.delta_sync import tombstone_horizon
+
+
+# table label -> (model, timestamp field, exported fields)
+ARCHIVE_TABLES = {
+    ArchivedDay.TABLE_SIGHTINGS: (Sighting, 'timestamp', [
+        'id', 'plate_number', 'vehicle_id', 'vehicle_type', 'color', 'latitude', 'longitude',
+        'speed_kmh', 'heading_deg', 'timestamp',
+    ]),
+    ArchivedDay.TABLE_ALERTS: (Alert, 'timestamp', [
+        'id', 'plate_number', 'vehicle_id', 'status', 'timestamp', 'predicted_latitude',
+        'predicted_longitude', 'message', 'acknowledged', 'dispatched', 'hit_count',
+        'last_hit_at', 'created_at',
+    ]),
+}
+
+
+def retention_cutoff(days: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the UTC day `days` days ago; rows strictly before it are archived."""
+    now = now or timezone.now()
+    day = (now - timedelta(days=max(0, int(days)))).astimezone(dt_timezone.utc).date()
+    return datetime.combine(day, dtime.min, tzinfo=dt_timezone.utc)
+
+
+def _day_range(day):
+    start = datetime.combine(day, dtime.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _delete_in_batches(qs, batch_size: int) -> int:
+    """Delete archived rows in id batches, with one change sequence bump per batch.
+
+    Archiving is not an edit, so the per-row delete receivers in signals.py
+    do not run. Alerts are deleted through the ExpiredAlert proxy, which has
+    none, and their bookkeeping is done per batch instead:
+    - tombstones are bulk-written only for alerts changed within the
+      DATASET_TOMBSTONE_DAYS horizon; older ones are past any delta cursor
+    - the stats counters are left alone on purpose: archived alerts still
+      happened, and aggregates over their hours keep counting them
+    Sighting has no delete receivers; the collector only nulls AlertJob.sighting.
+    """
+    deleted = 0
+    while True:
+        ids = list(qs.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            if qs.model is Alert:
+                recent = Alert.objects.filter(id__in=ids, updated_at__gte=tombstone_horizon())
+                Tombstone.objects.bulk_create([
+                    Tombstone(table=Tombstone.TABLE_ALERTS, object_id=pk) for pk in recent.values_list('id', flat=True)
+                ])
+                ExpiredAlert.objects.filter(id__in=ids).delete()
+            else:
+                qs.model.objects.filter(id__in=ids).delete()
+            change_seq.bump()
+        deleted += len(ids)
+
+
+def archive_table(table: str, cutoff: datetime, archive_dir: str, batch_size: int = 2000,
+                  dry_run: bool = False, log: Callable[[str], None] = lambda msg: None) -> Dict[str, int]:
+    """Move rows of `table` older than `cutoff` into per-day gzip NDJSON files.
+
+    Each day is exported in id-ordered chunks to ``<archive_dir>/<table>/``,
+    recorded as an ArchivedDay (row count and highest id), then deleted in
+    batches of `batch_size`. Rows already covered by an earlier ArchivedDay
+    (e.g. after an interrupted run) are deleted without being exported again.
+    """
+    model, ts_field, fields = ARCHIVE_TABLES[table]
+    old = model.objects.filter(**{f'{ts_field}__lt': cutoff})
+    days = list(
+        old.annotate(day=TruncDate(ts_field, tzinfo=dt_timezone.utc))
+        .values('day').annotate(n=Count('id')).order_by('day')
+    )
+    totals = {'days': 0, 'archived': 0, 'deleted': 0}
+    out_dir = os.path.join(archive_dir, table)
+    if days and not dry_run:
+        os.makedirs(out_dir, exist_ok=True)
+
+    for entry in days:
+        day = entry['day']
+        start, end = _day_range(day)
+        day_qs = model.objects.filter(**{f'{ts_field}__gte': start, f'{ts_field}__lt': end})
+        done_through = ArchivedDay.objects.filter(table=table, day=day).aggregate(m=Max('max_id'))['m'] or 0
+        if dry_run:
+            log(f"{table} {day}: {entry['n']} rows would be archived")
+            totals['days'] += 1
+            totals['archived'] += day_qs.filter(id__gt=done_through).count()
+            continue
+
+        # Leftovers from an interrupted run are already in an archive file
+        if done_through:
+            totals['deleted'] += _delete_in_batches(day_qs.filter(id__lte=done_through), batch_size)
+
+        path = os.path.join(out_dir, f"{table}-{day.isoformat()}-{int(timezone.now().timestamp())}.ndjson.gz")
+        tmp_path = path + '.part'
+        rows = 0
+        last_id = done_through
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            while True:
+                chunk: List[dict] = list(day_qs.filter(id__gt=last_id).order_by('id').values(*fields)[:batch_size])
+                if not chunk:
+                    break
+                for row in chunk:
+                    f.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+                    f.write('\n')
+                rows += len(chunk)
+                last_id = chunk[-1]['id']
+        if not rows:
+            os.remove(tmp_path)
+            continue
+        os.replace(tmp_path, path)
+        ArchivedDay.objects.create(table=table, day=day, rows=rows, max_id=last_id, path=path)
+        deleted = _delete_in_batches(day_qs.filter(id__lte=last_id), batch_size)
+        log(f"{table} {day}: archived {rows} rows -> {path}, deleted {deleted}")
+        totals['days'] += 1
+        totals['archived'] += rows
+        totals['deleted'] += deleted
+    return totals
+
+
+def archived_counts(table: str, since=None, until=None) -> Dict[str, int]:
+    """Rows archived per day (ISO date -> count), for history queries spanning archived ranges."""
+    qs = ArchivedDay.objects.filter(table=table)
+    if since:
+        qs = qs.filter(day__gte=since)
+    if until:
+        qs = qs.filter(day__lte=until)
+    out: Dict[str, int] = {}
+    for day, rows in qs.order_by('day').values_list('day', 'rows'):
+        out[day.isoformat()] = out.get(day.isoformat(), 0) + rows
+    return out
@@ -0,0 +1,122 @@
+"""Grid-cell spatial index for sightings: ``bbox=`` and ``near=`` filters.
+
+Each sighting stores the id of the SPATIAL_CELL_DEGREES grid cell it falls
+in (`Sighting.cell`, indexed), numbered row-major from (-90, -180):
+
+    cell = floor((lat + 90) / d) * columns + floor((lon + 180) / d)
+
+A bounding box covers a contiguous run of cell ids in each grid row, so
+the filter is one indexed range per row, ORed, plus the exact lat/lon
+test. `near=lat,lon,radius_m` is the bounding box of the circle, plus a
+distance test in plain SQL arithmetic. It uses an equirectangular
+approximation, which is accurate to well under 1% at city scale.
+
+Rows written before the column existed have no cell until
+backfill_sighting_cells runs. Change SPATIAL_CELL_DEGREES only together
+with `backfill_sighting_cells --force`.
+"""
+import math
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from django.db.models.lookups import LessThanOrEqual
+
+METERS_PER_DEGREE = 111320.0
+
+BBox = Tuple[float, float, float, float]  # south, west, north, east
+
+
+def cell_degrees() -> float:
+    return float(getattr(settings, 'SPATIAL_CELL_DEGREES', 0.05))
+
+
+def _columns(d: float) -> int:
+    return int(math.ceil(360.0 / d))
+
+
+def grid_cell(lat: Optional[float], lon: Optional[float]) -> Optional[int]:
+    if lat is None or lon is None:
+        return None
+    d = cell_degrees()
+    row = int(math.floor((min(max(lat, -90.0), 90.0) + 90.0) / d))
+    col = int(math.floor(((lon + 180.0) % 360.0) / d))
+    return row * _columns(d) + col
+
+
+def cell_ranges(box: BBox) -> List[Tuple[int, int]]:
+    """Inclusive cell id ranges covering the box, one per grid row (two if it crosses 180°)."""
+    south, west, north, east = box
+    d = cell_degrees()
+    cols = _columns(d)
+    first_row = int(math.floor((south + 90.0) / d))
+    last_row = int(math.floor((north + 90.0) / d))
+    west_col = int(math.floor(((west + 180.0) % 360.0) / d))
+    east_col = int(math.floor(((east + 180.0) % 360.0) / d))
+    spans = [(west_col, east_col)] if west_col <= east_col else [(west_col, cols - 1), (0, east_col)]
+    return [(row * cols + lo, row * cols + hi) for row in range(first_row, last_row + 1) for lo, hi in spans]
+
+
+def _floats(raw: str, count: int, name: str) -> List[float]:
+    try:
+        values = [float(v) for v in raw.split(',')]
+    except ValueError:
+        values = []
+    if len(values) != count or not all(math.isfinite(v) for v in values):
+        raise ValueError(f"{name} must be {count} comma-separated numbers")
+    return values
+
+
+def parse_bbox(raw: str) -> BBox:
+    """``west,south,east,north`` (Leaflet's toBBoxString order)."""
+    west, south, east, north = _floats(raw, 4, 'bbox')
+    if not (-90 <= south <= north <= 90) or not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError('bbox must be west,south,east,north with south <= north')
+    return south, west, north, east
+
+
+def parse_near(raw: str) -> Tuple[float, float, float]:
+    """``lat,lon,radius_m``."""
+    lat, lon, radius = _floats(raw, 3, 'near')
+    max_radius = float(getattr(settings, 'SPATIAL_MAX_RADIUS_M', 50000))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or not (0 < radius <= max_radius):
+        raise ValueError(f'near must be lat,lon,radius_m with 0 < radius_m <= {max_radius:g}')
+    return lat, lon, radius
+
+
+def bbox_q(box: BBox) -> Q:
+    south, west, north, east = box
+    ranges = cell_ranges(box)
+    q = Q(latitude__gte=south, latitude__lte=north)
+    if west <= east:
+        q &= Q(longitude__gte=west, longitude__lte=east)
+    else:
+        q &= Q(longitude__gte=west) | Q(longitude__lte=east)
+    if len(ranges) <= getattr(settings, 'SPATIAL_MAX_CELL_RANGES', 200):
+        cells = Q()
+        for lo, hi in ranges:
+            cells |= Q(cell=lo) if lo == hi else Q(cell__gte=lo, cell__lte=hi)
+        q &= cells
+    # Boxes spanning more rows than that cover most of the map; the cell index would not help
+    return q
+
+
+def near_q(lat: float, lon: float, radius: float) -> Q:
+    """Within `radius` metres of (lat, lon): its bounding box, then the distance test."""
+    dlat = radius / METERS_PER_DEGREE
+    kx = math.cos(math.radians(lat))
+    dlon = min(180.0, dlat / max(kx, 1e-6))
+    # The circle is not wrapped across 180°; nothing here is near it
+    box = (max(-90.0, lat - dlat), max(-180.0, lon - dlon), min(90.0, lat + dlat), min(180.0, lon + dlon))
+    dy, dx = F('latitude') - lat, (F('longitude') - lon) * kx
+    dist2 = ExpressionWrapper(dy * dy + dx * dx, output_field=FloatField())
+    return bbox_q(box) & Q(LessThanOrEqual(dist2, dlat * dlat))
+
+
+def filter_sightings(qs, params):
+    """Apply ``bbox`` / ``near`` from query params; raises ValueError on bad input."""
+    if params.get('bbox'):
+        qs = qs.filter(bbox_q(parse_bbox(params['bbox'])))
+    if params.get('near'):
+        qs = qs.filter(near_q(*parse_near(params['near'])))
+    return qs
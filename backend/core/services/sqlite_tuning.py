@@ -0,0 +1,31 @@
+from typing import Dict
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """connection_created receiver: apply settings.SQLITE_PRAGMAS to a new SQLite connection.
+
+    Django 4.2 has no init_command for SQLite, so the pragmas are issued here
+    once per connection; with CONN_MAX_AGE that is once per worker thread.
+    """
+    pragmas: Dict[str, object] = getattr(settings, 'SQLITE_PRAGMAS', None) or {}
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def current_pragmas(connection) -> Dict[str, object]:
+    """Values in effect on `connection` for the pragmas this module manages."""
+    names = list(getattr(settings, 'SQLITE_PRAGMAS', None) or {}) or [
+        'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'busy_timeout', 'temp_store',
+    ]
+    out = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            out[name] = row[0] if row else None
+    return out
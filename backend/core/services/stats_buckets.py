@@ -0,0 +1,209 @@
+"""Pre-rolled sighting/alert counters behind GET /api/stats/ and /api/aggregates/.
+
+Every sighting and alert write adds to counters keyed by (time, plate
+province, status):
+- StatsBucket per minute, kept STATS_BUCKET_DAYS
+- StatsHourBucket per hour, and PlateHour (plates seen per hour) for
+  distinct-plate counts, both kept AGGREGATE_HOURLY_DAYS
+
+Bulk ingest and batched alerts call record_sightings/record_alerts inside
+their batch transaction. Single saves go through signals.py, whose
+post_save receivers run inside the save's transaction (models.AtomicSaveMixin),
+so a sighting POST commits its row, counters and change sequence bump at
+once. signals.py also takes deleted alerts back out, inside the delete's
+transaction. The record functions open a transaction of their own when
+called outside one, so the counters never commit half-applied.
+
+StatsView sums the buckets of the window instead of counting the sighting
+and alert tables, so its cost follows the number of minutes in the window,
+not the number of rows. Windows start at the top of the minute they fall
+in, so a 24-hour count may include up to one extra minute of rows.
+
+Sightings keep the vehicle status they had when seen. Deleted sightings
+are not taken out (retention removes them long after their buckets are
+pruned). `rebuild_stats_buckets` recomputes a range from the tables, e.g.
+after deploying this to an existing database.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from core.models import Alert, PlateHour, Sighting, StatsBucket, StatsHourBucket
+from core.services.nepali_plates import extract_province_from_plate
+
+BucketKey = Tuple[object, str, str]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def minute_of(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+def hour_no(ts: datetime) -> int:
+    """Hours since the Unix epoch (UTC)."""
+    return int((ts - EPOCH).total_seconds() // 3600)
+
+
+def hour_start(n: int) -> datetime:
+    return EPOCH + timedelta(hours=n)
+
+
+@lru_cache(maxsize=65536)
+def province_of(plate: str) -> str:
+    return extract_province_from_plate(plate) or ''
+
+
+def _apply(model, time_field: str, counts: Dict[BucketKey, list]) -> None:
+    """Add [sightings, alerts, speed_sum] deltas to their buckets, creating missing ones."""
+    for (at, province, status), (sightings, alerts, speed_sum) in counts.items():
+        if not sightings and not alerts:
+            continue
+        key = {time_field: at, 'province': province, 'status': status or ''}
+        delta = {
+            'sightings': F('sightings') + sightings,
+            'alerts': F('alerts') + alerts,
+            'speed_sum': F('speed_sum') + speed_sum,
+        }
+        if model.objects.filter(**key).update(**delta):
+            continue
+        if sightings <= 0 and alerts <= 0:
+            continue  # taking rows out of a bucket that was pruned or never built
+        obj, created = model.objects.get_or_create(
+            **key, defaults={'sightings': sightings, 'alerts': alerts, 'speed_sum': speed_sum},
+        )
+        if not created:
+            model.objects.filter(pk=obj.pk).update(**delta)
+
+
+def _counters():
+    return defaultdict(lambda: [0, 0, 0.0])
+
+
+def record_sightings(rows: Iterable[Tuple[Sighting, Optional[str]]]) -> None:
+    """Count new sightings given as (sighting, vehicle status or None)."""
+    minutes, hours, plates = _counters(), _counters(), set()
+    for s, status in rows:
+        province, status = province_of(s.plate_number), status or ''
+        h = hour_no(s.timestamp)
+        for counts, at in ((minutes, minute_of(s.timestamp)), (hours, h)):
+            c = counts[(at, province, status)]
+            c[0] += 1
+            c[2] += s.speed_kmh or 0
+        plates.add((h, province, status, s.plate_key))
+    # savepoint=False: joins the caller's transaction without extra statements
+    with transaction.atomic(savepoint=False):
+        _apply(StatsBucket, 'minute', minutes)
+        _apply(StatsHourBucket, 'hour_no', hours)
+        if plates:
+            PlateHour.objects.bulk_create(
+                [PlateHour(hour_no=h, province=p, status=st, plate_key=k) for h, p, st, k in plates],
+                ignore_conflicts=True,
+            )
+
+
+def record_alerts(alerts: Iterable[Alert], sign: int = 1) -> None:
+    """Count new alerts; sign=-1 takes deleted ones back out."""
+    minutes, hours = _counters(), _counters()
+    for a in alerts:
+        province = province_of(a.plate_number)
+        minutes[(minute_of(a.timestamp), province, a.status)][1] += sign
+        hours[(hour_no(a.timestamp), province, a.status)][1] += sign
+    with transaction.atomic(savepoint=False):
+        _apply(StatsBucket, 'minute', minutes)
+        _apply(StatsHourBucket, 'hour_no', hours)
+
+
+def window_start(since: datetime) -> datetime:
+    return minute_of(since)
+
+
+def totals(since: datetime) -> Dict[str, int]:
+    agg = StatsBucket.objects.filter(minute__gte=window_start(since)).aggregate(s=Sum('sightings'), a=Sum('alerts'))
+    return {'sightings': agg['s'] or 0, 'alerts': agg['a'] or 0}
+
+
+def by_province(since: datetime) -> Dict[str, Dict[str, object]]:
+    """{province: {"sightings": n, "alerts": n, "status": {status: {"sightings": n, "alerts": n}}}}."""
+    rows = (
+        StatsBucket.objects.filter(minute__gte=window_start(since))
+        .values('province', 'status')
+        .annotate(s=Sum('sightings'), a=Sum('alerts'))
+        .order_by('province', 'status')
+    )
+    out: Dict[str, Dict[str, object]] = {}
+    for row in rows:
+        entry = out.setdefault(row['province'], {'sightings': 0, 'alerts': 0, 'status': {}})
+        entry['sightings'] += row['s'] or 0
+        entry['alerts'] += row['a'] or 0
+        entry['status'][row['status']] = {'sightings': row['s'] or 0, 'alerts': row['a'] or 0}
+    return out
+
+
+def retention_horizon(now: Optional[datetime] = None) -> datetime:
+    now = now or timezone.now()
+    return now - timedelta(days=getattr(settings, 'STATS_BUCKET_DAYS', 7))
+
+
+def hourly_horizon(now: Optional[datetime] = None) -> datetime:
+    now = now or timezone.now()
+    return now - timedelta(days=getattr(settings, 'AGGREGATE_HOURLY_DAYS', 90))
+
+
+def prune(now: Optional[datetime] = None) -> int:
+    deleted, _ = StatsBucket.objects.filter(minute__lt=minute_of(retention_horizon(now))).delete()
+    oldest_hour = hour_no(hourly_horizon(now))
+    hourly, _ = StatsHourBucket.objects.filter(hour_no__lt=oldest_hour).delete()
+    plates, _ = PlateHour.objects.filter(hour_no__lt=oldest_hour).delete()
+    return deleted + hourly + plates
+
+
+def rebuild(start: datetime, end: datetime, batch_size: int = 5000) -> int:
+    """Recompute all counters for the whole hours covering [start, end) from the tables.
+
+    Rebuilt sightings take their vehicle's current status.
+    """
+    first, last = hour_no(start), hour_no(end - timedelta(microseconds=1)) + 1
+    start, end = hour_start(first), hour_start(last)
+    minutes, hours, plates = _counters(), _counters(), set()
+    sightings = (
+        Sighting.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .values_list('timestamp', 'plate_number', 'plate_key', 'vehicle__status', 'speed_kmh')
+    )
+    for ts, plate, key, status, speed in sightings.iterator(chunk_size=batch_size):
+        province, status, h = province_of(plate), status or '', hour_no(ts)
+        for counts, at in ((minutes, minute_of(ts)), (hours, h)):
+            c = counts[(at, province, status)]
+            c[0] += 1
+            c[2] += speed or 0
+        plates.add((h, province, status, key))
+    alerts = Alert.objects.filter(timestamp__gte=start, timestamp__lt=end).values_list('timestamp', 'plate_number', 'status')
+    for ts, plate, status in alerts.iterator(chunk_size=batch_size):
+        province = province_of(plate)
+        minutes[(minute_of(ts), province, status or '')][1] += 1
+        hours[(hour_no(ts), province, status or '')][1] += 1
+
+    def rows(model, time_field, counts) -> List[object]:
+        return [
+            model(**{time_field: at}, province=province, status=status, sightings=s, alerts=a, speed_sum=speed)
+            for (at, province, status), (s, a, speed) in counts.items()
+        ]
+
+    with transaction.atomic():
+        StatsBucket.objects.filter(minute__gte=start, minute__lt=end).delete()
+        StatsHourBucket.objects.filter(hour_no__gte=first, hour_no__lt=last).delete()
+        PlateHour.objects.filter(hour_no__gte=first, hour_no__lt=last).delete()
+        StatsBucket.objects.bulk_create(rows(StatsBucket, 'minute', minutes), batch_size=batch_size)
+        StatsHourBucket.objects.bulk_create(rows(StatsHourBucket, 'hour_no', hours), batch_size=batch_size)
+        PlateHour.objects.bulk_create(
+            [PlateHour(hour_no=h, province=p, status=st, plate_key=k) for h, p, st, k in plates],
+            batch_size=batch_size,
+        )
+    return len(minutes)
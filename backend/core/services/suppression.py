@@ -0,0 +1,83 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+
+class AlertSuppressor:
+    """In-memory record of the open alert per (plate key, status).
+
+    While an entry is inside its window, repeat sightings update that alert
+    instead of creating a new Alert/PredictedRoute pair. The window is fixed
+    from the alert's creation, so a vehicle that stays in view still raises a
+    fresh alert once per window. State is per process; the update itself is
+    guarded in SQL (see alerting.raise_alert) so a stale entry falls back to
+    creating a new alert.
+
+    Check-and-record is not atomic on its own. Callers that may run
+    concurrently for one plate (run_alert_worker threads, inline ingest
+    batches) hold `lock_for(key, status)`, or `locks_for` for a batch, from
+    the check until the alert is recorded.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, window_seconds: float = 300.0, max_entries: int = 10000):
+        self.window_seconds = float(window_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._open: Dict[Tuple[str, str], Tuple[int, Optional[int], float]] = {}
+        self._lock = threading.Lock()
+        # Striped so the lock table stays bounded; reentrant so raise_alert can nest in process_job
+        self._key_locks = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
+
+    def lock_for(self, key: str, status: str) -> threading.RLock:
+        """Lock serializing alert creation for (plate key, status) in this process."""
+        return self._key_locks[hash((key, status)) % len(self._key_locks)]
+
+    @contextmanager
+    def locks_for(self, pairs: Iterable[Tuple[str, str]]):
+        """Hold lock_for() of every (plate key, status), taken in stripe order so batches cannot deadlock."""
+        stripes = sorted({hash(pair) % len(self._key_locks) for pair in pairs})
+        with ExitStack() as stack:
+            for i in stripes:
+                stack.enter_context(self._key_locks[i])
+            yield
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def get(self, key: str, status: str) -> Optional[Tuple[int, Optional[int]]]:
+        """Return (alert id, route id) of the open alert, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._open.get((key, status))
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                del self._open[(key, status)]
+                return None
+            return entry[0], entry[1]
+
+    def remember(self, key: str, status: str, alert_id: int, route_id: Optional[int]) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._open) >= self.max_entries:
+                self._open = {k: v for k, v in self._open.items() if v[2] >= now}
+            self._open[(key, status)] = (alert_id, route_id, now + self.window_seconds)
+
+    def release(self, key: str, status: Optional[str] = None) -> None:
+        with self._lock:
+            for k in [k for k in self._open if k[0] == key and (status is None or k[1] == status)]:
+                del self._open[k]
+
+
+suppressor = AlertSuppressor(
+    window_seconds=getattr(settings, 'ALERT_SUPPRESSION_SECONDS', 300),
+    max_entries=getattr(settings, 'ALERT_SUPPRESSION_MAX_ENTRIES', 10000),
+)
@@ -11,6 +11,7 @@ from core.models import (
     OwnerWatchlist,
     VerificationAttempt,
 )
+from core.services.nepali_plates import plate_key
 
 
 STOLEN_RECENT_DAYS = 30
@@ -34,7 +35,7 @@ def _regional_cross_check(region_code: Optional[str], plate_number: Optional[str
 def _recent_stolen_reports(reg: Optional[PoliceVehicleRegistration], plate_number: str) -> List[StolenVehicleReport]:
     since = timezone.now() - timedelta(days=STOLEN_RECENT_DAYS)
     qs = StolenVehicleReport.objects.filter(
-        plate_number__iexact=plate_number,
+        plate_key=plate_key(plate_number),
         report_timestamp__gte=since,
         status=StolenVehicleReport.STATUS_OPEN,
     ).order_by('-report_timestamp')
@@ -85,7 +86,7 @@ def verify_vehicle(input_payload: Dict[str, Any]) -> Dict[str, Any]:
         return result
 
     # Exact plate match in registration records
-    reg = PoliceVehicleRegistration.objects.filter(plate_number__iexact=plate).first()
+    reg = PoliceVehicleRegistration.objects.filter(plate_key=plate_key(plate)).first()
 
     plate_weight = 0.6
     make_weight = 0.2
@@ -0,0 +1,124 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Q, When, Value
+from django.utils import timezone
+
+from core.models import Vehicle
+from core.services import change_seq
+
+logger = logging.getLogger(__name__)
+
+class LastSeenBuffer:
+    """Write-behind buffer of vehicle id -> newest sighting timestamp.
+
+    Sightings for the same vehicle are coalesced in memory and applied with
+    one UPDATE when the buffer reaches `max_pending` vehicles, every
+    `flush_interval` seconds from a background thread, and at interpreter
+    shutdown. Entries recorded inside a transaction are only buffered once
+    it commits.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_pending: int = 500, enabled: bool = True):
+        self.flush_interval = float(flush_interval)
+        self.max_pending = max(1, int(max_pending))
+        self.enabled = enabled
+        self._pending: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def record(self, vehicle_id: int, timestamp) -> None:
+        self.record_many({vehicle_id: timestamp})
+
+    def record_many(self, entries: Dict[int, Any]) -> None:
+        if not entries:
+            return
+        if not self.enabled:
+            self._write(dict(entries))
+            return
+        transaction.on_commit(lambda: self._add(entries))
+
+    def _merge(self, entries: Dict[int, Any]) -> None:
+        # Caller holds self._lock
+        for vid, ts in entries.items():
+            old = self._pending.get(vid)
+            if old is None or ts > old:
+                self._pending[vid] = ts
+
+    def _add(self, entries: Dict[int, Any]) -> None:
+        with self._lock:
+            self._merge(entries)
+            full = len(self._pending) >= self.max_pending
+        self._ensure_timer()
+        if full:
+            self.flush()
+
+    def _write(self, pending: Dict[int, Any]) -> int:
+        # Single UPDATE for the whole batch, touching only vehicles whose
+        # last_seen moves forward. updated_at moves with it so dataset delta
+        # sync picks the vehicle up.
+        newest = Case(*[When(pk=vid, then=Value(ts)) for vid, ts in pending.items()])
+        with transaction.atomic():
+            changed = (
+                Vehicle.objects.filter(pk__in=list(pending.keys()))
+                .filter(Q(last_seen__isnull=True) | Q(last_seen__lt=newest))
+                .update(last_seen=newest, updated_at=timezone.now())
+            )
+            if changed:
+                change_seq.bump()
+        return changed
+
+    def flush(self) -> int:
+        """Write all pending entries now; returns how many vehicles were written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                self._write(pending)
+            except Exception:
+                # Put entries back so the next flush retries them
+                with self._lock:
+                    self._merge(pending)
+                logger.exception("last_seen flush failed; %s vehicles kept for retry", len(pending))
+                return 0
+            return len(pending)
+
+    def _ensure_timer(self) -> None:
+        if self._timer is not None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Thread(target=self._run_timer, name="last-seen-flush", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+last_seen_buffer = LastSeenBuffer(
+    flush_interval=getattr(settings, 'LAST_SEEN_FLUSH_INTERVAL_SECONDS', 1.0),
+    max_pending=getattr(settings, 'LAST_SEEN_FLUSH_MAX_PENDING', 500),
+    enabled=getattr(settings, 'LAST_SEEN_WRITE_BEHIND', True),
+)
+
+
+def flush_all() -> None:
+    """Flush pending last_seen updates; called at shutdown and by batch commands."""
+    last_seen_buffer.flush()
+
+
+atexit.register(flush_all)
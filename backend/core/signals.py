@@ -1,17 +1,23 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.utils import timezone
 
-from .models import Sighting, Vehicle, Alert, PredictedRoute
-from .services.prediction import predict_route
+from .models import Alert, Sighting, Tombstone, Vehicle
+from .services import alert_queue, change_seq, stats_buckets
+from .services.alerting import ALERT_STATUSES, raise_alert
+from .services.delta_sync import record_deletion
+from .services.live_feed import publish_alerts, publish_sightings
 from .services.nepali_plates import normalize_plate as nepali_normalize
+from .services.plate_cache import plate_cache
+from .services.write_behind import last_seen_buffer
 
 
 def normalize_plate_preserve_spacing(plate: str) -> str:
     """Normalize dash variants while preserving spacing for exact plate matching.
 
     Historically this function removed spaces which broke Vehicle lookups
-    using __iexact. We now preserve spaces to ensure DB matches succeed.
+    using __iexact. Lookups now go through the canonical plate_key, but the
+    stored plate_number keeps its original spacing.
     """
     p = (plate or '').strip()
     # Preserve spaces; only normalize uncommon dash variants
@@ -26,47 +32,92 @@ def handle_new_sighting(sender, instance: Sighting, created: bool, **kwargs):
     # Keep spacing for DB lookups and normalize only dashes
     plate = normalize_plate_preserve_spacing(instance.plate_number)
 
-    # Prefer already-linked vehicle from the instance if present
-    vehicle = instance.vehicle or Vehicle.objects.filter(plate_number__iexact=plate).first()
+    # Resolve (vehicle id, status) from the per-process cache
+    hit = plate_cache.lookup(plate)
+    if instance.vehicle_id and (hit is None or hit[0] != instance.vehicle_id):
+        # Caller linked a vehicle under a different plate; trust the instance
+        hit = (instance.vehicle_id, instance.vehicle.status)
 
-    # Link sighting to vehicle if we found one (avoid clearing to None)
-    if vehicle:
-        if instance.vehicle_id != vehicle.id:
-            Sighting.objects.filter(pk=instance.pk).update(vehicle=vehicle)
-        vehicle.last_seen = instance.timestamp
-        vehicle.save(update_fields=["last_seen"])
+    stats_buckets.record_sightings([(instance, hit[1] if hit else None)])
 
-    # If vehicle is suspicious/stolen, create alert
+    # Link sighting to vehicle if we found one (avoid clearing to None)
     matched_status = None
-    if vehicle and vehicle.status in (Vehicle.STATUS_SUSPICIOUS, Vehicle.STATUS_STOLEN):
-        matched_status = vehicle.status
+    if hit:
+        vehicle_id, vehicle_status = hit
+        if instance.vehicle_id != vehicle_id:
+            Sighting.objects.filter(pk=instance.pk).update(vehicle_id=vehicle_id)
+            instance.vehicle_id = vehicle_id
+        # Coalesced and written in bulk; never save() here, Vehicle post_save would evict the cache entry
+        last_seen_buffer.record(vehicle_id, instance.timestamp)
+
+        # If vehicle is suspicious/stolen, create alert
+        if vehicle_status in ALERT_STATUSES:
+            matched_status = vehicle_status
 
-    if matched_status:
-        # Predict simple next position and route
-        route_path = predict_route(
+    # Hand off to run_alert_worker; fall back to inline when the queue is off or full
+    if matched_status and not alert_queue.enqueue(instance, plate, vehicle_id, matched_status):
+        # Predict next position and save route snapshot and alert (or fold into the open alert)
+        raise_alert(
+            plate,
+            vehicle_id,
+            matched_status,
             instance.latitude,
             instance.longitude,
             instance.heading_deg,
             instance.speed_kmh,
-            steps=10,
-            step_seconds=30,
         )
-        predicted = route_path[0] if route_path else {"lat": instance.latitude, "lon": instance.longitude}
 
-        # Save predicted route snapshot
-        PredictedRoute.objects.create(
-            plate_number=plate,
-            path=route_path,
-            generated_at=timezone.now(),
-        )
 
-        # Create alert
-        Alert.objects.create(
-            plate_number=plate,
-            vehicle=vehicle,
-            status=matched_status,
-            timestamp=timezone.now(),
-            predicted_latitude=predicted.get("lat"),
-            predicted_longitude=predicted.get("lon"),
-            message=f"Match on {matched_status.upper()} vehicle {plate}",
-        )
\ No newline at end of file
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+def invalidate_plate_cache(sender, instance: Vehicle, **kwargs):
+    plate, vehicle_id = instance.plate_number, instance.pk
+    plate_cache.invalidate(plate, vehicle_id=vehicle_id)
+    # This runs before the write commits; a concurrent lookup can still read and
+    # cache the old row until then, so drop the entry again once it is visible
+    transaction.on_commit(lambda: plate_cache.invalidate(plate, vehicle_id=vehicle_id))
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_save, sender=Sighting)
+@receiver(post_save, sender=Alert)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Alert)
+def bump_change_sequence(sender, **kwargs):
+    # Runs inside the save's (AtomicSaveMixin) or the collector's transaction.
+    # No post_delete for Sighting: it would disable fast deletes in retention,
+    # which bumps the sequence itself
+    change_seq.bump()
+
+
+@receiver(post_delete, sender=Vehicle)
+def record_vehicle_tombstone(sender, instance: Vehicle, **kwargs):
+    record_deletion(Tombstone.TABLE_VEHICLES, instance.pk)
+
+
+@receiver(post_delete, sender=Alert)
+def record_alert_tombstone(sender, instance: Alert, **kwargs):
+    record_deletion(Tombstone.TABLE_ALERTS, instance.pk)
+
+
+@receiver(post_save, sender=Alert)
+def count_new_alert(sender, instance: Alert, created: bool, **kwargs):
+    if created:
+        stats_buckets.record_alerts([instance])
+
+
+@receiver(post_delete, sender=Alert)
+def uncount_deleted_alert(sender, instance: Alert, **kwargs):
+    stats_buckets.record_alerts([instance], sign=-1)
+
+
+@receiver(post_save, sender=Sighting)
+def publish_sighting_event(sender, instance: Sighting, created: bool, **kwargs):
+    # Registered after handle_new_sighting, so the vehicle link is already set
+    if created:
+        publish_sightings([instance])
+
+
+@receiver(post_save, sender=Alert)
+def publish_alert_event(sender, instance: Alert, **kwargs):
+    publish_alerts([instance])
@@ -0,0 +1,255 @@
+"""Streaming sighting ingest for camera gateways (ASGI only).
+
+Two long-lived channels feed the normal ingest pipeline
+(services.ingest.ingest_sightings) in batches:
+
+- HTTP: ``POST /api/sightings/stream/`` with a chunked NDJSON body, one
+  sighting per line. The response is an NDJSON stream of batch acks.
+- WebSocket: ``/ws/sightings/``. Each text frame holds one or more NDJSON
+  lines; every flushed batch is acknowledged with a JSON text frame.
+
+A batch is flushed when it reaches STREAM_INGEST_BATCH_SIZE items or when
+its oldest item has waited STREAM_INGEST_MAX_DELAY_MS. Each ack carries the
+last input line number it covers, so a gateway can resume after a drop.
+Lines longer than STREAM_INGEST_MAX_LINE_BYTES are discarded as they
+arrive and reported as errors. A batch the database rejects is stored as
+a whole or not at all; its ack has `failed` and `error` set, and the
+session carries on with the next batch.
+
+Django's own request handlers buffer the whole body, so these channels are
+served by StreamingIngestRouter, which wraps the Django ASGI app in
+backend/asgi.py and passes every other request through unchanged.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .serializers import SightingIngestSerializer
+from .services.ingest import ingest_sightings
+
+logger = logging.getLogger(__name__)
+
+
+def _ingest_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    close_old_connections()
+    try:
+        # One transaction per acked batch, so a failed ack means nothing of it was stored
+        return ingest_sightings(items, batch_size=len(items))
+    finally:
+        close_old_connections()
+
+
+class IngestSession:
+    """Parses NDJSON input for one connection and ingests it in batches."""
+
+    def __init__(self, batch_size: int, max_delay: float, max_line_bytes: int = 64 * 1024):
+        self.batch_size = max(1, int(batch_size))
+        self.max_delay = max_delay
+        self.max_line_bytes = max(1, int(max_line_bytes))
+        self.seq = 0
+        self.line_no = 0
+        self.accepted = 0
+        self.rejected = 0
+        self._partial = b''
+        # The current line went over max_line_bytes; the rest of it is dropped
+        self._overflow = False
+        self._items: List[Dict[str, Any]] = []
+        self._errors: List[Dict[str, Any]] = []
+        self._first_at: Optional[float] = None
+
+    def _reject(self, message: str) -> None:
+        self._errors.append({'line': self.line_no, 'errors': {'non_field_errors': [message]}})
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        data = self._partial + data
+        lines = data.split(b'\n')
+        tail = lines.pop()
+        if final and (tail.strip() or self._overflow):
+            lines.append(tail)
+        overflow = self._overflow
+        for raw in lines:
+            self.line_no += 1
+            too_long, overflow = overflow or len(raw) > self.max_line_bytes, False
+            if too_long:
+                if self._first_at is None:
+                    self._first_at = time.monotonic()
+                self._reject(f'Line longer than {self.max_line_bytes} bytes')
+                continue
+            raw = raw.strip()
+            if not raw:
+                continue
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            try:
+                payload = json.loads(raw)
+            except ValueError as e:
+                self._reject(f'Invalid JSON: {e}')
+                continue
+            ser = SightingIngestSerializer(data=payload)
+            if ser.is_valid():
+                self._items.append(ser.validated_data)
+            else:
+                self._errors.append({'line': self.line_no, 'errors': ser.errors})
+        if final:
+            tail, overflow = b'', False
+        elif len(tail) > self.max_line_bytes:
+            tail, overflow = b'', True
+        self._partial, self._overflow = tail, overflow
+
+    def pending(self) -> bool:
+        return bool(self._items or self._errors)
+
+    def due(self) -> bool:
+        return len(self._items) >= self.batch_size
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds until the buffered batch must be flushed, or None if empty."""
+        if self._first_at is None:
+            return None
+        return max(0.0, self._first_at + self.max_delay - time.monotonic())
+
+    async def flush(self) -> Optional[Dict[str, Any]]:
+        if not self.pending():
+            return None
+        items, errors = self._items, self._errors
+        self._items, self._errors, self._first_at = [], [], None
+        self.seq += 1
+        ack = {'ack': self.seq, 'through_line': self.line_no}
+        try:
+            results = await sync_to_async(_ingest_batch, thread_sensitive=True)(items) if items else []
+        except Exception as e:
+            logger.exception("Sighting stream batch %s failed (%s items)", self.seq, len(items))
+            self.rejected += len(items) + len(errors)
+            ack.update({'accepted': 0, 'ids': [], 'alerts': 0, 'errors': errors, 'failed': len(items), 'error': str(e)})
+            return ack
+        self.accepted += len(results)
+        self.rejected += len(errors)
+        ack.update({
+            'accepted': len(results),
+            'ids': [r['id'] for r in results],
+            'alerts': sum(1 for r in results if r['alert_id'] or r['alert_queued']),
+            'errors': errors,
+        })
+        return ack
+
+    def summary(self) -> Dict[str, Any]:
+        return {'done': True, 'lines': self.line_no, 'accepted': self.accepted, 'rejected': self.rejected}
+
+
+def _new_session() -> IngestSession:
+    return IngestSession(
+        batch_size=getattr(settings, 'STREAM_INGEST_BATCH_SIZE', 200),
+        max_delay=getattr(settings, 'STREAM_INGEST_MAX_DELAY_MS', 250) / 1000.0,
+        max_line_bytes=getattr(settings, 'STREAM_INGEST_MAX_LINE_BYTES', 64 * 1024),
+    )
+
+
+def _encode(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+async def _pump(session: IngestSession, receive, on_message, on_ack):
+    """Read messages until the peer is done, flushing batches by size or age.
+
+    `on_message` feeds a message into the session and returns False once the
+    input has ended. The pending receive() is never cancelled; a timeout only
+    triggers a flush.
+    """
+    recv = asyncio.ensure_future(receive())
+    while True:
+        timeout = session.wait_time()
+        done, _ = await asyncio.wait({recv}, timeout=timeout)
+        if not done:
+            await on_ack(await session.flush())
+            continue
+        more = on_message(recv.result())
+        if session.due():
+            await on_ack(await session.flush())
+        if not more:
+            break
+        recv = asyncio.ensure_future(receive())
+    await on_ack(await session.flush())
+
+
+async def _http_stream(scope, receive, send):
+    if scope['method'] != 'POST':
+        await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'POST')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    session = _new_session()
+    state = {'disconnected': False}
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/x-ndjson; charset=utf-8'), (b'cache-control', b'no-store')],
+    })
+
+    def on_message(message) -> bool:
+        if message['type'] == 'http.disconnect':
+            state['disconnected'] = True
+            return False
+        more = message.get('more_body', False)
+        session.feed(message.get('body', b''), final=not more)
+        return more
+
+    async def on_ack(ack):
+        if ack is not None and not state['disconnected']:
+            await send({'type': 'http.response.body', 'body': _encode(ack), 'more_body': True})
+
+    await _pump(session, receive, on_message, on_ack)
+    logger.info("Sighting stream (http) closed: %s", session.summary())
+    if not state['disconnected']:
+        await send({'type': 'http.response.body', 'body': _encode(session.summary())})
+
+
+async def _websocket_stream(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    await send({'type': 'websocket.accept'})
+    session = _new_session()
+    state = {'disconnected': False}
+
+    def on_message(message) -> bool:
+        if message['type'] == 'websocket.disconnect':
+            state['disconnected'] = True
+            return False
+        data = message.get('bytes') or (message.get('text') or '').encode('utf-8')
+        # Each frame carries whole lines
+        session.feed(data, final=True)
+        return True
+
+    async def on_ack(ack):
+        if ack is not None and not state['disconnected']:
+            await send({'type': 'websocket.send', 'text': _encode(ack).decode('utf-8').rstrip('\n')})
+
+    try:
+        await _pump(session, receive, on_message, on_ack)
+    finally:
+        logger.info("Sighting stream (websocket) closed: %s", session.summary())
+
+
+class StreamingIngestRouter:
+    """ASGI app serving the streaming ingest channels and delegating the rest to Django."""
+
+    def __init__(self, django_app):
+        self.django_app = django_app
+        self.http_path = getattr(settings, 'STREAM_INGEST_HTTP_PATH', '/api/sightings/stream/')
+        self.ws_path = getattr(settings, 'STREAM_INGEST_WS_PATH', '/ws/sightings/')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.http_path:
+            return await _http_stream(scope, receive, send)
+        if scope['type'] == 'websocket':
+            if scope['path'] == self.ws_path:
+                return await _websocket_stream(scope, receive, send)
+            await receive()
+            return await send({'type': 'websocket.close', 'code': 4404})
+        return await self.django_app(scope, receive, send)
@@ -2,27 +2,152 @@ from django.utils import timezone
 import logging
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Vehicle, Sighting, Alert, PredictedRoute
+from .models import Vehicle, Sighting, Alert, PredictedRoute, ArchivedDay
 from .serializers import (
     VehicleSerializer,
     SightingSerializer,
     AlertSerializer,
     PredictedRouteSerializer,
+    SightingIngestSerializer,
     VerificationRequestSerializer,
     VerificationResponseSerializer,
 )
 from .services.verification import verify_vehicle
+from .services import aggregates, change_seq, clusters, delta_sync, list_query, spatial, stats_buckets
+from .services.alert_queue import queue_stats
+from .services.fast_rows import (
+    alert_rows,
+    referenced_vehicle_ids,
+    side_load_vehicles,
+    sighting_ref_rows,
+    sighting_rows,
+    vehicle_rows,
+)
+from .services.ingest import ingest_sightings
+from .services.plate_cache import plate_cache
+from .services.retention import archived_counts
+from .services.suppression import suppressor
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 
 logger = logging.getLogger(__name__)
 
 
-class VehicleViewSet(viewsets.ModelViewSet):
+LAYOUTS = ('rows', 'columnar')
+
+
+def requested_layout(request) -> str:
+    """?layout=rows (default, one object per row) or columnar (services.fast_rows)."""
+    layout = request.query_params.get('layout') or 'rows'
+    if layout not in LAYOUTS:
+        raise ParseError(f"Unknown layout {layout}; use one of {', '.join(LAYOUTS)}")
+    return layout
+
+
+def requested_includes(request, allowed) -> set:
+    """?include=vehicles: side-load related rows instead of nesting them."""
+    include = {i.strip() for i in request.query_params.get('include', '').split(',') if i.strip()}
+    unknown = include - set(allowed)
+    if unknown:
+        supported = ', '.join(allowed) if allowed else 'nothing'
+        raise ParseError(f"Unknown include {', '.join(sorted(unknown))}; this endpoint supports {supported}")
+    return include
+
+
+FIELDSET_TYPES = ('vehicles', 'sightings', 'alerts')
+
+
+def requested_fields(request) -> dict:
+    """Sparse fieldsets: {"vehicles": ["plate_number", "status"], ...} from ?fields[vehicles]=..."""
+    fieldsets = {}
+    for param, value in request.query_params.items():
+        if not (param.startswith('fields[') and param.endswith(']')):
+            continue
+        kind = param[len('fields['):-1]
+        if kind not in FIELDSET_TYPES:
+            raise ParseError(f"Unknown fieldset {param}; use fields[{']/fields['.join(FIELDSET_TYPES)}]")
+        fieldsets[kind] = [f.strip() for f in value.split(',') if f.strip()]
+    return fieldsets
+
+
+def projected(encoder, fieldsets: dict, kind: str, extra_columns=()):
+    """`encoder` cut down to the request's fieldsets for `kind` and nested vehicles."""
+    try:
+        return encoder.project(fieldsets.get(kind), fieldsets.get('vehicles'), extra_columns)
+    except ValueError as e:
+        raise ParseError(f"fields[{kind}]: {e}" if kind in fieldsets else f"fields[vehicles]: {e}")
+
+
+class FastListMixin:
+    """List through a services.fast_rows encoder instead of the model serializer.
+
+    Same JSON as `serializer_class`; rows come from values() (one query per
+    page, related vehicles joined) and skip model and field instantiation.
+    With ?layout=columnar, `results` is one array per field instead. With
+    ?include=vehicles, rows carry the vehicle id and `ref_row_encoder` is
+    used; each referenced vehicle is sent once under `included`.
+    ?fields[<resource>]= (and fields[vehicles] for nested or included
+    vehicles) limits the columns fetched and returned. ?status=, ?province=,
+    ?search=, ?from=/?to=/?minutes= and ?sort= are applied in SQL
+    (services.list_query).
+    """
+    row_encoder = None
+    ref_row_encoder = None
+    includes = ()
+    resource = None
+
+    def list(self, request, *args, **kwargs):
+        try:
+            # Per request: the paginator keys its cursors on the view's ordering
+            self.ordering = list_query.ordering(self.resource, request.query_params.get('sort'), type(self).ordering)
+        except ValueError as e:
+            raise ParseError(str(e))
+        return self.encoded_response(self.filter_queryset(self.get_queryset()))
+
+    def filter_queryset(self, queryset):
+        try:
+            return list_query.filter_list(self.resource, super().filter_queryset(queryset), self.request.query_params)
+        except ValueError as e:
+            raise ParseError(str(e))
+
+    def encoded_response(self, qs):
+        include = requested_includes(self.request, self.includes)
+        fieldsets = requested_fields(self.request)
+        # The keyset paginator reads the ordering columns even when they are not returned
+        ordering = [name.lstrip('-') for name in self.ordering] + ['id']
+        encoder = projected(self.ref_row_encoder if include else self.row_encoder, fieldsets, self.resource, ordering)
+        columnar = requested_layout(self.request) == 'columnar'
+        if columnar:
+            page = self.paginate_queryset(encoder.values_list(qs, named=True))
+            data = encoder.columnar(encoder.values_list(qs) if page is None else page)
+        else:
+            page = self.paginate_queryset(encoder.values(qs))
+            data = encoder.encode(encoder.values(qs) if page is None else page)
+        if not include:
+            return Response(data) if page is None else self.get_paginated_response(data)
+        vehicle_encoder = projected(vehicle_rows, fieldsets, 'vehicles')
+        included = {'vehicles': side_load_vehicles(referenced_vehicle_ids(data), columnar, vehicle_encoder)}
+        if page is None:
+            return Response({'results': data, 'included': included})
+        response = self.get_paginated_response(data)
+        response.data['included'] = included
+        return response
+
+
+class VehicleViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Vehicle.objects.all().order_by('plate_number')
     serializer_class = VehicleSerializer
+    resource = 'vehicles'
+    row_encoder = vehicle_rows
+    ordering = ('plate_number', 'id')
 
     @action(detail=False, methods=['get'])
     def filter_by_status(self, request):
@@ -30,79 +155,193 @@ class VehicleViewSet(viewsets.ModelViewSet):
         qs = self.get_queryset()
         if status_q:
             qs = qs.filter(status=status_q)
-        return Response(self.get_serializer(qs, many=True).data)
+        return self.encoded_response(qs)
 
     @action(detail=True, methods=['get'])
     def predicted(self, request, pk=None):
         vehicle = self.get_object()
-        route = PredictedRoute.objects.filter(plate_number__iexact=vehicle.plate_number).order_by('-generated_at').first()
+        route = PredictedRoute.objects.filter(plate_key=vehicle.plate_key).order_by('-generated_at').first()
         if route:
             return Response(PredictedRouteSerializer(route).data)
         return Response({"plate_number": vehicle.plate_number, "path": []})
 
 
-class SightingViewSet(viewsets.ModelViewSet):
+class SightingViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Sighting.objects.all().order_by('-timestamp')
     serializer_class = SightingSerializer
+    resource = 'sightings'
+    row_encoder = sighting_rows
+    ref_row_encoder = sighting_ref_rows
+    includes = ('vehicles',)
+    ordering = ('-timestamp', '-id')
+
+    def filter_queryset(self, queryset):
+        # ?bbox=west,south,east,north and ?near=lat,lon,radius_m (services.spatial)
+        try:
+            return spatial.filter_sightings(super().filter_queryset(queryset), self.request.query_params)
+        except ValueError as e:
+            raise ParseError(str(e))
 
     @action(detail=False, methods=['get'])
     def recent(self, request):
         minutes = int(request.query_params.get('minutes', '10'))
         since = timezone.now() - timezone.timedelta(minutes=minutes)
-        qs = Sighting.objects.filter(timestamp__gte=since).order_by('-timestamp')[:500]
-        payload = self.get_serializer(qs, many=True).data
+        qs = self.filter_queryset(Sighting.objects.filter(timestamp__gte=since)).order_by('-timestamp')[:500]
+        payload = sighting_rows.serialize(qs)
         try:
             logger.info("SightingViewSet.recent: minutes=%s count=%s", minutes, len(payload))
         except Exception:
             pass
         return Response(payload)
 
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """Map markers for ?bbox=&zoom=&minutes=: grid clusters, or single sightings when zoomed in."""
+        try:
+            zoom = int(request.query_params.get('zoom', '0'))
+            minutes = int(request.query_params.get('minutes', '10'))
+            box = spatial.parse_bbox(request.query_params['bbox']) if request.query_params.get('bbox') else None
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= zoom <= 22 or not 1 <= minutes <= 1440:
+            return Response({'detail': 'zoom must be 0-22 and minutes 1-1440'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if zoom > clusters.max_zoom():
+            since = timezone.now() - timezone.timedelta(minutes=minutes)
+            qs = Sighting.objects.filter(timestamp__gte=since)
+            if box is not None:
+                qs = qs.filter(spatial.bbox_q(box))
+            limit = getattr(settings, 'CLUSTER_POINTS_LIMIT', 500)
+            return Response({'mode': 'points', 'zoom': zoom, 'points': sighting_rows.serialize(qs.order_by('-timestamp')[:limit])})
+        return Response({'mode': 'clusters', 'zoom': zoom, 'clusters': clusters.clusters(zoom, minutes, box)})
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Ingest many sightings in one call.
+
+        Accepts a JSON list (or {"sightings": [...]}) and returns one result per
+        item, in order. Invalid items are reported and skipped; valid items are
+        written in set-based batches.
+        """
+        items = request.data.get('sightings') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            return Response({'detail': 'Expected a list of sightings'}, status=status.HTTP_400_BAD_REQUEST)
+        max_items = getattr(settings, 'SIGHTING_BULK_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            return Response({'detail': f'Too many sightings; limit is {max_items}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        valid, valid_index, results = [], [], [None] * len(items)
+        for i, item in enumerate(items):
+            ser = SightingIngestSerializer(data=item)
+            if ser.is_valid():
+                valid.append(ser.validated_data)
+                valid_index.append(i)
+            else:
+                results[i] = {'index': i, 'ok': False, 'errors': ser.errors}
 
-class AlertViewSet(viewsets.ModelViewSet):
+        batch_size = getattr(settings, 'SIGHTING_BULK_BATCH_SIZE', 500)
+        for i, res in zip(valid_index, ingest_sightings(valid, batch_size=batch_size)):
+            results[i] = {'index': i, 'ok': True, **res}
+
+        created = len(valid)
+        try:
+            logger.info("SightingViewSet.bulk: received=%s created=%s failed=%s", len(items), created, len(items) - created)
+        except Exception:
+            pass
+        return Response({
+            'created': created,
+            'failed': len(items) - created,
+            'results': results,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+
+class AlertViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Alert.objects.all().order_by('-timestamp')
     serializer_class = AlertSerializer
+    resource = 'alerts'
+    row_encoder = alert_rows
+    ref_row_encoder = alert_rows  # alerts already carry only the vehicle id
+    includes = ('vehicles',)
+    ordering = ('-timestamp', '-id')
 
     @action(detail=False, methods=['get'])
     def recent(self, request):
         minutes = int(request.query_params.get('minutes', '60'))
         since = timezone.now() - timezone.timedelta(minutes=minutes)
         qs = Alert.objects.filter(timestamp__gte=since).order_by('-timestamp')[:200]
-        payload = self.get_serializer(qs, many=True).data
+        payload = alert_rows.serialize(qs)
         try:
             logger.info("AlertViewSet.recent: minutes=%s count=%s", minutes, len(payload))
         except Exception:
             pass
         return Response(payload)
 
+    @action(detail=False, methods=['get'])
+    def queue(self, request):
+        """Alert job queue depth and lag (seconds since the oldest pending job was queued)."""
+        return Response(queue_stats())
+
     @action(detail=True, methods=['get', 'post'])
     def acknowledge(self, request, pk=None):
         alert = self.get_object()
         alert.acknowledged = True
         alert.dispatched = True  # simulate dispatch action
         alert.save(update_fields=['acknowledged', 'dispatched'])
+        # Next sighting of this plate should raise a fresh alert
+        suppressor.release(alert.plate_key, alert.status)
         return Response(self.get_serializer(alert).data)
 
 
 class PredictedRouteViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PredictedRoute.objects.all().order_by('-generated_at')
     serializer_class = PredictedRouteSerializer
+    ordering = ('-generated_at', '-id')
 
 
 class StatsView(APIView):
+    # 304 for If-None-Match while nothing has been written (services.change_seq)
+    @method_decorator(vary_on_headers('Accept'))
+    @method_decorator(condition(etag_func=change_seq.etag_for))
     def get(self, request):
         now = timezone.now()
         since_24h = now - timezone.timedelta(hours=24)
         since_5m = now - timezone.timedelta(minutes=5)
-        vehicles_scanned = Sighting.objects.filter(timestamp__gte=since_24h).count()
-        alerts_triggered = Alert.objects.filter(timestamp__gte=since_24h).count()
+        # 24-hour counts come from the per-minute buckets (services.stats_buckets);
+        # distinct plates cannot be summed, but 5 minutes of sightings is a short index range
+        totals = stats_buckets.totals(since_24h)
         total_vehicles_online = Sighting.objects.filter(timestamp__gte=since_5m).values('plate_number').distinct().count()
         return Response({
-            'vehicles_scanned_24h': vehicles_scanned,
-            'alerts_triggered_24h': alerts_triggered,
+            'vehicles_scanned_24h': totals['sightings'],
+            'alerts_triggered_24h': totals['alerts'],
             'total_vehicles_online': total_vehicles_online,
+            'by_province_24h': stats_buckets.by_province(since_24h),
+            'plate_cache': plate_cache.stats(),
         })
 
 
+class AggregatesView(APIView):
+    """Time-bucketed sighting/alert counts for charts (see services.aggregates).
+
+    Query params:
+    - bucket: 1m, 5m, 15m, 30m, 1h, 3h, 6h, 12h or 1d (default 5m)
+    - group: comma-separated subset of province,status (default none)
+    - from / to: ISO 8601 datetimes (default the last 24 hours; naive is UTC)
+    """
+
+    @method_decorator(vary_on_headers('Accept'))
+    @method_decorator(condition(etag_func=change_seq.etag_for))
+    def get(self, request):
+        params = request.query_params
+        try:
+            end = aggregates.parse_time(params.get('to'), timezone.now())
+            start = aggregates.parse_time(params.get('from'), end - timezone.timedelta(hours=24))
+            group = aggregates.parse_group(params.get('group'))
+            payload = aggregates.aggregate(params.get('bucket') or '5m', group, start, end)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(payload)
+
+
 class DatasetView(APIView):
     """Unified dataset endpoint returning vehicles, recent sightings, and alerts in one payload.
 
@@ -111,44 +350,129 @@ class DatasetView(APIView):
     - minutesAlerts: int (default 120)
     - limitSightings: int (default 500)
     - limitAlerts: int (default 200)
+    - since: cursor from a previous response; returns only rows created or
+      changed after it, plus `deleted` ids (see services.delta_sync)
+    - layout: rows (default) or columnar, one array per field with repeated
+      strings dictionary-encoded (see services.fast_rows)
+    - include: `vehicles` sends sightings with only the vehicle id and the
+      vehicles they and the alerts reference once, under `included`
+    - vehicles: all (default) or referenced, only the vehicles the returned
+      sightings and alerts point to (in a delta, also changed vehicles
+      that sightings/alerts in the windows point to)
+    - fields[vehicles], fields[sightings], fields[alerts]: sparse fieldsets
+
+    Every response carries a `cursor` for the next delta poll. `full` is
+    true when the payload is a complete snapshot (no or expired `since`).
+    Responses carry an ETag; If-None-Match gets 304 while nothing changed.
     """
 
     @transaction.non_atomic_requests
+    @method_decorator(vary_on_headers('Accept'))
+    @method_decorator(condition(etag_func=change_seq.etag_for))
     def get(self, request):
         minutes_sightings = int(request.query_params.get('minutesSightings', '60'))
         minutes_alerts = int(request.query_params.get('minutesAlerts', '120'))
         limit_sightings = int(request.query_params.get('limitSightings', '500'))
         limit_alerts = int(request.query_params.get('limitAlerts', '200'))
+        columnar = requested_layout(request) == 'columnar'
+        include = requested_includes(request, ('vehicles',))
+        vehicles_mode = request.query_params.get('vehicles') or 'all'
+        if vehicles_mode not in ('all', 'referenced'):
+            raise ParseError(f"Unknown vehicles={vehicles_mode}; use all or referenced")
+        fieldsets = requested_fields(request)
+        vehicle_encoder = projected(vehicle_rows, fieldsets, 'vehicles')
+        sighting_encoder = projected(sighting_ref_rows if include else sighting_rows, fieldsets, 'sightings')
+        alert_encoder = projected(alert_rows, fieldsets, 'alerts')
 
-        now = timezone.now()
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = delta_sync.parse_cursor(request.query_params['since'])
+            except ValueError as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        now, max_sighting_id = delta_sync.current_position()
         since_s = now - timezone.timedelta(minutes=minutes_sightings)
         since_a = now - timezone.timedelta(minutes=minutes_alerts)
+        if since and since[0] < delta_sync.tombstone_horizon(now):
+            since = None  # deletions before the horizon are forgotten; resend everything
 
         vehicles_qs = Vehicle.objects.all().order_by('plate_number')
-        sightings_qs = Sighting.objects.filter(timestamp__gte=since_s).order_by('-timestamp')[:limit_sightings]
-        alerts_qs = Alert.objects.filter(timestamp__gte=since_a).order_by('-timestamp')[:limit_alerts]
+        sightings_qs = Sighting.objects.filter(timestamp__gte=since_s)
+        alerts_qs = Alert.objects.filter(timestamp__gte=since_a)
+        if since:
+            changed_after = since[0] - delta_sync.overlap()
+            # Ordered by the delta index; clients merge by id and re-sort
+            vehicles_qs = vehicles_qs.filter(updated_at__gte=changed_after).order_by('updated_at', 'id')
+            sightings_qs = sightings_qs.filter(id__gt=since[1])
+            alerts_qs = alerts_qs.filter(updated_at__gte=changed_after)
+        sightings_qs = sightings_qs.order_by('-timestamp')[:limit_sightings]
+        alerts_qs = alerts_qs.order_by('-timestamp')[:limit_alerts]
+        if vehicles_mode == 'referenced':
+            # IN (subquery) on the two sliced queries; the registry is never scanned
+            referenced = Q(id__in=sightings_qs.values('vehicle_id')) | Q(id__in=alerts_qs.values('vehicle_id'))
+            if since:
+                in_window = (
+                    Q(id__in=Sighting.objects.filter(timestamp__gte=since_s).values('vehicle_id'))
+                    | Q(id__in=Alert.objects.filter(timestamp__gte=since_a).values('vehicle_id'))
+                )
+                vehicles_qs = Vehicle.objects.filter(
+                    referenced | (Q(updated_at__gte=changed_after) & in_window)
+                ).order_by('updated_at', 'id')
+            else:
+                vehicles_qs = Vehicle.objects.filter(referenced).order_by('plate_number')
 
-        vehicles = VehicleSerializer(vehicles_qs, many=True).data
-        sightings = SightingSerializer(sightings_qs, many=True).data
-        alerts = AlertSerializer(alerts_qs, many=True).data
+        if columnar:
+            vehicles = vehicle_encoder.serialize_columnar(vehicles_qs)
+            sightings = sighting_encoder.serialize_columnar(sightings_qs)
+            alerts = alert_encoder.serialize_columnar(alerts_qs)
+        else:
+            vehicles = vehicle_encoder.serialize(vehicles_qs)
+            sightings = sighting_encoder.serialize(sightings_qs)
+            alerts = alert_encoder.serialize(alerts_qs)
 
         resp = {
             'vehicles': vehicles,
             'sightings': sightings,
             'alerts': alerts,
             'source': 'api',
+            'full': since is None,
+            'cursor': delta_sync.make_cursor(now, max_sighting_id),
         }
+        if include:
+            ids = referenced_vehicle_ids(sightings, alerts)
+            resp['included'] = {'vehicles': side_load_vehicles(ids, columnar, vehicle_encoder)}
+        if since:
+            resp['deleted'] = delta_sync.tombstones_since(since[0])
         try:
             logger.info(
-                "DatasetView.get: minutesSightings=%s minutesAlerts=%s limits=(%s,%s) counts=(%s,%s,%s)",
-                minutes_sightings, minutes_alerts, limit_sightings, limit_alerts,
-                len(vehicles), len(sightings), len(alerts)
+                "DatasetView.get: minutesSightings=%s minutesAlerts=%s limits=(%s,%s) delta=%s counts=(%s,%s,%s)",
+                minutes_sightings, minutes_alerts, limit_sightings, limit_alerts, since is not None,
+                *(t['count'] if columnar else len(t) for t in (vehicles, sightings, alerts))
             )
         except Exception:
             pass
         return Response(resp)
 
 
+class ArchiveView(APIView):
+    """Per-day counts of rows moved out of the hot tables by retain_sightings.
+
+    Query params:
+    - table: sightings|alerts (default sightings)
+    - from, to: optional ISO dates bounding the days returned
+    """
+
+    def get(self, request):
+        table = request.query_params.get('table', ArchivedDay.TABLE_SIGHTINGS)
+        if table not in dict(ArchivedDay.TABLE_CHOICES):
+            return Response({'detail': f'Unknown table {table}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'table': table,
+            'days': archived_counts(table, request.query_params.get('from'), request.query_params.get('to')),
+        })
+
+
 class VerificationView(APIView):
     """Verify incoming vehicle data against police records."""
     def post(self, request):
@@ -1,6 +1,9 @@
 "use client";
 import { useEffect, useState } from "react";
 import { getRecentAlerts, acknowledgeAlert } from "../lib/api";
+import { subscribeStream, upsertRecent } from "../lib/stream";
+
+const WINDOW_MINUTES = 120;
 
 export default function AlertsPanel() {
   const [alerts, setAlerts] = useState([]);
@@ -10,7 +13,7 @@ export default function AlertsPanel() {
     try {
       setError(null);
       setLoading(true);
-      const data = await getRecentAlerts(120);
+      const data = await getRecentAlerts(WINDOW_MINUTES);
       setAlerts(data);
       setLoading(false);
     } catch (e) {
@@ -21,8 +24,13 @@ export default function AlertsPanel() {
   };
   useEffect(() => {
     load();
-    const id = setInterval(load, 3000);
-    return () => clearInterval(id);
+    // New and updated alerts are pushed; the slow poll only ages out old ones
+    const unsubscribe = subscribeStream({ types: "alert" }, {
+      alert: (a) => setAlerts(prev => upsertRecent(prev, a, { minutes: WINDOW_MINUTES, limit: 200 })),
+      reset: load,
+    });
+    const id = setInterval(load, unsubscribe ? 30000 : 3000);
+    return () => { clearInterval(id); if (unsubscribe) unsubscribe(); };
   }, []);
 
   const acknowledge = async (id) => {
@@ -60,7 +68,12 @@ export default function AlertsPanel() {
                 </span>]
               </div>
               <div className="text-sm">Predicted: {a.predicted_latitude?.toFixed(5)}, {a.predicted_longitude?.toFixed(5)}</div>
-              <div className="text-xs">{new Date(a.timestamp).toLocaleString()}</div>
+              <div className="text-xs">
+                {new Date(a.timestamp).toLocaleString()}
+                {a.hit_count > 1 && (
+                  <span> · {a.hit_count} sightings, last {new Date(a.last_hit_at).toLocaleTimeString()}</span>
+                )}
+              </div>
             </div>
             <div className="flex gap-2">
               {a.acknowledged ? (
@@ -1,14 +1,17 @@
 "use client";
 
-import { useMemo, useState } from "react";
-import { useDataset } from "../lib/dataset";
-import { isValidNepaliPlate, extractProvinceFromPlate } from "../lib/nepaliPlate";
+import { useEffect, useMemo, useState } from "react";
+import { usePagedList } from "../lib/dataset";
+import { API_BASE } from "../lib/api";
 
+// Columns without `sortable: false` are sorted by the server (services.list_query)
 function TableHeader({ columns, sort, setSort }) {
   return (
     <thead>
       <tr className="text-left">
-        {columns.map(col => (
+        {columns.map(col => col.sortable === false ? (
+          <th key={col.key} role="columnheader" className="p-2">{col.label}</th>
+        ) : (
           <th
             key={col.key}
             role="columnheader"
@@ -30,8 +33,27 @@ function TableHeader({ columns, sort, setSort }) {
   );
 }
 
+function LoadMore({ list }) {
+  if (!list.hasMore) return null;
+  return (
+    <button onClick={list.loadMore} disabled={list.loading} className="mt-2 px-3 py-1 border border-muted rounded bg-surface text-sm">
+      {list.loading ? 'Loading…' : 'Load more'}
+    </button>
+  );
+}
+
+const sortParam = ({ key, dir }) => `${dir === 'desc' ? '-' : ''}${key}`;
+
+function useDebounced(value, ms) {
+  const [debounced, setDebounced] = useState(value);
+  useEffect(() => {
+    const id = setTimeout(() => setDebounced(value), ms);
+    return () => clearTimeout(id);
+  }, [value, ms]);
+  return debounced;
+}
+
 export default function DatasetViewer() {
-  const [source, setSource] = useState('api');
   const [pollIntervalMs, setPollIntervalMs] = useState(5000);
   const [minutesSightings, setMinutesSightings] = useState(60);
   const [minutesAlerts, setMinutesAlerts] = useState(120);
@@ -40,57 +62,32 @@ export default function DatasetViewer() {
   const [provinceFilter, setProvinceFilter] = useState('all');
   const [validOnly, setValidOnly] = useState(false);
 
-  const { data, loading, error, refresh, meta } = useDataset({ source, minutesSightings, minutesAlerts, pollIntervalMs });
-
   const [vehSort, setVehSort] = useState({ key: 'plate_number', dir: 'asc' });
   const [sigSort, setSigSort] = useState({ key: 'timestamp', dir: 'desc' });
   const [altSort, setAltSort] = useState({ key: 'timestamp', dir: 'desc' });
 
-  const searchLower = search.trim().toLowerCase();
+  // Filters and sort go to the backend; the browser only holds the pages it has loaded
+  const searchTerm = useDebounced(search.trim(), 300);
   const provinceOptions = ['all', '१','२','३','४','५','६','७'];
+  const polling = { pollIntervalMs };
+  const vehicles = usePagedList('/vehicles/', { status: statusFilter, province: provinceFilter, search: searchTerm, sort: sortParam(vehSort) }, polling);
+  const sightings = usePagedList('/sightings/', { minutes: minutesSightings, search: searchTerm, sort: sortParam(sigSort) }, polling);
+  const alerts = usePagedList('/alerts/', { minutes: minutesAlerts, search: searchTerm, sort: sortParam(altSort) }, polling);
+  const loading = vehicles.loading || sightings.loading || alerts.loading;
+  const error = vehicles.error || sightings.error || alerts.error;
+  const refresh = () => { vehicles.refresh(); sightings.refresh(); alerts.refresh(); };
 
-  const filteredVehicles = useMemo(() => {
-    let list = data.vehicles || [];
-    if (statusFilter !== 'all') list = list.filter(v => v.status === statusFilter);
-    if (validOnly) list = list.filter(v => v.is_valid_plate);
-    if (provinceFilter !== 'all') list = list.filter(v => extractProvinceFromPlate(v.plate_number) === provinceFilter);
-    if (searchLower) list = list.filter(v => (v.plate_number || '').toLowerCase().includes(searchLower) || (v.owner || '').toLowerCase().includes(searchLower));
-    const { key, dir } = vehSort;
-    return [...list].sort((a, b) => {
-      const av = a[key] ?? '';
-      const bv = b[key] ?? '';
-      if (av < bv) return dir === 'asc' ? -1 : 1;
-      if (av > bv) return dir === 'asc' ? 1 : -1;
-      return 0;
-    });
-  }, [data.vehicles, statusFilter, validOnly, provinceFilter, searchLower, vehSort]);
-
-  const filteredSightings = useMemo(() => {
-    let list = data.sightings || [];
-    if (validOnly) list = list.filter(s => s.is_valid_plate);
-    if (searchLower) list = list.filter(s => (s.plate_number || '').toLowerCase().includes(searchLower));
-    const { key, dir } = sigSort;
-    return [...list].sort((a, b) => {
-      const av = a[key] ?? '';
-      const bv = b[key] ?? '';
-      if (av < bv) return dir === 'asc' ? -1 : 1;
-      if (av > bv) return dir === 'asc' ? 1 : -1;
-      return 0;
-    });
-  }, [data.sightings, validOnly, searchLower, sigSort]);
-
-  const filteredAlerts = useMemo(() => {
-    let list = data.alerts || [];
-    if (searchLower) list = list.filter(a => (a.plate_number || '').toLowerCase().includes(searchLower));
-    const { key, dir } = altSort;
-    return [...list].sort((a, b) => {
-      const av = a[key] ?? '';
-      const bv = b[key] ?? '';
-      if (av < bv) return dir === 'asc' ? -1 : 1;
-      if (av > bv) return dir === 'asc' ? 1 : -1;
-      return 0;
-    });
-  }, [data.alerts, searchLower, altSort]);
+  // Plate validity is a client-side check, so it filters the loaded rows
+  const filteredVehicles = useMemo(
+    () => (validOnly ? vehicles.rows.filter(v => v.is_valid_plate) : vehicles.rows),
+    [vehicles.rows, validOnly],
+  );
+  const filteredSightings = useMemo(
+    () => (validOnly ? sightings.rows.filter(s => s.is_valid_plate) : sightings.rows),
+    [sightings.rows, validOnly],
+  );
+  const filteredAlerts = alerts.rows;
+  const countLabel = (list) => `${list.rows.length}${list.hasMore ? '+' : ''}`;
 
   return (
     <div className="space-y-4 animate-fade-in">
@@ -99,7 +96,7 @@ export default function DatasetViewer() {
           <div className="flex items-center gap-2">
             <label className="text-sm">Source</label>
             <select value="api" disabled className="border rounded px-2 py-1 text-sm opacity-70 cursor-not-allowed" aria-disabled="true">
-              <option value="api">Backend API ({meta.apiBase})</option>
+              <option value="api">Backend API ({API_BASE})</option>
             </select>
           </div>
           <div className="flex items-center gap-2">
@@ -130,7 +127,7 @@ export default function DatasetViewer() {
           <div className="flex-1" />
           <button onClick={refresh} className="px-3 py-1 bg-blue-600 text-white rounded text-sm">Refresh</button>
         </div>
-        <div className="mt-2 text-xs text-gray-600">Counts — Vehicles: {meta.counts.vehicles}, Sightings: {meta.counts.sightings}, Alerts: {meta.counts.alerts}</div>
+        <div className="mt-2 text-xs text-gray-600">Loaded — Vehicles: {countLabel(vehicles)}, Sightings: {countLabel(sightings)}, Alerts: {countLabel(alerts)}</div>
         {loading && (
           <div className="mt-1 text-sm text-gray-500" aria-live="polite">Loading dataset…</div>
         )}
@@ -161,8 +158,8 @@ export default function DatasetViewer() {
               { key: 'status', label: 'Status' },
               { key: 'owner', label: 'Owner' },
               { key: 'last_seen', label: 'Last Seen' },
-              { key: 'is_valid_plate', label: 'Valid' },
-              { key: 'province', label: 'Province' },
+              { key: 'is_valid_plate', label: 'Valid', sortable: false },
+              { key: 'province', label: 'Province', sortable: false },
             ]} sort={vehSort} setSort={setVehSort} />
             <tbody>
               {filteredVehicles.map(v => (
@@ -201,6 +198,7 @@ export default function DatasetViewer() {
             <div className="text-sm text-gray-500">No vehicles match filters.</div>
           )}
         </div>
+        <LoadMore list={vehicles} />
       </div>
 
       <div className="grid grid-cols-1 lg:grid-cols-2 gap-4">
@@ -211,12 +209,12 @@ export default function DatasetViewer() {
             <table className="min-w-full text-sm" role="table" aria-label="Sightings">
               <TableHeader columns={[
                 { key: 'plate_number', label: 'Plate' },
-                { key: 'latitude', label: 'Lat' },
-                { key: 'longitude', label: 'Lon' },
-                { key: 'speed_kmh', label: 'Speed' },
-                { key: 'heading_deg', label: 'Heading' },
+                { key: 'latitude', label: 'Lat', sortable: false },
+                { key: 'longitude', label: 'Lon', sortable: false },
+                { key: 'speed_kmh', label: 'Speed', sortable: false },
+                { key: 'heading_deg', label: 'Heading', sortable: false },
                 { key: 'timestamp', label: 'Time' },
-                { key: 'is_valid_plate', label: 'Valid' },
+                { key: 'is_valid_plate', label: 'Valid', sortable: false },
               ]} sort={sigSort} setSort={setSigSort} />
               <tbody>
                 {filteredSightings.map(s => (
@@ -255,6 +253,7 @@ export default function DatasetViewer() {
               <div className="text-sm text-gray-500">No sightings match filters.</div>
             )}
           </div>
+          <LoadMore list={sightings} />
         </div>
 
         <div className="rounded-xl border border-muted bg-surface p-3" role="region" aria-label="Alerts list">
@@ -264,11 +263,11 @@ export default function DatasetViewer() {
             <table className="min-w-full text-sm" role="table" aria-label="Alerts">
               <TableHeader columns={[
                 { key: 'plate_number', label: 'Plate' },
-                { key: 'status', label: 'Status' },
+                { key: 'status', label: 'Status', sortable: false },
                 { key: 'timestamp', label: 'Time' },
-                { key: 'acknowledged', label: 'Ack' },
-                { key: 'dispatched', label: 'Dispatch' },
-                { key: 'is_valid_plate', label: 'Valid' },
+                { key: 'acknowledged', label: 'Ack', sortable: false },
+                { key: 'dispatched', label: 'Dispatch', sortable: false },
+                { key: 'is_valid_plate', label: 'Valid', sortable: false },
               ]} sort={altSort} setSort={setAltSort} />
               <tbody>
                 {filteredAlerts.map(a => (
@@ -307,6 +306,7 @@ export default function DatasetViewer() {
               <div className="text-sm text-gray-500">No alerts match filters.</div>
             )}
           </div>
+          <LoadMore list={alerts} />
         </div>
       </div>
 
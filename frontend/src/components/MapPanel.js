@@ -1,8 +1,9 @@
 "use client";
 
 import dynamic from "next/dynamic";
-import { useEffect, useMemo, useState } from "react";
-import { getRecentSightings, getPredictedRouteForPlate } from "../lib/api";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
+import { getSightingClusters, getPredictedRouteForPlate } from "../lib/api";
+import { subscribeStream, upsertRecent } from "../lib/stream";
 import "leaflet/dist/leaflet.css";
 
 const MapContainer = dynamic(() => import("react-leaflet").then(mod => mod.MapContainer), { ssr: false });
@@ -10,6 +11,24 @@ const TileLayer = dynamic(() => import("react-leaflet").then(mod => mod.TileLaye
 const Marker = dynamic(() => import("react-leaflet").then(mod => mod.Marker), { ssr: false });
 const Popup = dynamic(() => import("react-leaflet").then(mod => mod.Popup), { ssr: false });
 const Polyline = dynamic(() => import("react-leaflet").then(mod => mod.Polyline), { ssr: false });
+const CircleMarker = dynamic(() => import("react-leaflet").then(mod => mod.CircleMarker), { ssr: false });
+const Tooltip = dynamic(() => import("react-leaflet").then(mod => mod.Tooltip), { ssr: false });
+// "west,south,east,north" of the visible map, clamped to valid coordinates when zoomed far out
+const viewportBBox = (map) => {
+  const b = map.getBounds();
+  const clamp = (v, lim) => Math.min(lim, Math.max(-lim, v)).toFixed(5);
+  return [clamp(b.getWest(), 180), clamp(b.getSouth(), 90), clamp(b.getEast(), 180), clamp(b.getNorth(), 90)].join(",");
+};
+
+// Reports the visible bounds and zoom once mounted and after every pan/zoom
+const ViewportWatcher = dynamic(() => import("react-leaflet").then(mod => {
+  function ViewportWatcher({ onChange }) {
+    const map = mod.useMapEvents({ moveend: () => onChange(viewportBBox(map), map.getZoom()) });
+    useEffect(() => { onChange(viewportBBox(map), map.getZoom()); }, [map, onChange]);
+    return null;
+  }
+  return ViewportWatcher;
+}), { ssr: false });
 
 // Load Leaflet dynamically on the client to avoid SSR "window is not defined"
 // Do not import at module scope, as Leaflet touches window during import.
@@ -32,27 +51,77 @@ function useLeaflet() {
   return L;
 }
 
+// bbox is "west,south,east,north"
+const inBBox = (bbox, lat, lon) => {
+  if (!bbox) return true;
+  const [west, south, east, north] = bbox.split(",").map(Number);
+  return lat >= south && lat <= north && lon >= west && lon <= east;
+};
+
 const statusColor = (status) => {
   if (status === "stolen") return "red";
   if (status === "suspicious") return "orange";
   return "green";
 };
 
+// Cluster circles grow with the log of their count
+const clusterRadius = (count) => 8 + 4 * Math.log10(Math.max(1, count));
+
 export default function MapPanel() {
   const [sightings, setSightings] = useState([]);
+  const [clusters, setClusters] = useState([]);
   const [routes, setRoutes] = useState({});
   const [error, setError] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [view, setView] = useState(null);
+  const viewRef = useRef(null);
+  const modeRef = useRef("clusters");
+  const loadRef = useRef(null);
   const L = useLeaflet();
 
   useEffect(() => {
     let mounted = true;
+    const loadRoutes = async (plates) => {
+      const byPlate = new Set(plates);
+      // Concurrently fetch routes and batch state updates to avoid multiple re-renders
+      const promises = [...byPlate].map(async (plate) => {
+        try {
+          const route = await getPredictedRouteForPlate(plate);
+          if (route && route.path) {
+            return { plate, path: route.path.map(p => [p.lat, p.lon]) };
+          }
+        } catch (e) { /* ignore */ }
+        return null;
+      });
+      const results = await Promise.all(promises);
+      if (!mounted) return;
+      const nextRoutes = {};
+      for (const r of results) {
+        if (r && r.path) nextRoutes[r.plate] = r.path;
+      }
+      if (Object.keys(nextRoutes).length > 0) {
+        setRoutes(prev => ({ ...prev, ...nextRoutes }));
+      }
+    };
+    // Only the current viewport is fetched; the first load waits for the map to report it.
+    // Zoomed out the backend returns grid clusters, zoomed in the individual sightings.
     const load = async () => {
+      if (!viewRef.current) return;
       try {
         setError(null);
         setLoading(true);
-        const data = await getRecentSightings(10);
+        const { bbox, zoom } = viewRef.current;
+        const res = await getSightingClusters({ bbox, zoom, minutes: 10 });
         if (!mounted) return;
+        modeRef.current = res.mode;
+        if (res.mode !== "points") {
+          setClusters(res.clusters || []);
+          setSightings([]);
+          setLoading(false);
+          return;
+        }
+        const data = res.points || [];
+        setClusters([]);
         setSightings(data);
         // Fetch predicted routes for suspicious/stolen
         const plates = [...new Set(data.map(s => s.plate_number))];
@@ -61,25 +130,7 @@ export default function MapPanel() {
           const hasObj = v && typeof v === 'object';
           return hasObj && ["suspicious", "stolen"].includes(v.status);
         });
-        const byPlate = new Set(suspicious.map(s => s.plate_number));
-        // Concurrently fetch routes and batch state updates to avoid multiple re-renders
-        const promises = [...byPlate].map(async (plate) => {
-          try {
-            const route = await getPredictedRouteForPlate(plate);
-            if (route && route.path) {
-              return { plate, path: route.path.map(p => [p.lat, p.lon]) };
-            }
-          } catch (e) { /* ignore */ }
-          return null;
-        });
-        const results = await Promise.all(promises);
-        const nextRoutes = {};
-        for (const r of results) {
-          if (r && r.path) nextRoutes[r.plate] = r.path;
-        }
-        if (Object.keys(nextRoutes).length > 0) {
-          setRoutes(prev => ({ ...prev, ...nextRoutes }));
-        }
+        await loadRoutes(suspicious.map(s => s.plate_number));
         setLoading(false);
       } catch (e) {
         console.error("Failed to load sightings", e);
@@ -87,11 +138,31 @@ export default function MapPanel() {
         setLoading(false);
       }
     };
+    loadRef.current = load;
     load();
-    const id = setInterval(load, 3000);
-    return () => { mounted = false; clearInterval(id); };
+    // Sightings are pushed as they are written; a new alert means a fresh route
+    const unsubscribe = subscribeStream({}, {
+      sighting: (s) => {
+        // Clusters are refreshed by the poll; streamed points only show when zoomed in
+        if (modeRef.current !== "points" || !inBBox(viewRef.current?.bbox, s.latitude, s.longitude)) return;
+        setSightings(prev => upsertRecent(prev, s, { minutes: 10, limit: 500 }));
+      },
+      alert: (a) => loadRoutes([a.plate_number]),
+      reset: load,
+    });
+    const id = setInterval(load, unsubscribe ? 30000 : 3000);
+    return () => { mounted = false; loadRef.current = null; clearInterval(id); if (unsubscribe) unsubscribe(); };
+  }, []);
+
+  const onViewport = useCallback((bbox, zoom) => {
+    setView(prev => (prev && prev.bbox === bbox && prev.zoom === zoom ? prev : { bbox, zoom }));
   }, []);
 
+  useEffect(() => {
+    viewRef.current = view;
+    if (view && loadRef.current) loadRef.current();
+  }, [view]);
+
   const center = useMemo(() => {
     if (sightings.length > 0) {
       return [sightings[0].latitude, sightings[0].longitude];
@@ -121,6 +192,7 @@ export default function MapPanel() {
       )}
       <MapContainer center={center} zoom={13} style={{ height: 420, width: "100%" }}>
         <TileLayer url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png" attribution="&copy; OpenStreetMap contributors" />
+        <ViewportWatcher onChange={onViewport} />
         {sightings.map((s) => {
           const curStatus = s?.vehicle && typeof s.vehicle === 'object' ? s.vehicle.status : 'normal';
           return (
@@ -135,7 +207,17 @@ export default function MapPanel() {
             </Popup>
           </Marker>
         )})}
-        {Object.entries(routes).map(([plate, path]) => (
+        {clusters.map((c) => (
+          <CircleMarker
+            key={`cluster-${c.lat}-${c.lon}`}
+            center={[c.lat, c.lon]}
+            radius={clusterRadius(c.count)}
+            pathOptions={{ color: statusColor(c.status), fillColor: statusColor(c.status), fillOpacity: 0.5 }}
+          >
+            <Tooltip>{c.count} sightings — worst status {c.status}</Tooltip>
+          </CircleMarker>
+        ))}
+        {sightings.length > 0 && Object.entries(routes).map(([plate, path]) => (
           <Polyline key={`route-${plate}`} positions={path} color="purple" />
         ))}
       </MapContainer>
@@ -144,6 +226,9 @@ export default function MapPanel() {
         {sightings.map(s => (
           <li key={`sr-${s.id}`}>{s.plate_number} at {s.latitude?.toFixed(5)}, {s.longitude?.toFixed(5)} — status {s?.vehicle?.status || 'normal'}.</li>
         ))}
+        {clusters.map(c => (
+          <li key={`sr-cluster-${c.lat}-${c.lon}`}>{c.count} sightings near {c.lat.toFixed(3)}, {c.lon.toFixed(3)} — worst status {c.status}.</li>
+        ))}
       </ul>
     </div>
   );
@@ -1,36 +1,13 @@
 "use client";
-import { useEffect, useMemo, useState } from "react";
-import { getVehicles } from "../lib/api";
+import { useState } from "react";
+import { usePagedList } from "../lib/dataset";
 
 export default function VehiclesTable() {
-  const [vehicles, setVehicles] = useState([]);
   const [filter, setFilter] = useState("all");
-  const [error, setError] = useState(null);
-  const [loading, setLoading] = useState(true);
-
-  const load = async () => {
-    try {
-      setError(null);
-      setLoading(true);
-      const data = await getVehicles();
-      setVehicles(data);
-      setLoading(false);
-    } catch (e) {
-      console.error(e);
-      setError(e);
-      setLoading(false);
-    }
-  };
-  useEffect(() => {
-    load();
-    const id = setInterval(load, 5000);
-    return () => clearInterval(id);
-  }, []);
-
-  const filtered = useMemo(() => {
-    if (filter === "all") return vehicles;
-    return vehicles.filter(v => v.status === filter);
-  }, [vehicles, filter]);
+  // The status filter runs on the server; the first page refreshes every 5s
+  const { rows: filtered, hasMore, loading, error, loadMore } = usePagedList(
+    '/vehicles/', { status: filter }, { pollIntervalMs: 5000 },
+  );
 
   return (
     <div className="rounded-xl border border-muted bg-surface p-3 animate-slide-up" role="region" aria-label="Watchlist vehicles">
@@ -100,6 +77,11 @@ export default function VehiclesTable() {
           <div className="text-sm text-gray-500">No vehicles.</div>
         )}
       </div>
+      {hasMore && (
+        <button onClick={loadMore} disabled={loading} className="mt-2 px-3 py-1 rounded border border-muted text-sm" style={{ background: 'var(--surface)' }}>
+          {loading ? 'Loading…' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 }
\ No newline at end of file
@@ -32,19 +32,22 @@ function makeHeaders({ json = true, headers = {} } = {}) {
   return { ...base, ...headers };
 }
 
-async function fetchJSON(url, { method = 'GET', headers, body, timeoutMs = 10000, cache = 'no-store', credentials = 'omit', signal } = {}) {
+// With `etag`, sends If-None-Match and resolves to { notModified, etag, json }
+// (json is null on 304) instead of the bare JSON body.
+async function fetchJSON(url, { method = 'GET', headers, body, timeoutMs = 10000, cache = 'no-store', credentials = 'omit', signal, etag } = {}) {
   const controller = signal ? null : new AbortController();
   const sig = signal || (controller ? controller.signal : undefined);
   const timer = controller ? setTimeout(() => controller.abort(new Error('Request timeout')), Math.max(1000, timeoutMs)) : null;
   try {
     const res = await fetch(url, {
       method,
-      headers: makeHeaders({ json: method !== 'GET', headers }),
+      headers: makeHeaders({ json: method !== 'GET', headers: etag ? { ...headers, 'If-None-Match': etag } : headers }),
       body: body == null ? undefined : (typeof body === 'string' ? body : JSON.stringify(body)),
       cache,
       credentials,
       signal: sig,
     });
+    if (etag !== undefined && res.status === 304) return { notModified: true, etag, json: null };
     const text = await res.text();
     let json;
     try { json = text ? JSON.parse(text) : null; } catch { json = null; }
@@ -55,6 +58,7 @@ async function fetchJSON(url, { method = 'GET', headers, body, timeoutMs = 10000
       err.body = json || text;
       throw err;
     }
+    if (etag !== undefined) return { notModified: false, etag: res.headers.get('ETag'), json };
     return json;
   } finally {
     if (timer) clearTimeout(timer);
@@ -69,11 +73,55 @@ const api = {
   del: (path, opts) => fetchJSON(buildUrl(path), { method: 'DELETE', ...(opts || {}) }),
 };
 
+// List endpoints are cursor-paginated ({ next, previous, results }); follow
+// `next` until exhausted. Links are absolute, so only the cursor is reused.
+async function getAllPages(path, { pageSize = 500 } = {}) {
+  const sep = path.includes('?') ? '&' : '?';
+  let url = `${path}${sep}page_size=${pageSize}`;
+  const out = [];
+  while (url) {
+    const page = await api.get(url);
+    if (Array.isArray(page)) return page;
+    out.push(...(page?.results || []));
+    const cursor = page?.next ? new URL(page.next).searchParams.get('cursor') : null;
+    url = cursor ? `${path}${sep}page_size=${pageSize}&cursor=${encodeURIComponent(cursor)}` : null;
+  }
+  return out;
+}
+
+// GET that revalidates with the last ETag for `path` and reuses the cached
+// body on 304 (dataset/stats answer unchanged polls without recomputing).
+const conditionalCache = new Map();
+async function getIfChanged(path, opts) {
+  const prev = conditionalCache.get(path);
+  const res = await api.get(path, { ...(opts || {}), etag: prev?.etag || null });
+  if (res.notModified && prev) return prev.json;
+  if (res.etag) conditionalCache.set(path, { etag: res.etag, json: res.json });
+  return res.json;
+}
+
 // Domain-specific helpers
-export const getRecentSightings = (minutes = 10) => api.get(`/sightings/recent/?minutes=${encodeURIComponent(minutes)}`);
+// bbox: "west,south,east,north" (Leaflet's toBBoxString) limits results to a map viewport
+export const getRecentSightings = (minutes = 10, { bbox } = {}) =>
+  api.get(`/sightings/recent/?minutes=${encodeURIComponent(minutes)}${bbox ? `&bbox=${encodeURIComponent(bbox)}` : ''}`);
+// Map markers for the viewport: { mode: "clusters", clusters } or, zoomed in, { mode: "points", points }
+export const getSightingClusters = ({ bbox, zoom, minutes = 10 }) =>
+  api.get(`/sightings/clusters/?zoom=${encodeURIComponent(zoom)}&minutes=${encodeURIComponent(minutes)}${bbox ? `&bbox=${encodeURIComponent(bbox)}` : ''}`);
 export const getRecentAlerts = (minutes = 60) => api.get(`/alerts/recent/?minutes=${encodeURIComponent(minutes)}`);
-export const getVehicles = () => api.get(`/vehicles/`);
-export const getStats = () => api.get(`/stats/`);
+
+// One page of a list endpoint, filtered and sorted on the server; empty and
+// "all" params are left out. Pass the `cursor` of the previous page's `next`.
+export const getListPage = (path, params = {}) => {
+  const query = Object.entries(params)
+    .filter(([, v]) => v !== undefined && v !== null && v !== '' && v !== 'all')
+    .map(([k, v]) => `${encodeURIComponent(k)}=${encodeURIComponent(v)}`)
+    .join('&');
+  return api.get(query ? `${path}?${query}` : path);
+};
+export const nextCursor = (page) => (page?.next ? new URL(page.next).searchParams.get('cursor') : null);
+// First page of the registry only; use getListPage/usePagedList to go further
+export const getVehicles = async (params = {}) => (await getListPage(`/vehicles/`, { page_size: 500, ...params }))?.results || [];
+export const getStats = () => getIfChanged(`/stats/`);
 
 export const acknowledgeAlert = async (id) => {
   try {
@@ -86,10 +134,12 @@ export const acknowledgeAlert = async (id) => {
 };
 
 export const getPredictedRouteForPlate = async (plate) => {
-  const vehicles = await getVehicles();
-  const v = vehicles.find((x) => (x.plate_number || '').toUpperCase() === (plate || '').toUpperCase());
+  // Search is a prefix match on the plate (and owner), so pick the exact plate out of a short page
+  const wanted = (plate || '').toUpperCase();
+  const page = await getListPage('/vehicles/', { search: plate, sort: 'plate_number', page_size: 10 });
+  const v = (page?.results || []).find((r) => (r.plate_number || '').toUpperCase() === wanted);
   if (!v) return null;
   return api.get(`/vehicles/${v.id}/predicted/`);
 };
 
-export { API_BASE, api };
\ No newline at end of file
+export { API_BASE, api, getAllPages };
\ No newline at end of file
@@ -1,27 +1,80 @@
 "use client";
 
 import { useEffect, useMemo, useRef, useState } from "react";
-import { getVehicles, getRecentSightings, getRecentAlerts, API_BASE, api } from "./api";
+import { getVehicles, getRecentSightings, getRecentAlerts, getListPage, nextCursor, API_BASE, api } from "./api";
 import { isValidNepaliPlate, normalizePlate, extractProvinceFromPlate } from "./nepaliPlate";
 
+// Rows from a `layout=columnar` table: {count, columns: {field: [...] | {dictionary, codes}}}
+export function fromColumnar(table) {
+  if (!table || !table.columns) return table || [];
+  const fields = Object.entries(table.columns).map(([key, col]) => (
+    Array.isArray(col) ? [key, (i) => col[i]] : [key, (i) => col.dictionary[col.codes[i]]]
+  ));
+  const rows = new Array(table.count);
+  for (let i = 0; i < table.count; i++) {
+    const row = {};
+    for (const [key, at] of fields) row[key] = at(i);
+    rows[i] = row;
+  }
+  return rows;
+}
+
 export async function getDataset({
   source = "api",
   minutesSightings = 60,
   minutesAlerts = 120,
+  since = null,
+  etag,
 } = {}) {
   // Enforce API-only by default; keep legacy branch for compatibility
   if (source === "apiLegacy") {
     const [vehicles, sightings, alerts] = await Promise.all([
-      getVehicles(),
+      getVehicles(),  // one page, not the whole registry
       getRecentSightings(minutesSightings),
       getRecentAlerts(minutesAlerts),
     ]);
     return { vehicles, sightings, alerts, source };
   }
-  // Unified dataset endpoint
-  const url = `/dataset/?minutesSightings=${encodeURIComponent(minutesSightings)}&minutesAlerts=${encodeURIComponent(minutesAlerts)}`;
-  const json = await api.get(url);
-  return { vehicles: json.vehicles || [], sightings: json.sightings || [], alerts: json.alerts || [], source: "api" };
+  // Unified dataset endpoint; columnar keeps repeated keys and plates out of the payload
+  let url = `/dataset/?layout=columnar&minutesSightings=${encodeURIComponent(minutesSightings)}&minutesAlerts=${encodeURIComponent(minutesAlerts)}`;
+  if (since) url += `&since=${encodeURIComponent(since)}`;
+  const res = await api.get(url, { etag: etag || null });
+  if (res.notModified) return { notModified: true };
+  const json = res.json || {};
+  return {
+    etag: res.etag || null,
+    vehicles: fromColumnar(json.vehicles),
+    sightings: fromColumnar(json.sightings),
+    alerts: fromColumnar(json.alerts),
+    source: "api",
+    cursor: json.cursor || null,
+    full: json.full !== false,
+    deleted: json.deleted || {},
+  };
+}
+
+// Apply a `since=` delta to the previous raw dataset: upsert by id, drop
+// tombstoned ids, and age sightings/alerts out of their windows like a full load.
+export function mergeDatasetDelta(prev, delta, { minutesSightings = 60, minutesAlerts = 120, limitSightings = 500, limitAlerts = 200 } = {}) {
+  const upsert = (rows, changes, deletedIds = []) => {
+    const byId = new Map(rows.map(r => [r.id, r]));
+    for (const id of deletedIds) byId.delete(id);
+    for (const r of changes) byId.set(r.id, r);
+    return Array.from(byId.values());
+  };
+  const newestFirst = (a, b) => new Date(b.timestamp) - new Date(a.timestamp) || b.id - a.id;
+  const now = Date.now();
+  const vehicles = upsert(prev.vehicles || [], delta.vehicles || [], delta.deleted?.vehicles)
+    .sort((a, b) => (a.plate_number < b.plate_number ? -1 : a.plate_number > b.plate_number ? 1 : 0));
+  const sightings = upsert(prev.sightings || [], delta.sightings || [])
+    .filter(s => now - new Date(s.timestamp).getTime() <= minutesSightings * 60000)
+    .sort(newestFirst)
+    .slice(0, limitSightings);
+  const alerts = upsert(prev.alerts || [], delta.alerts || [], delta.deleted?.alerts)
+    .filter(a => now - new Date(a.timestamp).getTime() <= minutesAlerts * 60000)
+    .sort(newestFirst)
+    .slice(0, limitAlerts);
+  return { ...delta, vehicles, sightings, alerts };
 }
 
 function formatAndValidateDataset(raw) {
@@ -50,11 +103,23 @@ export function useDataset(options) {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const lastRef = useRef(null);
+  // Last raw payload and its cursor; later polls fetch only the changes
+  const rawRef = useRef(null);
 
-  const load = async () => {
+  const load = async ({ full = false } = {}) => {
     try {
       setError(null);
-      const raw = await getDataset({ source, minutesSightings, minutesAlerts });
+      const since = !full && source === "api" ? rawRef.current?.cursor : null;
+      const etag = since ? rawRef.current?.etag : null;
+      const fetched = await getDataset({ source, minutesSightings, minutesAlerts, since, etag });
+      if (fetched.notModified) {
+        setLoading(false);
+        return;
+      }
+      const raw = since && !fetched.full && rawRef.current
+        ? mergeDatasetDelta(rawRef.current, fetched, { minutesSightings, minutesAlerts })
+        : fetched;
+      rawRef.current = raw;
       const formatted = formatAndValidateDataset(raw);
       const next = { ...formatted, source };
       // Perform shallow comparison to avoid unnecessary re-renders
@@ -73,6 +138,7 @@ export function useDataset(options) {
 
   useEffect(() => {
     let mounted = true;
+    rawRef.current = null;
     const tick = async () => {
       if (!mounted) return;
       await load();
@@ -91,5 +157,66 @@ export function useDataset(options) {
     },
   }), [data]);
 
-  return { data, loading, error, refresh: load, meta };
-}
\ No newline at end of file
+  return { data, loading, error, refresh: () => load({ full: true }), meta };
+}
+// Normalized plate plus the validity/province columns the dataset tables show
+export function withPlateInfo(row) {
+  const plate = row.plate_number || "";
+  return {
+    ...row,
+    plate_number: normalizePlate(plate),
+    is_valid_plate: isValidNepaliPlate(plate),
+    province: extractProvinceFromPlate(plate) || null,
+  };
+}
+
+// One server-filtered, server-sorted list, a page at a time. `params` are the
+// list endpoint's query params (status, province, search, minutes, sort, ...);
+// changing them reloads the first page. Polling refreshes the first page
+// while no further pages have been loaded.
+export function usePagedList(path, params, { pageSize = 100, pollIntervalMs = 0 } = {}) {
+  const key = JSON.stringify(params || {});
+  const [rows, setRows] = useState([]);
+  const [hasMore, setHasMore] = useState(false);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const cursorRef = useRef(null);
+  const pagesRef = useRef(0);
+  // Responses to superseded requests are dropped
+  const requestRef = useRef(0);
+
+  const fetchPage = async (cursor) => {
+    const query = { ...JSON.parse(key), page_size: pageSize, ...(cursor ? { cursor } : {}) };
+    const page = await getListPage(path, query);
+    return { results: (page?.results || []).map(withPlateInfo), cursor: nextCursor(page) };
+  };
+
+  const load = async ({ more = false } = {}) => {
+    if (more && !cursorRef.current) return;
+    const id = ++requestRef.current;
+    try {
+      setError(null);
+      setLoading(true);
+      const page = await fetchPage(more ? cursorRef.current : null);
+      if (id !== requestRef.current) return;
+      cursorRef.current = page.cursor;
+      pagesRef.current = more ? pagesRef.current + 1 : 1;
+      setRows(prev => (more ? [...prev, ...page.results] : page.results));
+      setHasMore(Boolean(page.cursor));
+      setLoading(false);
+    } catch (e) {
+      if (id !== requestRef.current) return;
+      setError(e);
+      setLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    load();
+    const id = pollIntervalMs ? setInterval(() => { if (pagesRef.current <= 1) load(); }, pollIntervalMs) : null;
+    return () => { requestRef.current++; if (id) clearInterval(id); };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [path, key, pageSize, pollIntervalMs]);
+
+  return { rows, hasMore, loading, error, loadMore: () => load({ more: true }), refresh: () => load() };
+}
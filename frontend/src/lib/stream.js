@@ -0,0 +1,42 @@
+"use client";
+
+import { API_BASE } from "./api";
+
+// Subscribe to the Server-Sent Events feed (GET /api/stream/).
+// `filters`: { types, province, status } (strings or arrays).
+// `handlers`: { sighting(data), alert(data), reset() }; reset means events
+// were missed and the caller should reload its snapshot.
+// Returns an unsubscribe function, or null when EventSource is unavailable
+// so the caller can keep polling.
+export function subscribeStream(filters = {}, handlers = {}) {
+  if (typeof window === "undefined" || typeof window.EventSource === "undefined") return null;
+  const params = new URLSearchParams();
+  for (const key of ["types", "province", "status"]) {
+    const value = filters[key];
+    if (value != null && value !== "") params.set(key, [].concat(value).join(","));
+  }
+  const qs = params.toString();
+  const es = new EventSource(`${API_BASE}/stream/${qs ? `?${qs}` : ""}`);
+  for (const type of ["sighting", "alert"]) {
+    if (!handlers[type]) continue;
+    es.addEventListener(type, (e) => {
+      try {
+        handlers[type](JSON.parse(e.data));
+      } catch (err) {
+        console.error(`stream: bad ${type} event`, err);
+      }
+    });
+  }
+  if (handlers.reset) es.addEventListener("reset", () => handlers.reset());
+  return () => es.close();
+}
+
+// Insert or replace `row` by id, newest first, dropping rows older than
+// `minutes` and keeping at most `limit`.
+export function upsertRecent(rows, row, { minutes, limit = 500 } = {}) {
+  const cutoff = minutes ? Date.now() - minutes * 60000 : null;
+  const next = [row, ...rows.filter(r => r.id !== row.id)]
+    .filter(r => cutoff == null || new Date(r.timestamp).getTime() >= cutoff)
+    .sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp) || b.id - a.id);
+  return next.slice(0, limit);
+}